@@ -0,0 +1,66 @@
+﻿"""Add the daily application rollup used by the dashboards
+
+Revision ID: add_application_daily_stats
+Revises: add_jobs_skills_gin
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_application_daily_stats"
+down_revision = "add_jobs_skills_gin"
+branch_labels = None
+depends_on = None
+
+# The rollup of the existing applications, as core/application_stats.reconcile()
+# builds it at this revision: one row per UTC day, job and status
+_BACKFILL = """
+INSERT INTO application_daily_stats
+    (day, job_id, status, owner_user_id, applications, scored, score_sum,
+     bin_0, bin_20, bin_40, bin_60, bin_80)
+SELECT {day}, a.job_id, a.status, j.owner_user_id,
+       COUNT(*), COUNT(a.score), COALESCE(SUM(a.score), 0.0),
+       COUNT(CASE WHEN a.score < 20 THEN 1 END),
+       COUNT(CASE WHEN a.score >= 20 AND a.score < 40 THEN 1 END),
+       COUNT(CASE WHEN a.score >= 40 AND a.score < 60 THEN 1 END),
+       COUNT(CASE WHEN a.score >= 60 AND a.score < 80 THEN 1 END),
+       COUNT(CASE WHEN a.score >= 80 THEN 1 END)
+FROM applications a
+JOIN jobs j ON j.id = a.job_id
+WHERE a.applied_at IS NOT NULL
+GROUP BY {day}, a.job_id, a.status, j.owner_user_id
+"""
+_UTC_DAY = {
+    "postgresql": "CAST(timezone('UTC', a.applied_at) AS DATE)",
+    "sqlite": "date(a.applied_at)",  # stored in UTC
+}
+
+
+def _counter(name, type_=sa.Integer):
+    return sa.Column(name, type_(), nullable=False, server_default="0")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "application_daily_stats",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("job_id", sa.Integer(), sa.ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("status", sa.String(), primary_key=True),
+        sa.Column("owner_user_id", sa.Integer(), nullable=True),
+        _counter("applications"),
+        _counter("scored"),
+        _counter("score_sum", sa.Float),
+        *(_counter(f"bin_{lo}") for lo in (0, 20, 40, 60, 80)),
+    )
+    op.create_index("ix_application_daily_stats_owner_day", "application_daily_stats", ["owner_user_id", "day"])
+    # fill it from the existing applications
+    conn = op.get_bind()
+    conn.execute(sa.text(_BACKFILL.format(day=_UTC_DAY.get(conn.dialect.name, _UTC_DAY["postgresql"]))))
+
+
+def downgrade() -> None:
+    op.drop_index("ix_application_daily_stats_owner_day", table_name="application_daily_stats")
+    op.drop_table("application_daily_stats")
@@ -0,0 +1,32 @@
+﻿"""Index applications by applied_at for date-range scans
+
+Revision ID: add_applications_applied_index
+Revises: add_application_daily_stats
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_applications_applied_index"
+down_revision = "add_application_daily_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # serves the half-open applied_at ranges of application_stats.reconcile()
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_applications_applied",
+            "applications",
+            ["applied_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_applications_applied", table_name="applications", postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,32 @@
+﻿"""Add content-addressed blobs table
+
+Revision ID: add_blobs_table
+Revises: add_cv_content_metadata
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_blobs_table"
+down_revision = "add_cv_content_metadata"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "blobs",
+        sa.Column("sha256", sa.String(length=64), primary_key=True),
+        sa.Column("ext", sa.String(length=16), nullable=False, server_default=""),
+        sa.Column("mime_type", sa.String(length=120), nullable=True),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("blobs")
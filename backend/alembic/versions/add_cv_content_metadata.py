@@ -0,0 +1,28 @@
+﻿"""Add content hash, MIME type and size to cvs
+
+Revision ID: add_cv_content_metadata
+Revises: 85c154a169ee
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_cv_content_metadata"
+down_revision = "85c154a169ee"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("cvs", sa.Column("content_sha256", sa.String(length=64), nullable=True))
+    op.add_column("cvs", sa.Column("mime_type", sa.String(length=120), nullable=True))
+    op.add_column("cvs", sa.Column("size_bytes", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("cvs", "size_bytes")
+    op.drop_column("cvs", "mime_type")
+    op.drop_column("cvs", "content_sha256")
@@ -0,0 +1,47 @@
+﻿"""Add composite indexes for hot application, job and CV queries
+
+Revision ID: add_hot_path_indexes
+Revises: add_jobs_facet_indexes
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_hot_path_indexes"
+down_revision = "add_jobs_facet_indexes"
+branch_labels = None
+depends_on = None
+
+# name, table, columns. Directions follow the ORDER BY of each query so the
+# index also returns rows already sorted (scripts/check_query_plans.py runs
+# EXPLAIN on them). jobs(status, posted_at) is ix_jobs_status_posted_created_id
+# from add_jobs_listing_indexes.
+INDEXES = (
+    # company applicant lists, sort=score_desc (GET /company/analytics/jobs/{id}/applications, cvs.zip)
+    ("ix_applications_job_score", "applications", ["job_id", sa.text("score DESC"), sa.text("applied_at DESC")]),
+    # same lists sorted by date (read backwards for date_asc); also serves ON DELETE CASCADE from jobs
+    ("ix_applications_job_applied", "applications", ["job_id", sa.text("applied_at DESC")]),
+    # GET /applications/me
+    ("ix_applications_user_applied", "applications", ["user_id", sa.text("applied_at DESC")]),
+    # GET /company/analytics/jobs; also the owner=me filter of GET /jobs
+    ("ix_jobs_owner_posted", "jobs", ["owner_user_id", sa.text("posted_at DESC")]),
+    # latest CV of a user (GET /cvs/current)
+    ("ix_cvs_user_uploaded", "cvs", ["user_id", sa.text("uploaded_at DESC")]),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps the tables writable during the build but cannot run
+    # inside a transaction; if_not_exists lets a failed run be resumed
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
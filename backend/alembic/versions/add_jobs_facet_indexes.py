@@ -0,0 +1,45 @@
+﻿"""Add indexes for job facet filters
+
+Revision ID: add_jobs_facet_indexes
+Revises: add_jobs_search_vector
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_jobs_facet_indexes"
+down_revision = "add_jobs_search_vector"
+branch_labels = None
+depends_on = None
+
+# Facet filters and counts only ever look at published jobs
+_PUBLISHED = sa.text("status = 'published'")
+_FACET_COLUMNS = ("location_city", "location_country", "work_mode", "employment_type", "education_level")
+
+
+def upgrade() -> None:
+    for col in _FACET_COLUMNS:
+        op.create_index(f"ix_jobs_published_{col}", "jobs", [col], postgresql_where=_PUBLISHED)
+    # salary range filter compares these expressions (see routers/jobs.py)
+    op.create_index(
+        "ix_jobs_published_salary_top",
+        "jobs",
+        [sa.text("coalesce(salary_max, salary_min)")],
+        postgresql_where=_PUBLISHED,
+    )
+    op.create_index(
+        "ix_jobs_published_salary_floor",
+        "jobs",
+        [sa.text("coalesce(salary_min, salary_max)")],
+        postgresql_where=_PUBLISHED,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_published_salary_floor", table_name="jobs")
+    op.drop_index("ix_jobs_published_salary_top", table_name="jobs")
+    for col in reversed(_FACET_COLUMNS):
+        op.drop_index(f"ix_jobs_published_{col}", table_name="jobs")
@@ -0,0 +1,35 @@
+﻿"""Add keyset indexes for the job listing
+
+Revision ID: add_jobs_listing_indexes
+Revises: add_blobs_table
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_jobs_listing_indexes"
+down_revision = "add_blobs_table"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Match GET /jobs ordering exactly so each page is a short index range scan
+    op.create_index(
+        "ix_jobs_status_posted_created_id",
+        "jobs",
+        ["status", sa.text("posted_at DESC NULLS LAST"), sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+    op.create_index(
+        "ix_jobs_status_created_id",
+        "jobs",
+        ["status", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_status_created_id", table_name="jobs")
+    op.drop_index("ix_jobs_status_posted_created_id", table_name="jobs")
@@ -0,0 +1,78 @@
+﻿"""Add weighted full-text search vector to jobs
+
+Revision ID: add_jobs_search_vector
+Revises: add_jobs_listing_indexes
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "add_jobs_search_vector"
+down_revision = "add_jobs_listing_indexes"
+branch_labels = None
+depends_on = None
+
+# Keep in sync with app/core/search.py (TS_CONFIG and the accent folding of query terms)
+_ACCENTED = "àâäáãåçéèêëíìîïñóòôöõúùûüýÿ"
+_PLAIN = "aaaaaaceeeeiiiinooooouuuuyy"
+
+_FUNCTIONS = f"""
+CREATE OR REPLACE FUNCTION jobs_search_fold(t text) RETURNS text
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT translate(lower(coalesce(t, '')), '{_ACCENTED}', '{_PLAIN}')
+$$;
+
+CREATE OR REPLACE FUNCTION jobs_search_json_text(j jsonb) RETURNS text
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT CASE jsonb_typeof(j)
+        WHEN 'array' THEN (SELECT coalesce(string_agg(v, ' '), '') FROM jsonb_array_elements_text(j) AS v)
+        WHEN 'string' THEN j #>> '{{}}'
+        ELSE ''
+    END
+$$;
+
+CREATE OR REPLACE FUNCTION jobs_search_vector_update() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', jobs_search_fold(NEW.title)), 'A') ||
+        setweight(to_tsvector('simple', jobs_search_fold(jobs_search_json_text(NEW.skills))), 'B') ||
+        setweight(to_tsvector('simple', jobs_search_fold(jobs_search_json_text(NEW.missions))), 'C') ||
+        setweight(to_tsvector('simple', jobs_search_fold(concat_ws(' ',
+            NEW.company_name, NEW.offer_description, NEW.profile_requirements, NEW.description, NEW.company_overview))), 'D');
+    RETURN NEW;
+END
+$$;
+"""
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return  # SQLite uses the FTS5 table created at startup (app/core/search.py)
+    op.add_column("jobs", sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+    op.execute(_FUNCTIONS)
+    op.execute(
+        """
+        CREATE TRIGGER jobs_search_vector_trg
+        BEFORE INSERT OR UPDATE OF title, skills, missions, company_name, offer_description,
+            profile_requirements, description, company_overview
+        ON jobs FOR EACH ROW EXECUTE FUNCTION jobs_search_vector_update()
+        """
+    )
+    op.execute("UPDATE jobs SET title = title")  # backfill through the trigger
+    op.create_index("ix_jobs_search_vector", "jobs", ["search_vector"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.drop_index("ix_jobs_search_vector", table_name="jobs")
+    op.execute("DROP TRIGGER IF EXISTS jobs_search_vector_trg ON jobs")
+    op.execute("DROP FUNCTION IF EXISTS jobs_search_vector_update()")
+    op.execute("DROP FUNCTION IF EXISTS jobs_search_json_text(jsonb)")
+    op.execute("DROP FUNCTION IF EXISTS jobs_search_fold(text)")
+    op.drop_column("jobs", "search_vector")
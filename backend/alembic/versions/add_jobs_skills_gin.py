@@ -0,0 +1,106 @@
+﻿"""Add jobs.skills_canon, the canonical job skills, and index it with GIN
+
+Revision ID: add_jobs_skills_gin
+Revises: add_hot_path_indexes
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+
+import json
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "add_jobs_skills_gin"
+down_revision = "add_hot_path_indexes"
+branch_labels = None
+depends_on = None
+
+# app/utils/skills.py as of this revision, frozen: later vocabulary changes
+# must not change what this migration does
+_CANON_MAP = {
+    "react.js": "react",
+    "reactjs": "react",
+    "next.js": "nextjs",
+    "node.js": "node",
+    "nodejs": "node",
+    "js": "javascript",
+    "ts": "typescript",
+    "front-end": "frontend",
+    "front": "frontend",
+    "front end": "frontend",
+    "html5": "html",
+    "css3": "css",
+    "scikit-learn": "sklearn",
+    "scikitlearn": "sklearn",
+}
+
+
+def _as_list(value):
+    # JSON text from drivers that don't decode it; anything but an array is None
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return None
+    return value if isinstance(value, list) else None
+
+
+def _canonical_skills(values):
+    out = []
+    for value in values:
+        skill = " ".join(str(value or "").split()).lower()
+        skill = _CANON_MAP.get(skill, skill)
+        if skill and skill not in out:
+            out.append(skill)
+    return out
+
+
+def upgrade() -> None:
+    op.add_column(
+        "jobs",
+        sa.Column(
+            "skills_canon",
+            sa.JSON().with_variant(postgresql.JSONB(astext_type=sa.Text()), "postgresql"),
+            nullable=False,
+            server_default=sa.text("'[]'"),
+        ),
+    )
+
+    # Canonical copy of the skills already stored; jobs.skills itself is left
+    # as entered, and rows whose skills are not an array keep the empty list
+    conn = op.get_bind()
+    jobs = sa.table("jobs", sa.column("id", sa.Integer), sa.column("skills", sa.JSON), sa.column("skills_canon", sa.JSON))
+    rows = []
+    for job_id, skills in conn.execute(sa.select(jobs.c.id, jobs.c.skills)):
+        skills = _as_list(skills)
+        if skills:
+            rows.append({"job_id": job_id, "canon": _canonical_skills(skills)})
+    if rows:
+        conn.execute(
+            jobs.update().where(jobs.c.id == sa.bindparam("job_id")).values(skills_canon=sa.bindparam("canon")),
+            rows,
+        )
+
+    if conn.dialect.name != "postgresql":
+        return
+    # jsonb_path_ops: smaller than the default opclass and all @> needs
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_jobs_skills_canon",
+            "jobs",
+            ["skills_canon"],
+            postgresql_using="gin",
+            postgresql_ops={"skills_canon": "jsonb_path_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index("ix_jobs_skills_canon", table_name="jobs", postgresql_concurrently=True, if_exists=True)
+    op.drop_column("jobs", "skills_canon")
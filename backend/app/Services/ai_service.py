@@ -9,6 +9,8 @@ import os
 import re
 import unicodedata
 from typing import Dict, Optional, Iterable, List, Set
+# Technology term standardization, shared with how job skills are stored
+from ..utils.skills import CANON_MAP as _CANON_MAP, canon_token as _canon_token
 
 # Public API exports
 __all__ = [
@@ -98,36 +100,6 @@ def _norm_items(items: Optional[Iterable[str]]) -> List[str]:
             result.append(cleaned)
     return result
 
-# Technology term standardization
-_CANON_MAP = {
-    # JavaScript ecosystem
-    "react.js": "react",
-    "reactjs": "react",
-    "next.js": "nextjs",
-    "nextjs": "nextjs",
-    "node.js": "node",
-    "nodejs": "node",
-    "js": "javascript",
-    "javascript": "javascript",
-    "ts": "typescript",
-    "typescript": "typescript",
-    # Frontend variants
-    "front-end": "frontend",
-    "front": "frontend",
-    "front end": "frontend",
-    "frontend": "frontend",
-    # Web technologies
-    "html5": "html",
-    "css3": "css",
-    # ML/Data science
-    "scikit-learn": "sklearn",
-    "scikitlearn": "sklearn",
-}
-
-def _canon_token(token: str) -> str:
-    """Standardize common technology term variants."""
-    return _CANON_MAP.get(token, token)
-
 def _canonize_tokens(tokens: Iterable[str]) -> List[str]:
     """Apply term standardization and handle compound terms."""
     token_list = list(tokens)
@@ -48,10 +48,49 @@ class Settings(BaseSettings):
     # App
     FRONTEND_BASE_URL: str = Field("", description="Frontend base URL for links")
 
+    # Uploads
+    CV_MAX_UPLOAD_MB: int = Field(10, description="Largest accepted CV upload, in MB")
+    IMAGE_MAX_UPLOAD_MB: int = Field(5, description="Largest accepted avatar/logo upload, in MB")
+
+    # CV text extraction (utils/cv_text.py). The scorer only looks at the first
+    # few hundred tokens, so long portfolios are capped instead of read in full
+    CV_PDF_MAX_PAGES: int = Field(30, description="Only the first N pages of a PDF are read (0 = all)")
+    CV_PDF_TIMEOUT_SEC: float = Field(15, description="Wall-clock budget per PDF; the text read so far is returned (0 = none)")
+    CV_DOCX_MAX_XML_MB: int = Field(64, description="Reject DOCX files whose main XML part inflates beyond this")
+    CV_EXTRACTOR_PDF: str = Field("pypdf", description="pypdf | pymupdf (when installed)")
+    CV_EXTRACTOR_DOCX: str = Field("docx-stream", description="docx-stream | python-docx")
+
+    # Job listing (GET /jobs)
+    JOBS_PAGE_SIZE: int = Field(20, description="Jobs per page when no limit is given")
+    JOBS_PAGE_MAX: int = Field(100, description="Largest accepted limit")
+    JOBS_LIST_UNPAGED: bool = Field(False, description="Legacy: return every job when no limit/cursor is given")
+    # Public job list/detail response cache (per worker process)
+    JOBS_CACHE_ENABLED: bool = Field(True, description="Cache public GET /jobs and GET /jobs/{id} responses")
+    JOBS_CACHE_TTL_SEC: int = Field(30, description="Upper bound on staleness across worker processes")
+    JOBS_CACHE_MAX_ENTRIES: int = Field(1024, description="Cached responses kept per worker")
+    # Hybrid semantic + keyword search (GET /jobs/search)
+    JOBS_HYBRID_SEMANTIC_WEIGHT: float = Field(0.6, description="Share of bi-encoder cosine in the score; the rest is keyword overlap")
+    JOBS_HYBRID_MIN_SCORE: float = Field(0.2, description="Jobs scoring below this are not returned")
+    JOBS_HYBRID_QUERY_CACHE_SIZE: int = Field(512, description="Query embeddings memoized per worker")
+    JOBS_HYBRID_WARM_ON_STARTUP: bool = Field(True, description="Embed all searchable jobs in a background thread at startup")
+
+    # File storage: "local" (uploads/ on this node) or "s3" (any S3-compatible service)
+    STORAGE_BACKEND: str = Field("local", description="local | s3")
+    S3_BUCKET: str = Field("", description="Bucket for uploaded files")
+    S3_KEY_PREFIX: str = Field("", description="Optional key prefix inside the bucket")
+    S3_ENDPOINT_URL: str = Field("", description="Custom endpoint (MinIO, R2...); empty for AWS")
+    S3_REGION: str = Field("", description="Bucket region")
+    S3_ACCESS_KEY_ID: str = Field("", description="Empty to use the default AWS credential chain")
+    S3_SECRET_ACCESS_KEY: str = Field("", description="Empty to use the default AWS credential chain")
+    S3_PRESIGN_EXPIRES_SEC: int = Field(300, description="Lifetime of presigned download URLs")
+
     # AI/ML model settings
     BI_ENCODER_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
     CROSS_ENCODER_MODEL: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
     USE_CROSS_ENCODER: str = "true"
+    # Stop reading a CV once this many tokens were extracted for scoring (0 = whole CV).
+    # Well above a typical CV, so skills listed late still count; long portfolios stop early
+    CV_TEXT_TOKEN_BUDGET: int = Field(2000, description="Token budget for CV text used in scoring")
 
     # CORS configuration
     CORS_ORIGINS: str = ""
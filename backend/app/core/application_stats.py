@@ -0,0 +1,293 @@
+"""
+Daily application rollup (application_daily_stats) for the dashboards.
+
+One row per UTC day, job and status holds the number of applications, how
+many are scored, their score sum and a histogram of the scores, plus the
+job owner. The company summary and trend() read these rows instead of
+aggregating applications on every view.
+
+Rows are maintained from the ORM: a flush that inserts, rescores, moves
+(status, job, applied_at) or deletes Application objects adds the
+difference to the affected rows with one upsert, in the same transaction.
+Writes that bypass the session (raw SQL, bulk update(), ON DELETE CASCADE
+from users) are not seen; reconcile() rebuilds a range of days from
+applications and is meant to run periodically
+(scripts/reconcile_application_stats.py).
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Date, case, cast, delete, event, func, inspect, insert, null, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from .. import models
+
+# lower edges of the histogram bins; the last one is closed ([80, 100])
+SCORE_BINS = (0, 20, 40, 60, 80)
+BIN_COLUMNS = tuple(f"bin_{lo}" for lo in SCORE_BINS)
+COUNTERS = ("applications", "scored", "score_sum") + BIN_COLUMNS
+_KEY = ("day", "job_id", "status")
+_TRACKED = ("job_id", "status", "score", "applied_at")
+
+Stat = models.ApplicationDailyStat
+
+for _name in _TRACKED:
+    # load the previous value when an expired attribute is assigned, so its row can be decremented
+    event.listen(getattr(models.Application, _name), "set", lambda *_: None, active_history=True)
+
+def utc_day(value: Optional[datetime]) -> Optional[date]:
+    """UTC calendar day of a timestamp (naive ones are taken as UTC)."""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+def score_bin(score: float) -> int:
+    """Lower edge of the histogram bin of score."""
+    for lo, hi in zip(SCORE_BINS, SCORE_BINS[1:]):
+        if score < hi:
+            return lo
+    return SCORE_BINS[-1]
+
+def _contribution(job_id, status, score, applied_at) -> Tuple[Tuple, Dict[str, float]]:
+    counts = dict.fromkeys(COUNTERS, 0)
+    counts["applications"] = 1
+    if score is not None:
+        counts["scored"] = 1
+        counts["score_sum"] = float(score)
+        counts[f"bin_{score_bin(score)}"] = 1
+    return (utc_day(applied_at), job_id, status), counts
+
+def _old_value(state, name: str) -> Any:
+    history = state.attrs[name].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(state.obj(), name)  # expired (deleted after a commit): load it
+
+def _pending(session: Session) -> Dict[Tuple, Dict[str, float]]:
+    return session.info.setdefault("application_stats", defaultdict(lambda: dict.fromkeys(COUNTERS, 0)))
+
+def _add(deltas, key, counts, sign: int) -> None:
+    if key[0] is None or key[1] is None:
+        return
+    row = deltas[key]
+    for name, value in counts.items():
+        row[name] += sign * value
+
+@event.listens_for(Session, "before_flush")
+def _collect(session: Session, flush_context, instances) -> None:
+    deltas = None
+    for obj in session.new:
+        if isinstance(obj, models.Application):
+            if obj.applied_at is None:
+                # the server default, set here so the row and its day agree
+                obj.applied_at = datetime.now(timezone.utc)
+            deltas = deltas if deltas is not None else _pending(session)
+            _add(deltas, *_contribution(obj.job_id, obj.status or "pending", obj.score, obj.applied_at), 1)
+    for obj in session.dirty:
+        if not isinstance(obj, models.Application):
+            continue
+        state = inspect(obj)
+        if not any(state.attrs[name].history.has_changes() for name in _TRACKED):
+            continue
+        deltas = deltas if deltas is not None else _pending(session)
+        _add(deltas, *_contribution(*(_old_value(state, n) for n in _TRACKED)), -1)
+        _add(deltas, *_contribution(obj.job_id, obj.status, obj.score, obj.applied_at), 1)
+    deleted_jobs = {obj.id for obj in session.deleted if isinstance(obj, models.Job)}
+    for obj in session.deleted:
+        if isinstance(obj, models.Application):
+            state = inspect(obj)
+            old = [_old_value(state, n) for n in _TRACKED]
+            if old[0] in deleted_jobs:
+                continue  # its rows go with the job
+            deltas = deltas if deltas is not None else _pending(session)
+            _add(deltas, *_contribution(*old), -1)
+    if deleted_jobs:
+        session.info.setdefault("application_stats_jobs", set()).update(deleted_jobs)
+
+@event.listens_for(Session, "after_flush")
+def _apply(session: Session, flush_context) -> None:
+    deltas = session.info.pop("application_stats", None)
+    deleted_jobs = session.info.pop("application_stats_jobs", None)
+    if not deltas and not deleted_jobs:
+        return
+    conn = session.connection()
+    if deleted_jobs:
+        # ON DELETE CASCADE does this on Postgres; SQLite may not enforce foreign keys
+        conn.execute(delete(Stat).where(Stat.job_id.in_(deleted_jobs)))
+    rows = [dict(zip(_KEY, key), **counts) for key, counts in (deltas or {}).items() if any(counts.values())]
+    if not rows:
+        return
+    owners = dict(conn.execute(
+        select(models.Job.id, models.Job.owner_user_id).where(models.Job.id.in_({r["job_id"] for r in rows}))
+    ).all())
+    for row in rows:
+        row["owner_user_id"] = owners.get(row["job_id"])
+    # same key order in every transaction, so concurrent upserts cannot deadlock
+    rows.sort(key=lambda r: (r["day"], r["job_id"], r["status"]))
+    conn.execute(_upsert(conn.dialect.name), rows)
+
+def _upsert(dialect: str):
+    stmt = (pg_insert if dialect == "postgresql" else sqlite_insert)(Stat)
+    return stmt.on_conflict_do_update(
+        index_elements=list(_KEY),
+        set_={
+            "owner_user_id": stmt.excluded.owner_user_id,
+            **{name: getattr(Stat, name) + getattr(stmt.excluded, name) for name in COUNTERS},
+        },
+    )
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session) -> None:
+    session.info.pop("application_stats", None)
+    session.info.pop("application_stats_jobs", None)
+
+def day_of(col, dialect: str):
+    """SQL expression of the UTC day of a timestamp column."""
+    if dialect == "sqlite":
+        return func.date(col)  # stored in UTC
+    return cast(func.timezone("UTC", col), Date)
+
+def score_bin_of(col):
+    """SQL expression of score_bin(col), NULL for unscored rows."""
+    return case(
+        (col.is_(None), null()),
+        *((col < hi, lo) for lo, hi in zip(SCORE_BINS, SCORE_BINS[1:])),
+        else_=SCORE_BINS[-1],
+    )
+
+def reconcile(db: Session, since: Optional[date] = None, until: Optional[date] = None) -> int:
+    """
+    Rebuild the rollup rows of the UTC days in [since, until) (unbounded
+    sides when None) from applications; returns the number of rows written.
+    The caller commits.
+
+    On Postgres the table is locked against concurrent upserts until the
+    commit, so a flush running at the same time is counted exactly once.
+    """
+    A, J = models.Application, models.Job
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        db.execute(text("LOCK TABLE application_daily_stats IN SHARE ROW EXCLUSIVE MODE"))
+
+    day = day_of(A.applied_at, dialect)
+    bucket = score_bin_of(A.score)
+    source = (
+        select(day, A.job_id, A.status, J.owner_user_id, func.count(), func.count(A.score),
+               func.coalesce(func.sum(A.score), 0.0), *(func.count(case((bucket == lo, 1))) for lo in SCORE_BINS))
+        .join(J, J.id == A.job_id)
+        .where(A.applied_at.isnot(None))
+        .group_by(day, A.job_id, A.status, J.owner_user_id)
+    )
+    clear = delete(Stat)
+    # half-open ranges on the raw columns, so ix_applications_applied and the
+    # rollup's primary key serve them
+    if since is not None:
+        source = source.where(A.applied_at >= _utc_midnight(since))
+        clear = clear.where(Stat.day >= since)
+    if until is not None:
+        source = source.where(A.applied_at < _utc_midnight(until))
+        clear = clear.where(Stat.day < until)
+    db.execute(clear)
+    columns = list(_KEY) + ["owner_user_id"] + list(COUNTERS)
+    result = db.execute(insert(Stat).from_select(columns, source))
+    return max(result.rowcount or 0, 0)
+
+def _utc_midnight(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+GRANULARITIES = ("day", "week", "month")
+
+def period_start(day: date, granularity: str) -> date:
+    """First day of the calendar period holding day (ISO weeks start on Monday)."""
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+def _next_period(start: date, granularity: str) -> date:
+    if granularity == "week":
+        return start + timedelta(days=7)
+    if granularity == "month":
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+def periods(start: date, end: date, granularity: str, limit: Optional[int] = None) -> List[Tuple[date, date]]:
+    """
+    Calendar periods covering [start, end) as half-open (first, after_last)
+    day ranges, the first and last clipped to the range. ValueError when
+    there are more than limit.
+    """
+    out = []
+    lo = start
+    while lo < end:
+        if limit is not None and len(out) == limit:
+            raise ValueError(f"more than {limit} {granularity} periods")
+        hi = min(_next_period(period_start(lo, granularity), granularity), end)
+        out.append((lo, hi))
+        lo = hi
+    return out
+
+def mean_score(score_sum: float, scored: int) -> Optional[float]:
+    """
+    Average score to two decimals. Scores are stored with two decimals, so
+    rounding the sum to cents first drops the float error of the order the
+    database added them in: every backend gives the same average.
+    """
+    return round(round(score_sum, 2) / scored, 2) if scored else None
+
+def trend(
+    db: Session,
+    start: date,
+    end: date,
+    granularity: str = "day",
+    owner_id: Optional[int] = None,
+    job_id: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Applications per calendar period of the UTC days [start, end), empty
+    periods included.
+
+    Only per-day sums are read (day >= start AND day < end, on the owner/day
+    index or the primary key); grouping the days into weeks or months and
+    zero-filling happen here, so the result does not depend on the date
+    functions of the database.
+    """
+    buckets = periods(start, end, granularity, limit)
+    q = (
+        select(Stat.day, func.sum(Stat.applications), func.sum(Stat.scored), func.sum(Stat.score_sum))
+        .where(Stat.day >= start, Stat.day < end)
+        .group_by(Stat.day)
+    )
+    if owner_id:
+        q = q.where(Stat.owner_user_id == owner_id)
+    if job_id:
+        q = q.where(Stat.job_id == job_id)
+
+    firsts = [lo for lo, _ in buckets]
+    totals = [[0, 0, 0.0] for _ in buckets]
+    for day, applications, scored, score_sum in db.execute(q):
+        total = totals[bisect_right(firsts, day) - 1]
+        total[0] += int(applications or 0)
+        total[1] += int(scored or 0)
+        total[2] += float(score_sum or 0.0)
+    return [
+        {
+            "start": lo.isoformat(),
+            "end": hi.isoformat(),
+            "applications": applications,
+            "avg_score": mean_score(score_sum, scored),
+        }
+        for (lo, hi), (applications, scored, score_sum) in zip(buckets, totals)
+    ]
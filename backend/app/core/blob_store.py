@@ -0,0 +1,237 @@
+"""
+Content-addressable blob storage for uploads (CVs, avatars, company logos).
+
+Files are keyed by SHA-256 and laid out in a two-level sharded tree
+(<namespace>/ab/cd/<sha><ext>) so directories stay small and identical bytes
+are stored once. Public media (avatars, logos) lives under PUBLIC, served
+as-is at /static/blobs; CVs live under PRIVATE, which is never mounted and
+is only read by routes that check who is asking.
+
+Uploads stream to a staging file and are then handed to the configured
+storage backend (core/storage.py): an atomic rename on local disk, an upload
+for S3. The blobs table counts references: when the last one is released the
+file is removed after the releasing transaction commits.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import tempfile
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+from uuid import uuid4
+
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, event, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..database import SessionLocal
+from .static import IMMUTABLE, PRIVATE_NO_CACHE
+from .storage import Storage, build_storage
+from ..utils.images import DERIVATIVE_SIZES, MEDIA_TYPES, fallback_format, generate_derivatives
+from ..utils.uploads import StoredUpload, remove_quietly, save_upload
+
+logger = logging.getLogger("smartrecruit")
+
+# Uploads are staged here before being handed to storage (same filesystem as
+# LocalStorage, so its move is a rename, and outside the served directory)
+STAGING_DIR = Path("uploads") / ".blob_tmp"
+# Name of the route serving /static/blobs (see main.py)
+BLOB_MOUNT = "blobs"
+
+# Key namespaces: PUBLIC is served to anyone at /static/blobs, PRIVATE only
+# through authorized routes such as GET /cvs/{id}/download
+PUBLIC = "blobs"
+PRIVATE = "cvs"
+NAMESPACES = (PUBLIC, PRIVATE)
+
+# Sniffed content type -> stored extension of public images. Not SVG: it can
+# carry scripts, and these files are served from the API's own origin
+IMAGE_EXTENSIONS = {"image/png": ".png", "image/jpeg": ".jpg", "image/webp": ".webp", "image/gif": ".gif"}
+# extensions served at /static/blobs: the above, plus .jpeg from uploads that
+# were named after the client's filename
+SERVED_EXTENSIONS = frozenset(IMAGE_EXTENSIONS.values()) | {".jpeg"}
+
+# Resized image derivatives are served by routers/media.py under this prefix
+MEDIA_PREFIX = "/media"
+
+_BLOB_URL_RE = re.compile(r"/static/blobs/[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})(\.[A-Za-z0-9]+)$")
+
+class BlobRejected(Exception):
+    """Upload refused (empty or wrong content type); nothing was stored."""
+
+class BlobStore:
+    def __init__(self, storage: Storage):
+        self.storage = storage
+
+    # ---------- layout ----------
+    @staticmethod
+    def relpath(sha256: str, ext: str) -> str:
+        return f"{sha256[:2]}/{sha256[2:4]}/{sha256}{ext}"
+
+    def key(self, sha256: str, ext: str, namespace: str = PUBLIC) -> str:
+        return f"{namespace}/{self.relpath(sha256, ext)}"
+
+    @staticmethod
+    def derivative_prefix(sha256: str) -> str:
+        return f"derived/{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+    def derivative_key(self, sha256: str, size: int, fmt: str) -> str:
+        return f"{self.derivative_prefix(sha256)}/{size}.{fmt}"
+
+    def storage_path(self, blob: models.Blob, namespace: str = PUBLIC) -> str:
+        """Value stored in DB columns such as CV.file_path."""
+        return self.storage.stored_name(self.key(blob.sha256, blob.ext, namespace))
+
+    @staticmethod
+    def sha_from_url(url: Optional[str]) -> Optional[str]:
+        """SHA-256 of a blob URL built by url_for(BLOB_MOUNT, ...), else None."""
+        m = _BLOB_URL_RE.search(url or "")
+        return m.group(1) if m else None
+
+    @staticmethod
+    def variant_urls(url: Optional[str]) -> Optional[Dict[str, Dict[str, str]]]:
+        """
+        Size-specific URLs for an uploaded image, e.g. {"64": {"webp": ..., "png": ...}}.
+
+        Built from the URL alone (same host, no DB lookup) so it is cheap per
+        job card. None for legacy uploads and non-raster images.
+        """
+        m = _BLOB_URL_RE.search(url or "")
+        fallback = fallback_format(m.group(2)) if m else None
+        if not fallback:
+            return None
+        base = url[: m.start()] + f"{MEDIA_PREFIX}/{m.group(1)}"
+        return {
+            str(size): {fmt: f"{base}/{size}.{fmt}" for fmt in ("webp", fallback)}
+            for size in DERIVATIVE_SIZES
+        }
+
+    # ---------- writes ----------
+    async def put_upload(
+        self,
+        db: Session,
+        file: UploadFile,
+        *,
+        types: Mapping[str, str],
+        max_bytes: int,
+        namespace: str = PUBLIC,
+    ) -> models.Blob:
+        """
+        Store an upload under namespace and take one reference on its blob.
+
+        types maps the accepted content types, as sniffed from the bytes, to
+        the extension the file is stored with; the client's filename is never
+        used, so a served file cannot be anything other than what it holds.
+        Raises UploadTooLarge or BlobRejected; the caller commits the session.
+        """
+        await run_in_threadpool(STAGING_DIR.mkdir, parents=True, exist_ok=True)
+        tmp = STAGING_DIR / uuid4().hex
+        stored = await save_upload(file, tmp, max_bytes=max_bytes)
+        if stored.size == 0:
+            await run_in_threadpool(remove_quietly, tmp)
+            raise BlobRejected("Uploaded file is empty or unreadable")
+        ext = types.get(stored.mime)
+        if ext is None:
+            await run_in_threadpool(remove_quietly, tmp)
+            raise BlobRejected("File content does not match its type")
+        return await run_in_threadpool(self._commit_file, db, stored, ext, namespace)
+
+    def _commit_file(self, db: Session, stored: StoredUpload, ext: str, namespace: str) -> models.Blob:
+        blob = self._acquire(db, stored.sha256, create=(ext, stored))
+        key = self.key(blob.sha256, blob.ext, namespace)
+        if self.storage.exists(key):
+            remove_quietly(stored.path)  # duplicate bytes: keep the existing copy
+        else:
+            self.storage.put_file(
+                key, stored.path, content_type=blob.mime_type,
+                cache_control=IMMUTABLE if namespace == PUBLIC else PRIVATE_NO_CACHE,
+            )
+        return blob
+
+    def make_derivatives(self, sha256: str, ext: str) -> None:
+        """Resized copies of an image blob (utils/images.py); run as a background task."""
+        if fallback_format(ext) is None:
+            return
+        STAGING_DIR.mkdir(parents=True, exist_ok=True)
+        stored = self.storage.stored_name(self.key(sha256, ext))
+        with self.storage.open_local(stored) as src, tempfile.TemporaryDirectory(dir=STAGING_DIR) as out:
+            for size, fmt, path in generate_derivatives(src, ext, Path(out)):
+                self.storage.put_file(
+                    self.derivative_key(sha256, size, fmt), path,
+                    content_type=MEDIA_TYPES[fmt], cache_control=IMMUTABLE,
+                )
+
+    # ---------- references ----------
+    def acquire(self, db: Session, sha256: str) -> Optional[models.Blob]:
+        """Take a reference on an existing blob (None if unknown)."""
+        return self._acquire(db, sha256)
+
+    def _acquire(self, db: Session, sha256: str, create=None) -> Optional[models.Blob]:
+        res = db.execute(
+            update(models.Blob)
+            .where(models.Blob.sha256 == sha256)
+            .values(ref_count=models.Blob.ref_count + 1)
+        )
+        if res.rowcount == 0 and create is not None:
+            ext, stored = create
+            try:
+                with db.begin_nested():
+                    db.add(models.Blob(
+                        sha256=sha256, ext=ext, mime_type=stored.mime,
+                        size_bytes=stored.size, ref_count=1,
+                    ))
+            except IntegrityError:
+                # a concurrent upload of the same bytes created the row first
+                return self._acquire(db, sha256)
+        return db.get(models.Blob, sha256, populate_existing=True)
+
+    def release(self, db: Session, sha256: Optional[str]) -> None:
+        """Drop a reference; unreferenced files are removed once db commits."""
+        if not sha256:
+            return
+        db.execute(
+            update(models.Blob)
+            .where(models.Blob.sha256 == sha256, models.Blob.ref_count > 0)
+            .values(ref_count=models.Blob.ref_count - 1)
+        )
+        event.listen(db, "after_commit", lambda _s: self._collect(sha256), once=True)
+
+    def retarget(self, db: Session, old_url: Optional[str], new_url: Optional[str]) -> None:
+        """Move a reference when a column switches from one blob URL to another."""
+        old_sha, new_sha = self.sha_from_url(old_url), self.sha_from_url(new_url)
+        if old_sha == new_sha:
+            return
+        if new_sha:
+            self.acquire(db, new_sha)
+        self.release(db, old_sha)
+
+    def _collect(self, sha256: str) -> None:
+        db = SessionLocal()
+        try:
+            # the row goes only if it is still unreferenced at delete time: an
+            # upload of the same bytes may have taken a reference since release()
+            ext = db.execute(
+                delete(models.Blob)
+                .where(models.Blob.sha256 == sha256, models.Blob.ref_count <= 0)
+                .returning(models.Blob.ext)
+            ).scalar()
+            if ext is None:
+                db.rollback()
+                return
+            # files go before the commit: until then the deleted row stays locked,
+            # so a concurrent upload of these bytes waits and then writes them anew
+            for namespace in NAMESPACES:
+                self.storage.delete(self.key(sha256, ext, namespace))
+            self.storage.delete_prefix(self.derivative_prefix(sha256))
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.warning("blob_gc_failed", extra={"sha256": sha256}, exc_info=True)
+        finally:
+            db.close()
+
+blob_store = BlobStore(build_storage())
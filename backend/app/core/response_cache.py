@@ -0,0 +1,119 @@
+"""
+In-process cache for public JSON responses.
+
+Entries hold the rendered body and a strong ETag (hash of the body) and
+carry tags such as "jobs:list" or "job:42". Mutation endpoints call
+invalidate(tag) after committing, which drops every entry carrying it.
+A write racing with a cache fill is caught with a generation counter: an
+entry whose tags were invalidated while it was computed is not stored.
+
+Each worker process has its own cache and only sees the invalidations it
+handles itself, so entries also expire after JOBS_CACHE_TTL_SEC.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from starlette.responses import Response
+
+from ..config import settings
+from .serialization import dumps
+from .static import PRIVATE_NO_CACHE, etag_matches
+
+def etag_for(body: bytes) -> str:
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+@dataclass
+class CachedResponse:
+    content: Any  # JSON-compatible value the body was rendered from
+    body: bytes
+    etag: str
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, content: Any, headers: Optional[Dict[str, str]] = None) -> "CachedResponse":
+        body = dumps(content)
+        return cls(content=content, body=body, etag=etag_for(body), headers=dict(headers or {}))
+
+def cached_json_response(request_headers: Mapping[str, str], cached: CachedResponse) -> Response:
+    """The cached body with its ETag, or 304 when the client already has it."""
+    headers = {
+        **cached.headers,
+        "ETag": f'"{cached.etag}"',
+        # revalidate every time, never in a shared cache; the answer differs with the bearer token
+        "Cache-Control": PRIVATE_NO_CACHE,
+        "Vary": "Authorization",
+    }
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(cached.body, media_type="application/json", headers=headers)
+
+class ResponseCache:
+    def __init__(self, max_entries: int, ttl_sec: float, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        # key -> (expires_at, tags, response), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, frozenset, CachedResponse]]" = OrderedDict()
+        # bumped by every invalidation; tag -> generation it was last invalidated at
+        self._generation = 0
+        self._invalidated_at: Dict[str, int] = {}
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None:
+                return None
+            if hit[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return hit[2]
+
+    def generation(self) -> int:
+        """Snapshot to pass to set(); take it before reading from the DB."""
+        with self._lock:
+            return self._generation
+
+    def set(self, key: str, response: CachedResponse, tags: Iterable[str], generation: int) -> None:
+        if not self.enabled:
+            return
+        tags = tuple(tags)
+        with self._lock:
+            if any(self._invalidated_at.get(t, -1) > generation for t in tags):
+                return  # invalidated while the response was being computed
+            self._entries[key] = (time.monotonic() + self.ttl_sec, frozenset(tags), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *tags: str) -> None:
+        with self._lock:
+            self._generation += 1
+            for t in tags:
+                self._invalidated_at[t] = self._generation
+            stale = [k for k, (_, entry_tags, _) in self._entries.items() if entry_tags.intersection(tags)]
+            for k in stale:
+                del self._entries[k]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+# Public job responses. Tags: JOBS_LIST_TAG on listing pages, "job:<id>" and
+# "owner:<user id>" on job details
+JOBS_LIST_TAG = "jobs:list"
+job_cache = ResponseCache(
+    max_entries=settings.JOBS_CACHE_MAX_ENTRIES,
+    ttl_sec=settings.JOBS_CACHE_TTL_SEC,
+    enabled=settings.JOBS_CACHE_ENABLED,
+)
@@ -0,0 +1,123 @@
+"""
+Full-text search over jobs.
+
+Each job has a weighted search document: title (A) > skills (B) > missions (C)
+> descriptions (D). The database keeps it current on every write:
+
+- Postgres: jobs.search_vector (tsvector) filled by a trigger and indexed
+  with GIN (alembic revision add_jobs_search_vector).
+- SQLite (the development fallback in database.py): an FTS5 table jobs_fts
+  kept in sync by triggers, created by ensure_sqlite_fts() at startup.
+
+User input is reduced to word tokens and every token must match as a
+prefix. Both sides are folded to lowercase without accents, so
+"developpeur pyth" finds "Développeur Python".
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import List, Optional, Tuple
+
+from sqlalchemy import column, func, literal_column, table, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.engine import Engine
+
+from .. import models
+
+# Postgres text search configuration: job posts mix French and English, so
+# no language-specific stemming
+TS_CONFIG = "simple"
+# FTS5 bm25 column weights, same order as the tsvector weights A/B/C/D
+FTS_WEIGHTS = (10.0, 4.0, 2.0, 1.0)
+MAX_TERMS = 8
+
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+# not mapped on models.Job: the column only exists on Postgres and is never loaded
+search_vector = literal_column("jobs.search_vector", TSVECTOR)
+jobs_fts = table("jobs_fts", column("rowid"), column("rank"))
+
+def _fold(token: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", token.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+def search_terms(q: Optional[str]) -> List[str]:
+    """Folded word tokens of a user query (at most MAX_TERMS)."""
+    return [_fold(t) for t in _TOKEN_RE.findall(q or "")][:MAX_TERMS]
+
+def apply_search(query, terms: List[str], dialect: str) -> Tuple[object, object]:
+    """
+    Restrict a Job query to rows matching every term.
+
+    Returns (query, rank) where rank is a SQL expression, higher is better.
+    """
+    if dialect == "sqlite":
+        match = " ".join('"%s"*' % t for t in terms)
+        query = query.join(jobs_fts, jobs_fts.c.rowid == models.Job.id).filter(
+            literal_column("jobs_fts").op("MATCH")(match)
+        )
+        # FTS5 rank is the weighted bm25() configured in ensure_sqlite_fts; lower is better
+        return query, -jobs_fts.c.rank
+    tsquery = func.to_tsquery(TS_CONFIG, " & ".join(f"{t}:*" for t in terms))
+    query = query.filter(search_vector.op("@@")(tsquery))
+    return query, func.ts_rank_cd(search_vector, tsquery)
+
+# Flattens a JSON array column to space-separated text; plain strings pass through
+_SQLITE_FLAT = "CASE WHEN json_valid({c}) THEN (SELECT group_concat(value, ' ') FROM json_each({c})) ELSE {c} END"
+
+def _sqlite_row(prefix: str) -> str:
+    p = prefix
+    return ", ".join([
+        f"{p}.id",
+        f"{p}.title",
+        _SQLITE_FLAT.format(c=f"{p}.skills"),
+        _SQLITE_FLAT.format(c=f"{p}.missions"),
+        " || ' ' || ".join(
+            f"coalesce({p}.{c}, '')"
+            for c in ("company_name", "offer_description", "profile_requirements", "description", "company_overview")
+        ),
+    ])
+
+def ensure_sqlite_fts(engine: Engine) -> None:
+    """
+    Create (and backfill) jobs_fts with its sync triggers if missing.
+
+    Dropping the jobs table drops the triggers too, so a partial setup is
+    rebuilt from scratch.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    cols = "rowid, title, skills, missions, description"
+    names = ("jobs_fts", "jobs_fts_ai", "jobs_fts_au", "jobs_fts_ad")
+    with engine.begin() as conn:
+        present = {
+            row[0] for row in conn.execute(
+                text("SELECT name FROM sqlite_master WHERE name IN ('jobs', %s)" % ", ".join(f"'{n}'" for n in names))
+            )
+        }
+        if "jobs" not in present or present.issuperset(names):
+            return
+        for name in names[1:]:
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+        conn.execute(text("DROP TABLE IF EXISTS jobs_fts"))
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE jobs_fts USING fts5(title, skills, missions, description, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        ))
+        weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+        conn.execute(text(f"INSERT INTO jobs_fts(jobs_fts, rank) VALUES ('rank', 'bm25({weights})')"))
+        conn.execute(text(f"INSERT INTO jobs_fts({cols}) SELECT {_sqlite_row('jobs')} FROM jobs"))
+        conn.execute(text(
+            f"CREATE TRIGGER jobs_fts_ai AFTER INSERT ON jobs BEGIN "
+            f"INSERT INTO jobs_fts({cols}) SELECT {_sqlite_row('new')}; END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER jobs_fts_au AFTER UPDATE ON jobs BEGIN "
+            f"DELETE FROM jobs_fts WHERE rowid = old.id; "
+            f"INSERT INTO jobs_fts({cols}) SELECT {_sqlite_row('new')}; END"
+        ))
+        conn.execute(text(
+            "CREATE TRIGGER jobs_fts_ad AFTER DELETE ON jobs BEGIN "
+            "DELETE FROM jobs_fts WHERE rowid = old.id; END"
+        ))
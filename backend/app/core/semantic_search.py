@@ -0,0 +1,281 @@
+"""
+Hybrid free-text job search: bi-encoder similarity blended with keyword overlap.
+
+Meant for queries like "remote react developer Tunis" where the full-text
+search of core/search.py is too literal. Every job is embedded once with
+the scoring bi-encoder (ai_service.get_bi_encoder) into an in-process
+matrix and re-embedded only when its updated_at changes. A query is
+embedded once (memoized in an LRU, popular queries repeat) and scored
+against all candidates with a single matrix-vector product.
+
+The keyword side compares canonical tokens (ai_service._CANON_MAP, so
+"reactjs" finds "React.js") of the query with each job: a hit in the title,
+skills, location, work mode or contract type counts fully, a hit in the
+longer texts counts WEAK_HIT.
+
+    score = w * cosine + (1 - w) * keyword overlap,  w = JOBS_HYBRID_SEMANTIC_WEIGHT
+
+Each worker keeps its own index, filled by warm_job_index() at startup. A
+search only scores jobs already embedded and hands new or changed ones to a
+background thread, so no request waits for the encoder to embed jobs.
+Without sentence-transformers, or when the model cannot be loaded,
+SemanticSearchUnavailable is raised.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session, load_only
+
+from .. import models
+from ..config import settings
+from ..database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# keyword hit found only in the descriptions, relative to a title/skills hit
+WEAK_HIT = 0.5
+# French/English spellings of the same thing, on top of _CANON_MAP
+_SEARCH_ALIASES = {
+    "teletravail": "remote",
+    "distance": "remote",
+    "hybride": "hybrid",
+    "presentiel": "onsite",
+    "developpeur": "developer",
+    "developpeuse": "developer",
+    "dev": "developer",
+    "ingenieur": "engineer",
+    "stagiaire": "intern",
+    "stage": "intern",
+    "internship": "intern",
+}
+_STRONG_FIELDS = ("title", "skills", "location_city", "location_country", "work_mode", "employment_type")
+_WEAK_FIELDS = ("missions", "offer_description", "profile_requirements", "description")
+_LOAD_COLUMNS = ("id", "updated_at") + _STRONG_FIELDS + _WEAK_FIELDS
+_MISSING = object()
+
+class SemanticSearchUnavailable(RuntimeError):
+    pass
+
+@dataclass
+class SearchHit:
+    job_id: int
+    score: float
+    semantic: float
+    lexical: float
+
+def _ai():
+    try:
+        from ..services import ai_service
+    except Exception as e:  # sentence-transformers (or torch) missing or broken
+        raise SemanticSearchUnavailable(str(e) or e.__class__.__name__) from e
+    return ai_service
+
+def _text(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(v) for v in value if v)
+    return str(value or "")
+
+def search_tokens(text: str) -> List[str]:
+    """Canonical keywords of text, in order, without duplicates."""
+    ai = _ai()
+    # _tok keeps dots for "node.js"; drop sentence punctuation ("Tunis.")
+    words = (t.strip(".") for t in ai._tok(text))
+    tokens = (_SEARCH_ALIASES.get(t, t) for t in ai._canonize_tokens(w for w in words if w))
+    return list(dict.fromkeys(t for t in tokens if ai._is_keyword(t)))
+
+def _embedding_text(job: models.Job) -> str:
+    # title and skills first: the encoder truncates long inputs
+    parts = [job.title, _text(job.skills), job.work_mode, job.employment_type, job.location_city,
+             job.location_country, _text(job.missions), job.offer_description, job.profile_requirements,
+             job.description]
+    return ". ".join(p for p in parts if p)
+
+def _encode(texts: Sequence[str]) -> np.ndarray:
+    ai = _ai()
+    try:
+        model = ai.get_bi_encoder()
+        vectors = model.encode(list(texts), normalize_embeddings=True, convert_to_numpy=True)
+    except Exception as e:  # model download or load failure
+        raise SemanticSearchUnavailable(f"bi-encoder unavailable: {e}") from e
+    return np.asarray(vectors, dtype=np.float32)
+
+@lru_cache(maxsize=settings.JOBS_HYBRID_QUERY_CACHE_SIZE)
+def embed_query(query: str) -> np.ndarray:
+    """Unit vector of a normalized query; cached, so never modify the result."""
+    vector = _encode([query])[0]
+    vector.setflags(write=False)
+    return vector
+
+def normalize_query(q: str) -> str:
+    return " ".join((q or "").lower().split())
+
+def _keywords(job: models.Job) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """(strong, weak) keyword sets of a job; weak excludes the strong ones."""
+    strong = frozenset(search_tokens(" ".join(_text(getattr(job, f)) for f in _STRONG_FIELDS)))
+    weak = frozenset(search_tokens(" ".join(_text(getattr(job, f)) for f in _WEAK_FIELDS)))
+    return strong, weak - strong
+
+class JobEmbeddingIndex:
+    """Job id -> row of a growing embedding matrix, plus keyword sets."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.ndarray] = None
+        self._size = 0
+        self._free: List[int] = []
+        self._rows: Dict[int, int] = {}
+        # updated_at of the job version that was embedded
+        self._stamps: Dict[int, Any] = {}
+        self._keywords: Dict[int, Tuple[FrozenSet[str], FrozenSet[str]]] = {}
+        # ids being loaded and encoded by a refresh() outside the lock
+        self._pending: Set[int] = set()
+
+    def refresh(self, db: Session, stamps: Dict[int, Any], chunk: int = 256) -> None:
+        """
+        Embed the jobs of stamps (id -> updated_at) that are new or changed.
+
+        The lock is only held to pick the stale jobs and to store each chunk:
+        loading and encoding run outside it, so searches keep scoring against
+        the current vectors meanwhile. Jobs another refresh is already
+        encoding are left to it.
+        """
+        self._embed(db, self._claim_stale(stamps), chunk)
+
+    def refresh_in_background(self, stamps: Dict[int, Any]) -> None:
+        """refresh() in a daemon thread with its own session; returns at once."""
+        stale = self._claim_stale(stamps)
+        if stale:
+            threading.Thread(target=self._embed_in_session, args=(stale,), daemon=True).start()
+
+    def _claim_stale(self, stamps: Dict[int, Any]) -> List[int]:
+        with self._lock:
+            stale = [
+                i for i, s in stamps.items()
+                if self._stamps.get(i, _MISSING) != s and i not in self._pending
+            ]
+            self._pending.update(stale)
+        return stale
+
+    def _embed_in_session(self, stale: List[int]) -> None:
+        db = SessionLocal()
+        try:
+            self._embed(db, stale)
+        except Exception:
+            logger.warning("job embedding refresh failed", exc_info=True)
+        finally:
+            db.close()
+
+    def _embed(self, db: Session, stale: List[int], chunk: int = 256) -> None:
+        try:
+            Job = models.Job
+            for start in range(0, len(stale), chunk):
+                jobs = (
+                    db.query(Job)
+                    .options(load_only(*(getattr(Job, c) for c in _LOAD_COLUMNS)))
+                    .filter(Job.id.in_(stale[start:start + chunk]))
+                    .all()
+                )
+                if not jobs:
+                    continue
+                vectors = _encode([_embedding_text(j) for j in jobs])
+                entries = [(job.id, job.updated_at, vector, _keywords(job)) for job, vector in zip(jobs, vectors)]
+                with self._lock:
+                    for entry in entries:
+                        self._store(*entry)
+        finally:
+            with self._lock:
+                self._pending.difference_update(stale)
+
+    def _store(self, job_id: int, stamp: Any, vector: np.ndarray, keywords: Tuple[FrozenSet[str], FrozenSet[str]]) -> None:
+        row = self._rows.get(job_id)
+        if row is None:
+            row = self._free.pop() if self._free else self._grow(len(vector))
+            self._rows[job_id] = row
+        self._matrix[row] = vector
+        self._stamps[job_id] = stamp
+        self._keywords[job_id] = keywords
+
+    def _grow(self, dim: int) -> int:
+        if self._matrix is None:
+            self._matrix = np.zeros((64, dim), dtype=np.float32)
+        elif self._size == len(self._matrix):
+            self._matrix = np.concatenate([self._matrix, np.zeros_like(self._matrix)])
+        self._size += 1
+        return self._size - 1
+
+    def forget(self, job_id: int) -> None:
+        with self._lock:
+            row = self._rows.pop(job_id, None)
+            if row is not None:
+                self._free.append(row)
+                self._stamps.pop(job_id, None)
+                self._keywords.pop(job_id, None)
+
+    def score(self, job_ids: Sequence[int], query_vector: np.ndarray, terms: Sequence[str]):
+        """(ids, cosine, keyword overlap) for the indexed jobs among job_ids."""
+        with self._lock:
+            ids = [i for i in job_ids if i in self._rows]
+            if not ids:
+                return [], np.zeros(0), np.zeros(0)
+            cosine = (self._matrix[:self._size] @ query_vector)[[self._rows[i] for i in ids]]
+            lexical = np.zeros(len(ids))
+            if terms:
+                for n, job_id in enumerate(ids):
+                    strong, weak = self._keywords[job_id]
+                    lexical[n] = sum(1.0 if t in strong else WEAK_HIT if t in weak else 0.0 for t in terms)
+                lexical /= len(terms)
+        return ids, cosine, lexical
+
+job_index = JobEmbeddingIndex()
+
+# jobs GET /jobs/search can return
+SEARCHABLE_STATUSES = ("published", "archived")
+
+def warm_job_index() -> None:
+    """Embed every searchable job (run at startup, off the request path)."""
+    db = SessionLocal()
+    try:
+        Job = models.Job
+        stamps = dict(db.query(Job.id, Job.updated_at).filter(Job.status.in_(SEARCHABLE_STATUSES)).all())
+        job_index.refresh(db, stamps)
+        logger.info("job embedding index warm: %d jobs", len(stamps))
+    except SemanticSearchUnavailable as e:
+        logger.info("job embedding index not warmed: %s", e)
+    finally:
+        db.close()
+
+def hybrid_search(q: str, candidates: Dict[int, Any], limit: int) -> List[SearchHit]:
+    """
+    Best jobs among candidates (id -> updated_at) for q, best first.
+
+    Only jobs already in the index are scored (an edited job with its previous
+    vector); new and changed ones are embedded in the background for the next
+    searches. Jobs scoring below JOBS_HYBRID_MIN_SCORE are dropped.
+    """
+    query = normalize_query(q)
+    if not query or not candidates:
+        return []
+    terms = search_tokens(query)
+    query_vector = embed_query(query)
+    job_index.refresh_in_background(candidates)
+    ids, cosine, lexical = job_index.score(list(candidates), query_vector, terms)
+    if not ids:
+        return []
+    w = settings.JOBS_HYBRID_SEMANTIC_WEIGHT
+    cosine = np.clip(cosine, 0.0, 1.0)
+    scores = w * cosine + (1.0 - w) * lexical
+    keep = np.flatnonzero(scores >= settings.JOBS_HYBRID_MIN_SCORE)
+    if len(keep) > limit:
+        keep = keep[np.argpartition(-scores[keep], limit - 1)[:limit]]
+    # ties: newest job (highest id) first
+    order = sorted(keep, key=lambda n: (-scores[n], -ids[n]))
+    return [
+        SearchHit(ids[n], round(float(scores[n]), 4), round(float(cosine[n]), 4), round(float(lexical[n]), 4))
+        for n in order
+    ]
@@ -0,0 +1,64 @@
+"""
+JSON rendering for list endpoints.
+
+Returning a list from a route with response_model makes FastAPI validate
+every item, dump it back to Python, walk the result with jsonable_encoder
+and json.dumps it: each row is visited four times. List endpoints here
+validate rows once through a TypeAdapter built at import time, dump them
+with pydantic-core and render bytes with orjson, then return the Response
+themselves so FastAPI skips its own pass.
+
+orjson is optional; without it the stdlib json module renders the same
+values (slower).
+"""
+from __future__ import annotations
+
+import datetime
+import decimal
+import json
+from typing import Any, Iterable
+
+from pydantic import TypeAdapter
+from starlette.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+def _default(value: Any) -> Any:
+    """Types neither orjson nor json handle, encoded like jsonable_encoder does."""
+    if isinstance(value, decimal.Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, (datetime.date, datetime.time)):  # stdlib json only
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON bytes of content."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":"),
+    ).encode("utf-8")
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps(); return it from a route to bypass jsonable_encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def list_adapter(model: type) -> TypeAdapter:
+    """Adapter for List[model]; build it once at module level."""
+    return TypeAdapter(list[model])
+
+def dump_list(adapter: TypeAdapter, rows: Iterable[Any]) -> list:
+    """Validate ORM objects or rows once and return JSON-compatible dicts."""
+    return adapter.dump_python(adapter.validate_python(rows, from_attributes=True), mode="json")
+
+def list_response(adapter: TypeAdapter, rows: Iterable[Any]) -> Response:
+    """rows validated once and rendered straight to JSON bytes by pydantic-core."""
+    body = adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+    return Response(body, media_type="application/json")
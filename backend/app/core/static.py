@@ -0,0 +1,98 @@
+"""
+HTTP caching for uploaded files.
+
+Public media (avatars, logos and their resized copies) is content-addressed
+and never changes under a given URL, so it is served with a year-long
+immutable Cache-Control and its SHA-256 as ETag; other public files get a
+short max-age. Responses behind an auth check (CVs) are marked private so
+shared caches never keep them. Every response here answers
+If-None-Match / If-Modified-Since with 304. FileResponse handles Range and
+If-Range, so PDF viewers can fetch a CV piece by piece.
+"""
+from __future__ import annotations
+
+import os
+import re
+from email.utils import parsedate
+from typing import Iterable, Mapping, Optional
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+# behind an auth check: the browser may keep it but revalidates on each use
+PRIVATE_NO_CACHE = "private, no-cache"
+# behind an auth check and not to be kept at all (presigned redirects, exports)
+PRIVATE_NO_STORE = "private, no-store"
+
+_SHA_NAME_RE = re.compile(r"^([0-9a-f]{64})\.[A-Za-z0-9]+$")
+
+def etag_matches(if_none_match: str, etag: Optional[str]) -> bool:
+    """Whether an If-None-Match header value covers etag (weak comparison)."""
+    if if_none_match.strip() == "*":
+        return True
+    tags = [t.strip() for t in if_none_match.split(",")]
+    tags = [t[2:] if t.startswith("W/") else t for t in tags]
+    return etag in tags
+
+def _is_not_modified(response_headers, request_headers: Headers) -> bool:
+    # same rules as StaticFiles.is_not_modified: If-None-Match wins over If-Modified-Since
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match:
+        return etag_matches(if_none_match, response_headers.get("etag"))
+    since = parsedate(request_headers.get("if-modified-since") or "")
+    last_modified = parsedate(response_headers.get("last-modified") or "")
+    return since is not None and last_modified is not None and since >= last_modified
+
+def cached_file_response(
+    path,
+    request_headers: Headers,
+    *,
+    cache_control: str,
+    etag: Optional[str] = None,
+    media_type: Optional[str] = None,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """FileResponse with caching headers, or 304 when the client copy is current."""
+    response = FileResponse(path, media_type=media_type, headers=dict(headers or {}), stat_result=os.stat(path))
+    response.headers["cache-control"] = cache_control
+    if etag:
+        response.headers["etag"] = f'"{etag}"'
+    if _is_not_modified(response.headers, request_headers):
+        return NotModifiedResponse(response.headers)
+    return response
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles with Cache-Control, for public files only.
+
+    With immutable=True, files named <sha256><ext> are cached for a year and
+    tagged with their hash; everything else is cached for max_age seconds.
+    When extensions is given, other files are a 404 whatever is on disk.
+    """
+
+    def __init__(self, *args, immutable: bool = False, max_age: int = 3600,
+                 extensions: Optional[Iterable[str]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.immutable = immutable
+        self.max_age = max_age
+        self.extensions = frozenset(extensions) if extensions is not None else None
+
+    async def get_response(self, path: str, scope) -> Response:
+        if self.extensions is not None and os.path.splitext(path)[1].lower() not in self.extensions:
+            raise HTTPException(status_code=404)
+        return await super().get_response(path, scope)
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        m = _SHA_NAME_RE.match(os.path.basename(full_path)) if self.immutable else None
+        if m:
+            response.headers["etag"] = f'"{m.group(1)}"'
+            response.headers["cache-control"] = IMMUTABLE
+        else:
+            response.headers["cache-control"] = f"public, max-age={self.max_age}"
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
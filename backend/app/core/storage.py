@@ -0,0 +1,261 @@
+"""
+Object storage backends for uploaded files.
+
+Files are addressed by forward-slash keys such as "blobs/ab/cd/<sha>.pdf".
+LocalStorage keeps them under uploads/ on the API node. S3Storage puts them in
+an S3-compatible bucket (AWS, MinIO, R2...) and hands out short-lived
+presigned URLs, so downloads go straight to the bucket instead of through a
+Python worker. STORAGE_BACKEND selects one; boto3 is only needed for "s3".
+
+DB columns (e.g. CV.file_path) hold stored_name(key): a relative local path
+for LocalStorage, an s3://bucket/key URI for S3Storage.
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+from urllib.parse import quote
+
+try:
+    import boto3
+    from botocore.config import Config as BotoConfig
+    from botocore.exceptions import ClientError
+except ImportError:  # optional dependency
+    boto3 = None
+
+from ..config import settings
+from ..utils.uploads import CHUNK_SIZE
+
+class Storage(ABC):
+    """Interface shared by the storage backends."""
+
+    # True when files can be served from local disk (StaticFiles / FileResponse)
+    serves_locally = False
+
+    @abstractmethod
+    def put_file(self, key: str, src: Path, *, content_type: Optional[str] = None,
+                 cache_control: Optional[str] = None) -> None:
+        """Move the local file src to key (src is consumed)."""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """Whether an object is stored under key."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove key; no error when it does not exist."""
+
+    @abstractmethod
+    def delete_prefix(self, prefix: str) -> None:
+        """Remove every key under prefix/."""
+
+    @abstractmethod
+    def stored_name(self, key: str) -> str:
+        """Value to persist in DB columns for key."""
+
+    @abstractmethod
+    def key_for(self, stored: str) -> Optional[str]:
+        """Inverse of stored_name; None if stored belongs to another backend."""
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """Path of key on this node's disk, if the backend has one."""
+        return None
+
+    def presigned_url(self, key: str, *, filename: Optional[str] = None,
+                      content_type: Optional[str] = None) -> Optional[str]:
+        """Short-lived direct download URL, if the backend supports it."""
+        return None
+
+    @contextmanager
+    def open_local(self, stored: str) -> Iterator[Path]:
+        """
+        A local file for a stored name, e.g. to run extraction on a CV.
+
+        Remote objects are downloaded to a temp file that is removed on exit;
+        local paths (including legacy rows) are yielded unchanged.
+        """
+        yield Path(stored)
+
+    def iter_bytes(self, stored: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Stream a stored file in chunks without loading it whole.
+
+        Raises FileNotFoundError on the first next() when it does not exist.
+        """
+        with open(stored, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+class LocalStorage(Storage):
+    serves_locally = True
+
+    def __init__(self, root: Path = Path("uploads")):
+        self.root = root
+
+    def local_path(self, key: str) -> Path:
+        return self.root / key
+
+    def put_file(self, key, src, *, content_type=None, cache_control=None) -> None:
+        dest = self.local_path(key)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.replace(src, dest)  # atomic when src is on the same filesystem
+        except OSError:
+            tmp = dest.with_name(f".{dest.name}.tmp")
+            shutil.copyfile(src, tmp)
+            os.replace(tmp, dest)
+            os.unlink(src)
+
+    def exists(self, key) -> bool:
+        return self.local_path(key).is_file()
+
+    def delete(self, key) -> None:
+        try:
+            os.unlink(self.local_path(key))
+        except OSError:
+            pass
+
+    def delete_prefix(self, prefix) -> None:
+        shutil.rmtree(self.local_path(prefix), ignore_errors=True)
+
+    def stored_name(self, key) -> str:
+        return str(self.local_path(key)).replace("\\", "/")
+
+    def key_for(self, stored) -> Optional[str]:
+        root = str(self.root).replace("\\", "/").rstrip("/") + "/"
+        stored = stored.replace("\\", "/")
+        return stored[len(root):] if stored.startswith(root) else None
+
+class S3Storage(Storage):
+    def __init__(
+        self,
+        bucket: str,
+        *,
+        prefix: str = "",
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        expires_sec: int = 300,
+    ):
+        if boto3 is None:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires boto3 (pip install boto3)")
+        if not bucket:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires S3_BUCKET")
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.expires_sec = expires_sec
+        # credentials fall back to boto3's usual chain (env, profile, instance role)
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            region_name=region or None,
+            aws_access_key_id=access_key_id or None,
+            aws_secret_access_key=secret_access_key or None,
+            config=BotoConfig(signature_version="s3v4"),
+        )
+
+    def _k(self, key: str) -> str:
+        return self.prefix + key
+
+    def put_file(self, key, src, *, content_type=None, cache_control=None) -> None:
+        extra = {}
+        if content_type:
+            extra["ContentType"] = content_type
+        if cache_control:
+            extra["CacheControl"] = cache_control
+        self.client.upload_file(str(src), self.bucket, self._k(key), ExtraArgs=extra or None)
+        os.unlink(src)
+
+    def exists(self, key) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._k(key))
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def delete(self, key) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._k(key))
+
+    def delete_prefix(self, prefix) -> None:
+        pages = self.client.get_paginator("list_objects_v2").paginate(
+            Bucket=self.bucket, Prefix=self._k(prefix.rstrip("/") + "/"),
+        )
+        for page in pages:
+            objects = [{"Key": o["Key"]} for o in page.get("Contents", [])]
+            if objects:
+                self.client.delete_objects(Bucket=self.bucket, Delete={"Objects": objects, "Quiet": True})
+
+    def stored_name(self, key) -> str:
+        return f"s3://{self.bucket}/{self._k(key)}"
+
+    def key_for(self, stored) -> Optional[str]:
+        head = f"s3://{self.bucket}/{self.prefix}"
+        return stored[len(head):] if stored.startswith(head) else None
+
+    def presigned_url(self, key, *, filename=None, content_type=None) -> str:
+        params = {"Bucket": self.bucket, "Key": self._k(key)}
+        if filename:
+            params["ResponseContentDisposition"] = f"inline; filename*=UTF-8''{quote(filename)}"
+        if content_type:
+            params["ResponseContentType"] = content_type
+        return self.client.generate_presigned_url("get_object", Params=params, ExpiresIn=self.expires_sec)
+
+    def iter_bytes(self, stored: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        key = self.key_for(stored)
+        if key is None:
+            yield from super().iter_bytes(stored, chunk_size)
+            return
+        try:
+            body = self.client.get_object(Bucket=self.bucket, Key=self._k(key))["Body"]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                raise FileNotFoundError(stored) from e
+            raise
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
+
+    @contextmanager
+    def open_local(self, stored: str) -> Iterator[Path]:
+        key = self.key_for(stored)
+        if key is None:
+            yield Path(stored)
+            return
+        fd, tmp = tempfile.mkstemp(suffix=Path(key).suffix)
+        os.close(fd)
+        try:
+            self.client.download_file(self.bucket, self._k(key), tmp)
+            yield Path(tmp)
+        finally:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+def build_storage() -> Storage:
+    backend = (settings.STORAGE_BACKEND or "local").lower()
+    if backend == "local":
+        return LocalStorage()
+    if backend == "s3":
+        return S3Storage(
+            settings.S3_BUCKET,
+            prefix=settings.S3_KEY_PREFIX,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            expires_sec=settings.S3_PRESIGN_EXPIRES_SEC,
+        )
+    raise RuntimeError(f"Unknown STORAGE_BACKEND: {backend}")
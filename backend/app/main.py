@@ -5,16 +5,20 @@ Handles routing, middleware, and core application setup.
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 import os
+import threading
 from dotenv import load_dotenv
 
 from . import models
 from .database import engine
 from .config import settings
-from .routers import auth, users, jobs, cvs, applications, admin_analytics, company_analytics, company
+from .routers import auth, users, jobs, cvs, applications, admin_analytics, company_analytics, company, media
 from .services.ai_service import compute_deterministic_score
 from .core.logging import setup_logging
+from .core.static import CachedStaticFiles
+from .core.blob_store import SERVED_EXTENSIONS, blob_store
+from .core import application_stats  # noqa: F401  flush hooks keeping the daily rollup current
+from .core.search import ensure_sqlite_fts
 
 # Load environment variables
 load_dotenv()
@@ -22,6 +26,8 @@ load_dotenv()
 # Create database tables in development (use Alembic for production)
 if os.getenv("CREATE_TABLES", "false").lower() in {"1", "true", "yes"}:
     models.Base.metadata.create_all(bind=engine)
+# Job search index for the SQLite fallback (Postgres gets its own via Alembic)
+ensure_sqlite_fts(engine)
 
 # Set up application logging
 setup_logging(debug=getattr(settings, "DEBUG", False))
@@ -41,6 +47,19 @@ def _warm_models():
         import logging
         logging.getLogger("smartrecruit").warning("warmup_failed", exc_info=e)
 
+@app.on_event("startup")
+def _warm_job_search():
+    """Embed the jobs for GET /jobs/search in the background, so searches never do it."""
+    if settings.JOBS_HYBRID_WARM_ON_STARTUP:
+        from .core.semantic_search import warm_job_index
+        threading.Thread(target=warm_job_index, name="job-index-warmup", daemon=True).start()
+
+@app.on_event("shutdown")
+def _stop_extraction_workers():
+    """Stop CV extraction worker processes."""
+    from .utils.cv_sandbox import shutdown_sandbox
+    shutdown_sandbox()
+
 # Add request logging middleware if enabled
 if getattr(settings, "ENABLE_REQUEST_LOGS", True):
     from .core.middleware import RequestIdMiddleware, AccessLogMiddleware
@@ -63,6 +82,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Link"],
 )
 
 # Register API routers
@@ -74,6 +94,7 @@ app.include_router(applications.router)
 app.include_router(admin_analytics.router)
 app.include_router(company_analytics.router)
 app.include_router(company.router)
+app.include_router(media.router)
 
 # Set up static file serving for uploads
 if not os.path.exists("uploads"):
@@ -83,8 +104,22 @@ if not os.path.exists("uploads/company_logos"):
 if not os.path.exists("uploads/avatars"):
     os.makedirs("uploads/avatars")
 
-app.mount("/static/company_logos", StaticFiles(directory="uploads/company_logos"), name="company_logos")
-app.mount("/static/avatars", StaticFiles(directory="uploads/avatars"), name="avatars")
+# Legacy uploads: uuid names that are never rewritten, so a day of caching is safe
+app.mount("/static/company_logos", CachedStaticFiles(directory="uploads/company_logos", max_age=86400), name="company_logos")
+app.mount("/static/avatars", CachedStaticFiles(directory="uploads/avatars", max_age=86400), name="avatars")
+# Public content-addressed media (see core/blob_store.py; CVs are kept apart and
+# only served by /cvs/{id}/download): cached as immutable when on local disk,
+# otherwise redirected to presigned URLs on the object store
+if blob_store.storage.serves_locally:
+    os.makedirs("uploads/blobs", exist_ok=True)
+    app.mount(
+        "/static/blobs",
+        # images only, even if an older upload left something else on disk
+        CachedStaticFiles(directory="uploads/blobs", immutable=True, extensions=SERVED_EXTENSIONS),
+        name="blobs",
+    )
+else:
+    app.include_router(media.blobs_router)
 
 @app.get("/health")
 def health():
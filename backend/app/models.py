@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, Date, DateTime, ForeignKey, Float, text, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, Boolean, Date, DateTime, ForeignKey, Float, Index, text, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import JSONB
 from .database import Base
@@ -68,6 +68,12 @@ class Job(Base):
         nullable=False,
         server_default=text("'[]'::jsonb")
     )
+    # skills in canonical form (utils/skills.py), for the GET /jobs filter and facets
+    skills_canon = Column(
+        JSONB(astext_type=Text()),
+        nullable=False,
+        server_default=text("'[]'::jsonb")
+    )
 
     description = Column(Text, nullable=True)
     deadline = Column(Date, nullable=True)
@@ -109,5 +115,42 @@ class CV(Base):
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     file_path = Column(String, nullable=False)
     uploaded_at = Column(DateTime(timezone=True))
+    # filled while the upload streams (older rows may be NULL)
+    content_sha256 = Column(String(64), nullable=True)
+    mime_type = Column(String(120), nullable=True)
+    size_bytes = Column(Integer, nullable=True)
 
     user = relationship("User", back_populates="cvs")
+
+class Blob(Base):
+    """Content-addressed upload file (see core/blob_store.py)."""
+    __tablename__ = "blobs"
+    sha256 = Column(String(64), primary_key=True)
+    ext = Column(String(16), nullable=False, server_default="")
+    mime_type = Column(String(120), nullable=True)
+    size_bytes = Column(Integer, nullable=False)
+    # rows referencing the file (CVs, avatars, logos); the file is removed at 0
+    ref_count = Column(Integer, nullable=False, server_default="0")
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=text('now()'))
+
+class ApplicationDailyStat(Base):
+    """Applications of one job per UTC day and status (see core/application_stats.py)."""
+    __tablename__ = "application_daily_stats"
+    day = Column(Date, primary_key=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(String, primary_key=True)
+    # copy of jobs.owner_user_id, so a company's dashboard reads this table alone
+    owner_user_id = Column(Integer, nullable=True)
+    applications = Column(Integer, nullable=False, server_default="0")
+    scored = Column(Integer, nullable=False, server_default="0")
+    score_sum = Column(Float, nullable=False, server_default="0")
+    # scored applications per histogram bin: [0, 20), [20, 40), ... [80, 100]
+    bin_0 = Column(Integer, nullable=False, server_default="0")
+    bin_20 = Column(Integer, nullable=False, server_default="0")
+    bin_40 = Column(Integer, nullable=False, server_default="0")
+    bin_60 = Column(Integer, nullable=False, server_default="0")
+    bin_80 = Column(Integer, nullable=False, server_default="0")
+
+    __table_args__ = (
+        Index("ix_application_daily_stats_owner_day", "owner_user_id", "day"),
+    )
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, text
+from sqlalchemy import Float, case, func, or_, select
+from sqlalchemy.dialects.postgresql import array
 from datetime import date
 from ..database import get_db
 from ..deps import require_admin
@@ -8,27 +9,62 @@ from .. import models
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+SCORE_BINS = [0, 20, 40, 60, 80, 100]
+PERCENTILES = (0.5, 0.9, 0.99)
+
+def _offset_percentiles(db: Session, scored: int):
+    """percentile_cont by reading the one or two scores around each rank (no ordered-set aggregates)."""
+    score = models.Application.score
+    values = []
+    for p in PERCENTILES:
+        rank = (scored - 1) * p
+        below = int(rank)
+        pair = db.execute(
+            select(score).where(score.isnot(None)).order_by(score).offset(below).limit(2)
+        ).scalars().all()
+        value = pair[0]
+        if len(pair) == 2:
+            value += (pair[1] - pair[0]) * (rank - below)
+        values.append(value)
+    return values
+
+def _score_stats(db: Session):
+    """
+    Histogram and percentiles of the application scores, computed in the
+    database: one row comes back whatever the number of applications.
+    Bins are half-open except the last ([80, 100]), as np.histogram counts.
+    """
+    score = models.Application.score
+    last = len(SCORE_BINS) - 2
+    columns = [func.count(score)] + [
+        func.count(case(((score >= lo) & ((score <= hi) if i == last else (score < hi)), 1)))
+        for i, (lo, hi) in enumerate(zip(SCORE_BINS, SCORE_BINS[1:]))
+    ]
+    postgres = db.get_bind().dialect.name == "postgresql"
+    if postgres:
+        # one sort of the scores for the three percentiles
+        columns.append(func.percentile_cont(array(PERCENTILES, type_=Float)).within_group(score))
+    row = db.execute(select(*columns).where(score.isnot(None))).one()
+    scored = int(row[0])
+    if not scored:
+        return None, None
+    values = list(row[-1]) if postgres else _offset_percentiles(db, scored)
+    hist = {"bins": SCORE_BINS, "counts": [int(c) for c in row[1:len(SCORE_BINS)]]}
+    percentiles = {f"p{round(p * 100)}": round(float(v), 2) for p, v in zip(PERCENTILES, values)}
+    return hist, percentiles
+
 def _summary(db: Session):
     total_jobs = db.query(models.Job).count()
     open_jobs = db.query(models.Job).filter(or_(models.Job.deadline == None, models.Job.deadline >= date.today())).count()
-    # Use text() for raw SQL to avoid column selection issues
-    total_apps_result = db.execute(text("SELECT COUNT(*) FROM applications")).scalar()
-    total_apps = total_apps_result or 0
 
     # Get status counts
-    status_result = db.execute(text("SELECT status, COUNT(*) as count FROM applications GROUP BY status")).fetchall()
+    status_result = db.query(models.Application.status, func.count()).group_by(models.Application.status).all()
     by_status = {str(s) if s else "unknown": int(c) for s, c in status_result}
+    total_apps = sum(by_status.values())
 
-    # Get scores
-    scores_result = db.execute(text("SELECT score FROM applications WHERE score IS NOT NULL")).fetchall()
-    scores = [s[0] for s in scores_result if s[0] is not None]
-
-    hist = None
-    if scores:
-        import numpy as np
-        counts, edges = np.histogram(scores, bins=[0,20,40,60,80,100])
-        hist = {"bins": [0,20,40,60,80,100], "counts": counts.tolist()}
-    return {"jobs": total_jobs, "open_jobs": open_jobs, "applications": total_apps, "by_status": by_status, "score_histogram": hist}
+    hist, percentiles = _score_stats(db)
+    return {"jobs": total_jobs, "open_jobs": open_jobs, "applications": total_apps, "by_status": by_status,
+            "score_histogram": hist, "score_percentiles": percentiles}
 
 @router.get("/stats")
 def stats(db: Session = Depends(get_db), _=Depends(require_admin)):
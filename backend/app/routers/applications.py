@@ -2,12 +2,16 @@ from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from ..database import SessionLocal
-from ..utils.cv_text import extract_text_from_file, clean_extracted_text
+from ..utils.cv_text import clean_extracted_text
+from ..utils.cv_sandbox import ExtractionError, extract_text_with_meta_sandboxed, extract_text_budgeted_with_meta_sandboxed
 from ..services.ai_service import score_cv_to_job, score_components, parse_profile_requirements, _tok, _canonize_tokens, LEN_TIER_HARD, LEN_TIER_SOFT, MUST_CAP_NO_HIT
 # import relative
 from ..deps import get_db, get_current_user
 from .. import models, schemas
 from ..config import settings
+from ..core.blob_store import blob_store
+from ..core.serialization import list_adapter, list_response
+from contextlib import ExitStack
 from datetime import datetime, timezone
 from pathlib import Path
 import re
@@ -47,8 +51,21 @@ def _resolve_cv_full_path(file_path: str) -> Path:
 
     return p
 
+def _extract_cv_for_scoring(cv_path: str) -> dict:
+    """
+    Cleaned CV text as the scorer sees it, with the extraction report
+    (pages_read, truncated, timed_out, ...). Raises ExtractionError.
+    """
+    budget = settings.CV_TEXT_TOKEN_BUDGET
+    if budget > 0:
+        # stream blocks and stop as soon as the scorer has enough text
+        return extract_text_budgeted_with_meta_sandboxed(cv_path, max_tokens=budget)
+    extraction = extract_text_with_meta_sandboxed(cv_path)
+    return dict(extraction, text=clean_extracted_text(extraction["text"]), budget_reached=False)
+
 def background_compute_and_save_score(db_session_factory, app_id: int) -> None:
     db: Session = db_session_factory()
+    files = ExitStack()  # temp copy of a CV held in object storage
     try:
         app = db.query(models.Application).get(app_id)
         if not app:
@@ -59,7 +76,8 @@ def background_compute_and_save_score(db_session_factory, app_id: int) -> None:
         if not cv or not job:
             return
 
-        full_cv_path = _resolve_cv_full_path(cv.file_path)
+        local_cv = files.enter_context(blob_store.storage.open_local(cv.file_path))
+        full_cv_path = _resolve_cv_full_path(str(local_cv))
         try:
             size = full_cv_path.stat().st_size
         except FileNotFoundError:
@@ -71,9 +89,15 @@ def background_compute_and_save_score(db_session_factory, app_id: int) -> None:
             print("[SCORING][background] failed: Cannot read an empty file")
             return
 
-        # Extract & clean CV text
-        raw_cv = extract_text_from_file(str(full_cv_path))
-        cv_text = clean_extracted_text(raw_cv)
+        # Extract & clean CV text in the sandbox (page-capped, time-boxed for PDFs)
+        try:
+            extraction = _extract_cv_for_scoring(str(full_cv_path))
+        except ExtractionError as e:
+            logger.warning("scoring.extraction_failed", extra={"app_id": app_id, **e.to_dict()})
+            return
+        if extraction["timed_out"]:
+            print(f"[SCORING] extraction timed out after {extraction['pages_read']} pages, scoring partial text")
+        cv_text = extraction["text"]
 
         skills_txt = " ".join(sorted(set(job.skills or [])))
         missions_txt = " ".join(sorted(set(job.missions or [])))
@@ -113,6 +137,7 @@ def background_compute_and_save_score(db_session_factory, app_id: int) -> None:
     except Exception as e:
         print("[SCORING][background] failed:", e)
     finally:
+        files.close()
         db.close()
 
 router = APIRouter(prefix="/applications", tags=["applications"])
@@ -177,6 +202,8 @@ def create_application(payload: schemas.ApplicationCreate,
 
     return app
 
+_MY_APPLICATIONS = list_adapter(schemas.MyApplicationRead)
+
 @router.get("/me", response_model=list[schemas.MyApplicationRead])
 def my_applications(db: Session = Depends(get_db), user=Depends(get_current_user)):
     rows = (
@@ -193,17 +220,8 @@ def my_applications(db: Session = Depends(get_db), user=Depends(get_current_user
         .order_by(models.Application.applied_at.desc())
         .all()
     )
-    return [
-        {
-            "id": r.id,
-            "job_id": r.job_id,
-            "job_title": r.job_title,
-            "status": r.status,
-            "score": r.score,
-            "applied_at": r.applied_at,
-        }
-        for r in rows
-    ]
+    # rows carry exactly the MyApplicationRead fields
+    return list_response(_MY_APPLICATIONS, rows)
 
 @router.patch("/{application_id}/status")
 def update_application_status(application_id: int, payload: dict,
@@ -263,8 +281,13 @@ def debug_score(cv_id: int, job_id: int, db: Session = Depends(get_db),
 
     job = db.query(models.Job).get(job_id)
     cv = db.query(models.CV).get(cv_id)
-    full_cv_path = _resolve_cv_full_path(cv.file_path)
-    cv_text = clean_extracted_text(extract_text_from_file(str(full_cv_path)))
+    with blob_store.storage.open_local(cv.file_path) as local_cv:
+        full_cv_path = _resolve_cv_full_path(str(local_cv))
+        try:
+            extraction = _extract_cv_for_scoring(str(full_cv_path))
+        except ExtractionError as e:
+            raise HTTPException(422, e.to_dict())
+    cv_text = extraction["text"]
 
     skills_txt = " ".join(sorted(set(job.skills or [])))
     missions_txt = " ".join(sorted(set(job.missions or [])))
@@ -310,6 +333,11 @@ def debug_score(cv_id: int, job_id: int, db: Session = Depends(get_db),
             "must_cap_applied": comps["must_cap"] is not None,
             "must_cap_value": comps["must_cap"],
             "must_cap_reason": None if comps["must_cap"] is None else "no must-have tokens matched",
+            "extraction_pages": extraction["pages"],
+            "extraction_pages_read": extraction["pages_read"],
+            "extraction_truncated": extraction["truncated"],
+            "extraction_timed_out": extraction["timed_out"],
+            "extraction_budget_reached": extraction["budget_reached"],
         },
         "preview": cv_text[:500] if cv_text else "",
     }
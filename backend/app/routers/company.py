@@ -1,15 +1,21 @@
 from __future__ import annotations
 
-import os, uuid, shutil  # ensure these are imported
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from ..deps import get_db, get_current_user
 from .. import models, schemas
+from ..config import settings
+from ..core.blob_store import BLOB_MOUNT, IMAGE_EXTENSIONS, BlobRejected, blob_store
+from ..core.response_cache import JOBS_LIST_TAG, job_cache
+from ..utils.uploads import UploadTooLarge
 
 router = APIRouter(prefix="/company", tags=["company"])
 
-UPLOAD_DIR = "uploads/company_logos"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# Legacy logos (uploads/company_logos) stay served; new uploads go to the blob store
+_LOGO_TYPES = {"image/jpeg", "image/png", "image/jpg"}
+# what the bytes must turn out to be, and the extension they are stored with
+_LOGO_EXTENSIONS = {mime: ext for mime, ext in IMAGE_EXTENSIONS.items() if mime in _LOGO_TYPES}
 
 @router.get("/me", response_model=schemas.UserOut)
 def get_company_profile(current_user: models.User = Depends(get_current_user)) -> models.User:
@@ -34,8 +40,11 @@ def update_company_me(
         # keep consistent: store in company_description
         user.company_description = payload.overview
 
+    logo_changed = payload.logo_url is not None and (payload.logo_url or None) != user.company_logo_url
     if payload.logo_url is not None:
-        user.company_logo_url = payload.logo_url or None
+        new_logo = payload.logo_url or None
+        blob_store.retarget(db, user.company_logo_url, new_logo)
+        user.company_logo_url = new_logo
 
     # ✅ persist location + website
     if payload.location_city is not None:
@@ -48,11 +57,22 @@ def update_company_me(
     db.add(user)
     db.commit()
     db.refresh(user)
+    if logo_changed:
+        # job responses show the owner's current logo
+        job_cache.invalidate(JOBS_LIST_TAG, f"owner:{user.id}")
     return user
 
+def _save_logo(db: Session, user: models.User, logo_url: str) -> None:
+    # put_upload referenced the new blob; drop the one being replaced
+    blob_store.release(db, blob_store.sha_from_url(user.company_logo_url))
+    user.company_logo_url = logo_url
+    db.add(user); db.commit(); db.refresh(user)
+    job_cache.invalidate(JOBS_LIST_TAG, f"owner:{user.id}")
+
 @router.post("/logo", response_model=schemas.LogoUploadOut)
-def upload_company_logo(
+async def upload_company_logo(
     request: Request,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -60,24 +80,33 @@ def upload_company_logo(
     if current_user.account_type != "company":
         raise HTTPException(status_code=403, detail="Only company accounts can access this endpoint")
 
-    allowed_types = {"image/jpeg", "image/png", "image/jpg"}
-    if file.content_type not in allowed_types:
+    if file.content_type not in _LOGO_TYPES:
         raise HTTPException(status_code=400, detail="Only JPEG and PNG images are allowed")
 
-    file_extension = os.path.splitext(file.filename or "")[1].lower()
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    try:
+        blob = await blob_store.put_upload(
+            db, file, types=_LOGO_EXTENSIONS,
+            max_bytes=settings.IMAGE_MAX_UPLOAD_MB * 1024 * 1024,
+        )
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except BlobRejected as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        await file.close()
 
     # Build absolute URL pointing to the static mount
-    logo_abs_url = str(request.url_for("company_logos", path=unique_filename))
+    rel = blob_store.relpath(blob.sha256, blob.ext)
+    logo_abs_url = str(request.url_for(BLOB_MOUNT, path=rel))
 
-    current_user.company_logo_url = logo_abs_url
-    db.add(current_user); db.commit(); db.refresh(current_user)
+    # resized copies are written after the response; their URLs work right away
+    background_tasks.add_task(blob_store.make_derivatives, blob.sha256, blob.ext)
+    await run_in_threadpool(_save_logo, db, current_user, logo_abs_url)
 
-    return schemas.LogoUploadOut(company_logo_url=logo_abs_url)
+    return schemas.LogoUploadOut(
+        company_logo_url=logo_abs_url,
+        company_logo_variants=blob_store.variant_urls(logo_abs_url),
+    )
 
 @router.get("/by-user/{user_id}")
 def get_company_by_user_id(user_id: int, db: Session = Depends(get_db)):
@@ -1,10 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, or_, case, text, asc
-from typing import Dict, Any
+from sqlalchemy import Date, Float, String, asc, cast, desc, func, literal, or_, select, union_all
+from typing import Dict, Any, Literal
 from ..deps import get_db, get_current_user
 from .. import models
-from datetime import date
+from ..core.application_stats import BIN_COLUMNS, period_start, trend
+from ..core.blob_store import blob_store
+from ..core.serialization import ORJSONResponse
+from ..core.static import PRIVATE_NO_STORE
+from ..utils.zipstream import iter_zip
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+import csv, io, itertools, re, unicodedata
 
 def _ensure_company_or_admin(user: Any) -> None:
     """
@@ -20,141 +28,161 @@ def _ensure_company_or_admin(user: Any) -> None:
 
 router = APIRouter(prefix="/company/analytics", tags=["company-analytics"])
 
-@router.get("/summary")
-def company_summary(db: Session = Depends(get_db), user=Depends(get_current_user)):
-    _ensure_company_or_admin(user)
-    owner_id = None if getattr(user, "is_admin", False) else user.id
+TREND_DAYS = 30
+SCORE_BINS = [0, 20, 40, 60, 80, 100]
+TOP_JOBS = 5
+RECENT_APPS = 5
+# GET /trend: periods shown when no start is given, and the most allowed
+TREND_DEFAULT_PERIODS = {"day": 30, "week": 12, "month": 12}
+MAX_TREND_PERIODS = 400
 
-    jobs_q = db.query(func.count(models.Job.id))
-    open_jobs_q = db.query(func.count(models.Job.id)).filter(models.Job.status == "published")
-    apps_q = (
-        db.query(func.count(models.Application.id))
-        .select_from(models.Application)
-        .join(models.Job, models.Job.id == models.Application.job_id)
-    )
+def _company_summary(db: Session, owner_id: int | None) -> Dict[str, Any]:
+    """
+    Dashboard figures of one company (every company when owner_id is None).
+
+    Everything but the recent list comes from one statement over the daily
+    rollup (core/application_stats.py), so the cost follows the number of
+    days, jobs and statuses, not of applications. UNION ALL branches compute
+    the job counts, per-status totals with score sums and histogram bins,
+    the trend days and the top jobs, each row tagged with its kind.
+    """
+    A, J, S = models.Application, models.Job, models.ApplicationDailyStat
+    today = datetime.now(timezone.utc).date()
+    first_day = today - timedelta(days=TREND_DAYS - 1)
+
+    jobs = select(J.id, J.title, J.status)
+    stats = select(S)
     if owner_id:
-        jobs_q = jobs_q.filter(models.Job.owner_user_id == owner_id)
-        open_jobs_q = open_jobs_q.filter(models.Job.owner_user_id == owner_id)
-        apps_q = apps_q.filter(models.Job.owner_user_id == owner_id)
-
-    jobs = jobs_q.scalar() or 0
-    open_jobs = open_jobs_q.scalar() or 0
-    applications = apps_q.scalar() or 0
-
-    avg_score_q = (
-        db.query(func.avg(models.Application.score))
-        .select_from(models.Application)
-        .join(models.Job, models.Job.id == models.Application.job_id)
+        jobs = jobs.where(J.owner_user_id == owner_id)
+        stats = stats.where(S.owner_user_id == owner_id)
+    jobs = jobs.cte("company_jobs")
+    stats = stats.cte("company_stats")
+
+    def row(kind: str, key=None, label=None, day=None, n=func.count(), scored=None, score_sum=None, bins=()):
+        return (
+            literal(kind).label("kind"),
+            cast(key, String).label("key"),
+            cast(label, String).label("label"),
+            # its own typed column: a date cast to text follows the server's DateStyle
+            (day if day is not None else cast(None, Date)).label("day"),
+            n.label("n"),
+            (scored if scored is not None else literal(0)).label("scored"),
+            cast(score_sum, Float).label("score_sum"),
+            *((bins[i] if bins else literal(0)).label(name) for i, name in enumerate(BIN_COLUMNS)),
+        )
+
+    applications = func.sum(stats.c.applications)
+    top = (
+        select(stats.c.job_id, applications.label("n"))
+        .group_by(stats.c.job_id)
+        .order_by(applications.desc(), stats.c.job_id)
+        .limit(TOP_JOBS)
+        .subquery()
     )
-    if owner_id:
-        avg_score_q = avg_score_q.filter(models.Job.owner_user_id == owner_id)
-    avg_score = avg_score_q.scalar()
-    avg_score = float(avg_score) if avg_score is not None else None
-
-    by_status_q = (
-        db.query(models.Application.status, func.count(models.Application.id))
-        .select_from(models.Application)
-        .join(models.Job, models.Job.id == models.Application.job_id)
-        .group_by(models.Application.status)
+    stmt = union_all(
+        select(*row("jobs")).select_from(jobs),
+        select(*row("open_jobs")).select_from(jobs).where(jobs.c.status == "published"),
+        select(*row("status", key=stats.c.status, n=applications, scored=func.sum(stats.c.scored),
+                    score_sum=func.sum(stats.c.score_sum), bins=[func.sum(stats.c[c]) for c in BIN_COLUMNS]))
+        .group_by(stats.c.status),
+        select(*row("day", day=stats.c.day, n=applications)).where(stats.c.day >= first_day).group_by(stats.c.day),
+        select(*row("top", key=top.c.job_id, label=jobs.c.title, n=top.c.n))
+        .select_from(top.join(jobs, jobs.c.id == top.c.job_id)),
     )
-    if owner_id:
-        by_status_q = by_status_q.filter(models.Job.owner_user_id == owner_id)
-    by_status = {k or "unknown": int(v) for k, v in by_status_q.all()}
 
-    recent_q = (
-        db.query(
-            models.Application.id,
-            models.Application.job_id,
-            models.Job.title.label("job_title"),
-            models.Application.applied_at,
-            models.Application.score,
-            models.Application.status,
-        )
-        .join(models.Job, models.Job.id == models.Application.job_id)
-        .order_by(models.Application.applied_at.desc().nullslast())
-        .limit(5)
+    counts = {"jobs": 0, "open_jobs": 0}
+    by_status: Dict[str, int] = {}
+    scored, score_sum = 0, 0.0
+    per_day: Dict[date, int] = {}
+    per_bin = [0] * len(BIN_COLUMNS)
+    top_jobs = []
+    for r in db.execute(stmt):
+        if r.kind in counts:
+            counts[r.kind] = int(r.n)
+        elif r.kind == "status":
+            if int(r.n):
+                by_status[r.key or "unknown"] = int(r.n)
+            scored += int(r.scored)
+            score_sum += r.score_sum or 0.0
+            per_bin = [b + int(getattr(r, name) or 0) for b, name in zip(per_bin, BIN_COLUMNS)]
+        elif r.kind == "day":
+            per_day[r.day] = int(r.n)
+        elif int(r.n):
+            top_jobs.append({"job_id": int(r.key), "title": r.label, "applications": int(r.n)})
+    top_jobs.sort(key=lambda t: (-t["applications"], t["job_id"]))
+
+    recent_q = db.query(A.id, A.job_id, J.title.label("job_title"), A.applied_at, A.score, A.status).join(
+        J, J.id == A.job_id
     )
     if owner_id:
-        recent_q = recent_q.filter(models.Job.owner_user_id == owner_id)
+        recent_q = recent_q.filter(J.owner_user_id == owner_id)
+    recent_q = recent_q.order_by(A.applied_at.desc().nullslast()).limit(RECENT_APPS)
     recent_apps = [
         dict(id=r.id, job_id=r.job_id, job_title=r.job_title, applied_at=r.applied_at, score=r.score, status=r.status)
         for r in recent_q.all()
     ]
 
-    top_q = (
-        db.query(
-            models.Application.job_id,
-            models.Job.title,
-            func.count(models.Application.id).label("apps"),
-        )
-        .join(models.Job, models.Job.id == models.Application.job_id)
-        .group_by(models.Application.job_id, models.Job.title)
-        .order_by(func.count(models.Application.id).desc())
-        .limit(5)
-    )
-    if owner_id:
-        top_q = top_q.filter(models.Job.owner_user_id == owner_id)
-    top_jobs = [{"job_id": r.job_id, "title": r.title, "applications": int(r.apps)} for r in top_q.all()]
-
-    scope_sql = ""
-    params = {}
-    if owner_id:
-        scope_sql = "JOIN jobs j ON j.id = a.job_id AND j.owner_user_id = :owner_id"
-        params["owner_id"] = owner_id
-
-    trend_rows = db.execute(
-        text(f"""
-        WITH series AS (
-          SELECT (generate_series(current_date - interval '29 days', current_date, interval '1 day'))::date AS d
-        )
-        SELECT s.d::text AS date, COALESCE(COUNT(a.id), 0) AS applications
-        FROM series s
-        LEFT JOIN applications a
-          ON date_trunc('day', a.applied_at) = s.d
-        {scope_sql}
-        GROUP BY s.d
-        ORDER BY s.d
-        """),
-        params
-    ).mappings().all()
-    trend_30d = [{"date": r["date"], "applications": int(r["applications"])} for r in trend_rows]
-
-    bin_expr = case(
-        (models.Application.score < 20, 0),
-        (models.Application.score < 40, 20),
-        (models.Application.score < 60, 40),
-        (models.Application.score < 80, 60),
-        else_=80
-    ).label("bin")
-    hist_q = (
-        db.query(bin_expr, func.count(models.Application.id))
-        .select_from(models.Application)
-        .join(models.Job, models.Job.id == models.Application.job_id)
-        .filter(models.Application.score.isnot(None))
-        .group_by("bin")
-    )
-    if owner_id:
-        hist_q = hist_q.filter(models.Job.owner_user_id == owner_id)
-    hist_rows = hist_q.all()
-    bins = [0,20,40,60,80,100]
-    counts_map = {b:0 for b in bins[:-1]}
-    for b,c in hist_rows:
-        counts_map[int(b)] = int(c)
-    score_histogram = {"bins": bins, "counts": [counts_map[b] for b in bins[:-1]] + [0]}
-
+    days = (first_day + timedelta(days=n) for n in range(TREND_DAYS))
     return {
-        "jobs": int(jobs),
-        "open_jobs": int(open_jobs),
-        "applications": int(applications),
+        "jobs": counts["jobs"],
+        "open_jobs": counts["open_jobs"],
+        "applications": sum(by_status.values()),
         "by_status": by_status,
-        "avg_score": avg_score,
+        "avg_score": score_sum / scored if scored else None,
         "recent_applications": recent_apps,
         "top_jobs_by_apps": top_jobs,
-        "trend_30d": trend_30d,
-        "score_histogram": score_histogram,
+        "trend_30d": [{"date": d.isoformat(), "applications": per_day.get(d, 0)} for d in days],
+        "score_histogram": {"bins": SCORE_BINS, "counts": per_bin + [0]},
     }
 
-@router.get("/jobs")
+@router.get("/summary")
+def company_summary(db: Session = Depends(get_db), user=Depends(get_current_user)):
+    _ensure_company_or_admin(user)
+    owner_id = None if getattr(user, "is_admin", False) else user.id
+    return _company_summary(db, owner_id)
+
+@router.get("/trend", response_class=ORJSONResponse)
+def company_trend(
+    granularity: Literal["day", "week", "month"] = "day",
+    start: date | None = Query(None, description="first UTC day, inclusive"),
+    end: date | None = Query(None, description="UTC day after the last one, exclusive (default: tomorrow)"),
+    job_id: int | None = None,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    Applications per day, ISO week or month of [start, end), zero-filled.
+    Periods cut by the range are clipped: each point has its own start/end.
+    """
+    _ensure_company_or_admin(user)
+    owner_id = None if getattr(user, "is_admin", False) else user.id
+    if job_id is not None:
+        job = db.query(models.Job.owner_user_id).filter(models.Job.id == job_id).first()
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found.")
+        if owner_id and job.owner_user_id != owner_id:
+            raise HTTPException(status_code=403, detail="Forbidden.")
+
+    if end is None:
+        end = datetime.now(timezone.utc).date() + timedelta(days=1)
+    if start is None:
+        start = period_start(end - timedelta(days=1), granularity)
+        for _ in range(TREND_DEFAULT_PERIODS[granularity] - 1):
+            start = period_start(start - timedelta(days=1), granularity)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end.")
+    try:
+        points = trend(db, start, end, granularity, owner_id=owner_id, job_id=job_id, limit=MAX_TREND_PERIODS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Range too long: {e}.")
+    return ORJSONResponse({
+        "granularity": granularity,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "points": points,
+    })
+
+@router.get("/jobs", response_class=ORJSONResponse)
 def company_jobs(db: Session = Depends(get_db), user=Depends(get_current_user)):
     _ensure_company_or_admin(user)
     # For admins, show all jobs; for companies, only their own
@@ -173,10 +201,10 @@ def company_jobs(db: Session = Depends(get_db), user=Depends(get_current_user)):
          .order_by(models.Job.posted_at.desc())
 
     rows = q.all()
-    return [
+    return ORJSONResponse([
         {"id": r[0], "title": r[1], "status": r[2], "deadline": r[3], "applications": int(r[4] or 0)}
         for r in rows
-    ]
+    ])
 
 SORT_MAP = {
     "score_desc": (desc(models.Application.score), desc(models.Application.applied_at)),
@@ -184,7 +212,7 @@ SORT_MAP = {
     "date_asc":   (asc(models.Application.applied_at), ),
 }
 
-@router.get("/jobs/{job_id}/applications")
+@router.get("/jobs/{job_id}/applications", response_class=ORJSONResponse)
 def company_job_apps(
     job_id: int,
     sort: str = "score_desc",
@@ -228,7 +256,7 @@ def company_job_apps(
 
     rows = q.all()
     # shape to the frontend's expected keys
-    return [
+    return ORJSONResponse([
         {
             "id": r[0],
             "job_id": r[1],
@@ -240,4 +268,90 @@ def company_job_apps(
             "candidate_email": r[7],
         }
         for r in rows
-    ]
+    ])
+
+def _zip_name(text: str | None, fallback: str) -> str:
+    """ASCII, filesystem-safe fragment for names inside the export archive."""
+    ascii_text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode("ascii")
+    cleaned = re.sub(r"[^A-Za-z0-9.-]+", "_", ascii_text.strip()).strip("._")
+    return cleaned[:60] or fallback
+
+def _export_members(rows, storage):
+    """
+    CV files then a CSV manifest, for iter_zip. Runs lazily while the
+    response streams, so only one CV chunk is in memory at a time.
+    """
+    manifest = io.StringIO()
+    w = csv.writer(manifest)
+    w.writerow(["application_id", "candidate", "email", "status", "score", "applied_at", "cv_file", "cv_sha256"])
+    for r in rows:
+        candidate = " ".join(filter(None, [r.first_name, r.last_name])) or r.candidate_email
+        ext = Path(r.file_path or "").suffix.lower() or ".pdf"
+        arcname = f"cvs/{r.id:05d}_{_zip_name(candidate, 'candidate')}{ext}"
+        chunks = storage.iter_bytes(r.file_path) if r.file_path else iter(())
+        try:
+            first = next(chunks, b"")
+        except FileNotFoundError:
+            arcname = "MISSING"
+        else:
+            yield arcname, itertools.chain([first], chunks), False
+        w.writerow([
+            r.id, candidate, r.candidate_email, r.status,
+            "" if r.score is None else round(float(r.score), 2),
+            r.applied_at.isoformat() if r.applied_at else "",
+            arcname, r.content_sha256 or "",
+        ])
+    # utf-8-sig so spreadsheet apps detect the encoding
+    yield "manifest.csv", [manifest.getvalue().encode("utf-8-sig")], True
+
+@router.get("/jobs/{job_id}/applications/cvs.zip")
+def export_job_cvs(
+    job_id: int,
+    sort: str = "score_desc",
+    status: str | None = None,
+    min_score: float | None = None,
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Stream a ZIP of the job's applicant CVs plus manifest.csv (scores, status).
+
+    Same filters as /jobs/{job_id}/applications. The archive is built while
+    it is sent (no temp files, constant memory), so large exports do not
+    grow the worker.
+    """
+    _ensure_company_or_admin(user)
+
+    job = db.query(models.Job).filter(models.Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    if not user.is_admin and job.owner_user_id != user.id:
+        raise HTTPException(status_code=403, detail="Forbidden.")
+
+    A = models.Application
+    U = models.User
+    C = models.CV
+
+    q = (
+        db.query(
+            A.id, A.status, A.score, A.applied_at,
+            U.email.label("candidate_email"), U.first_name, U.last_name,
+            C.file_path, C.content_sha256,
+        )
+        .join(U, U.id == A.user_id)
+        .outerjoin(C, C.id == A.cv_id)
+        .filter(A.job_id == job_id)
+    )
+    if status in {"pending", "accepted", "rejected"}:
+        q = q.filter(A.status == status)
+    if min_score is not None:
+        q = q.filter(A.score >= min_score)
+    # rows are small (no file content); load them now so the stream needs no DB session
+    rows = q.order_by(*SORT_MAP.get(sort, SORT_MAP["score_desc"])).all()
+
+    filename = f"job-{job_id}-{_zip_name(job.title, 'cvs')}.zip"
+    return StreamingResponse(
+        iter_zip(_export_members(rows, blob_store.storage)),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": PRIVATE_NO_STORE},
+    )
@@ -1,69 +1,75 @@
 # file: backend/app/routers/cvs.py
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
 from pathlib import Path
-from uuid import uuid4
 from datetime import datetime, timezone
 
 from .. import models, schemas
 from ..deps import get_db, get_current_user
+from ..config import settings
+from ..core.blob_store import PRIVATE, BlobRejected, blob_store
+from ..core.static import PRIVATE_NO_CACHE, PRIVATE_NO_STORE, cached_file_response
+from ..utils.uploads import DOCX_MIME, UploadTooLarge, declared_size_exceeds
 
 router = APIRouter(prefix="/cvs", tags=["cvs"])
 
+# Accepted extensions and the sniffed content types they must match
+_CV_TYPES = {
+    ".pdf": ("application/pdf", "application/pdf"),
+    ".docx": ("application/zip", DOCX_MIME),
+    ".txt": ("text/plain", "text/plain"),
+}
+
+def _persist_cv(db: Session, cv: models.CV) -> models.CV:
+    db.add(cv)
+    db.commit()
+    db.refresh(cv)
+    return cv
+
 @router.post("", response_model=schemas.CVRead)  # final path: POST /cvs
 async def upload_cv(
+    request: Request,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
     if file is None:
         raise HTTPException(status_code=400, detail="No file provided")
-    # 1) validate extension
-    dest_dir = Path("uploads") / "cv"
-    dest_dir.mkdir(parents=True, exist_ok=True)
+    max_bytes = settings.CV_MAX_UPLOAD_MB * 1024 * 1024
+    if declared_size_exceeds(request.headers.get("content-length"), max_bytes):
+        raise HTTPException(status_code=413, detail=f"File exceeds the {settings.CV_MAX_UPLOAD_MB} MB limit")
 
+    # 1) validate extension
     suffix = Path(file.filename or "").suffix.lower()
-    if suffix not in {".pdf", ".docx", ".txt"}:
+    if suffix not in _CV_TYPES:
         raise HTTPException(status_code=400, detail="Only PDF, DOCX or TXT files are accepted")
 
-    # 2) deterministic name & path
-    out_name = f"{current_user.id}_{uuid4().hex}{suffix}"
-    dest_path = dest_dir / out_name
-
-    # 3) async rewind + chunked copy
-    await file.seek(0)
-    bytes_written = 0
-    with dest_path.open("wb") as out:
-        while True:
-            chunk = await file.read(1024 * 1024)  # 1 MB
-            if not chunk:
-                break
-            out.write(chunk)
-            bytes_written += len(chunk)
-    await file.close()
+    # 2) stream into the private namespace of the content-addressed store (never
+    #    served as a static file); content must match the extension
+    sniffed, mime_type = _CV_TYPES[suffix]
+    try:
+        blob = await blob_store.put_upload(
+            db, file, types={sniffed: suffix}, max_bytes=max_bytes, namespace=PRIVATE,
+        )
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except BlobRejected as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        await file.close()
 
-    # 4) zero-byte guard
-    if bytes_written == 0 or not dest_path.exists() or dest_path.stat().st_size == 0:
-        try:
-            dest_path.unlink(missing_ok=True)
-        except Exception:
-            pass
-        raise HTTPException(status_code=400, detail="Uploaded file is empty or unreadable")
-
-    # 5) normalize for DB
-    stored_path = str(dest_path).replace("\\", "/")
-
-    # 6) persist CV
+    # 3) persist CV (same bytes uploaded twice share one file)
     cv = models.CV(
         user_id=current_user.id,
-        file_path=stored_path,
+        file_path=blob_store.storage_path(blob, PRIVATE),
         uploaded_at=datetime.now(timezone.utc),
+        content_sha256=blob.sha256,
+        mime_type=mime_type,
+        size_bytes=blob.size_bytes,
     )
-    db.add(cv)
-    db.commit()
-    db.refresh(cv)
-    return cv
+    return await run_in_threadpool(_persist_cv, db, cv)
 
 @router.get("/current", response_model=schemas.CVRead)  # final path: GET /cvs/current
 async def get_current_cv(
@@ -78,16 +84,33 @@ async def get_current_cv(
 @router.get("/{cv_id}/download")  # final path: GET /cvs/{cv_id}/download
 async def download_cv(
     cv_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
     cv = db.query(models.CV).filter(models.CV.id == cv_id, models.CV.user_id == current_user.id).first()
     if not cv:
         raise HTTPException(status_code=404, detail="CV not found")
+
+    # Object storage: the client downloads straight from the bucket
+    key = blob_store.storage.key_for(cv.file_path)
+    if key is not None and not blob_store.storage.serves_locally:
+        url = blob_store.storage.presigned_url(
+            key, filename=Path(key).name, content_type=cv.mime_type or "application/pdf",
+        )
+        return RedirectResponse(url, status_code=307, headers={"Cache-Control": PRIVATE_NO_STORE})
+
     p = Path(cv.file_path)
     if not p.exists():
         raise HTTPException(status_code=404, detail="File not found")
 
-    # Display inline in the browser
+    # Display inline in the browser; Range requests let PDF viewers load page by page.
+    # Private: the browser may keep it but must revalidate (cheap 304 via the hash ETag).
     headers = {"Content-Disposition": f'inline; filename="{p.name}"'}
-    return FileResponse(p, media_type="application/pdf", headers=headers)
+    return cached_file_response(
+        p, request.headers,
+        cache_control=PRIVATE_NO_CACHE,
+        etag=cv.content_sha256,
+        media_type=cv.mime_type or "application/pdf",
+        headers=headers,
+    )
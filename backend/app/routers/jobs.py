@@ -1,11 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import func
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import Session, load_only, selectinload
+from pydantic_core import to_jsonable_python
+from sqlalchemy import String, and_, case, exists, func, literal, literal_column, not_, or_, select, true, union_all
+from typing import Dict, List, Literal, Optional, Tuple
+import base64
+import binascii
 import json
 from datetime import datetime, timezone
+from urllib.parse import urlencode
 from .. import models, schemas
+from ..config import settings
 from ..deps import get_db, get_current_user
+from ..core.blob_store import blob_store
+from ..core.response_cache import JOBS_LIST_TAG, CachedResponse, cached_json_response, job_cache
+from ..core.search import apply_search, search_terms
+from ..core.semantic_search import SemanticSearchUnavailable, hybrid_search, job_index
+from ..core.serialization import ORJSONResponse, list_adapter
+from ..utils.skills import canonical_skills
 
 # Assume get_current_user_optional exists or define it
 try:
@@ -15,84 +26,438 @@ except ImportError:
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
-def _job_to_out(job: models.Job, has_applied: bool = False) -> dict:
+def _invalidate_job(job_id: int, listed: bool) -> None:
+    """Drop cached responses after a committed write; listed: the job is or was published."""
+    tags = [f"job:{job_id}"]
+    if listed:
+        tags.append(JOBS_LIST_TAG)
+    job_cache.invalidate(*tags)
+
+# What a job card shows (view=summary); long texts are left out
+SUMMARY_FIELDS = (
+    "id", "title", "company_name", "company_logo_url", "company_logo_variants",
+    "location_city", "location_country", "experience_min", "employment_type", "work_mode",
+    "salary_min", "salary_max", "salary_currency", "salary_is_confidential",
+    "skills", "status", "posted_at", "updated_at", "has_applied",
+)
+# JobOut fields that are not Job columns
+_OWNER_FIELDS = {"company_logo_url", "company_logo_variants"}
+_COMPUTED_FIELDS = _OWNER_FIELDS | {"has_applied"}
+# always loaded under a projection: keyset cursor and owner join
+_KEY_COLUMNS = ("id", "owner_user_id", "created_at", "posted_at")
+
+def job_projection(
+    view: Optional[Literal["full", "summary"]] = Query(None, description='"summary": only what a job card shows'),
+    fields: Optional[str] = Query(None, description="comma-separated JobOut fields; overrides view"),
+) -> Optional[Tuple[str, ...]]:
+    """Fields to return, or None for the full JobOut. id and has_applied are always included."""
+    if fields:
+        names = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = sorted(set(names) - set(schemas.JobOut.model_fields))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        return tuple(dict.fromkeys(["id", *names, "has_applied"]))
+    if view == "summary":
+        return SUMMARY_FIELDS
+    return None
+
+def _load_projection(query, fields: Optional[Tuple[str, ...]]):
+    """Load only the columns fields need (and the owner only when its logo is shown)."""
+    Job = models.Job
+    if fields is None:
+        return query.options(selectinload(Job.owner))  # avoid N+1
+    columns = set(_KEY_COLUMNS) | {f for f in fields if f not in _COMPUTED_FIELDS}
+    options = [load_only(*(getattr(Job, c) for c in sorted(columns)))]
+    if _OWNER_FIELDS.intersection(fields):
+        options.append(selectinload(Job.owner).load_only(models.User.id, models.User.company_logo_url))
+    return query.options(*options)
+
+def _owner_of(job: models.Job):
     # robust: owner rel might be named "owner" or "user"
-    owner = getattr(job, "owner", None) or getattr(job, "user", None)
+    return getattr(job, "owner", None) or getattr(job, "user", None)
+
+def _job_to_out(job: models.Job, has_applied: bool = False, fields: Optional[Tuple[str, ...]] = None) -> dict:
+    if fields is not None:
+        d = {}
+        for f in fields:
+            if f in _COMPUTED_FIELDS:
+                continue
+            v = getattr(job, f)
+            d[f] = schemas.as_str_list(v) if f in ("missions", "skills") else v
+        if _OWNER_FIELDS.intersection(fields):
+            logo = getattr(_owner_of(job), "company_logo_url", None)
+            if "company_logo_url" in fields:
+                d["company_logo_url"] = logo
+            if "company_logo_variants" in fields:
+                d["company_logo_variants"] = blob_store.variant_urls(logo)
+        d["has_applied"] = has_applied
+        return d
     d = schemas.JobOut.from_orm(job).dict()  # v2: schemas.JobOut.model_validate(job).model_dump()
-    d["company_logo_url"] = getattr(owner, "company_logo_url", None)
+    d["company_logo_url"] = getattr(_owner_of(job), "company_logo_url", None)
+    d["company_logo_variants"] = blob_store.variant_urls(d["company_logo_url"])
     d["has_applied"] = has_applied
     return d
 
+# built once: a whole page is validated in a single pydantic-core call
+_JOB_LIST = list_adapter(schemas.JobOut)
+
+def _jobs_content(jobs: List[models.Job], fields: Optional[Tuple[str, ...]] = None) -> list:
+    """JSON-ready job dicts, formatted like the response_model would (has_applied false)."""
+    if fields is not None:
+        return to_jsonable_python([_job_to_out(j, fields=fields) for j in jobs])
+    outs = _JOB_LIST.validate_python(jobs, from_attributes=True)
+    for job, out in zip(jobs, outs):
+        out.company_logo_url = getattr(_owner_of(job), "company_logo_url", None)
+        out.company_logo_variants = blob_store.variant_urls(out.company_logo_url)
+    return _JOB_LIST.dump_python(outs, mode="json")
+
+def _encode_cursor(key: dict) -> str:
+    raw = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+def _decode_cursor(cursor: str) -> dict:
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        key = None
+    if not isinstance(key, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return key
+
+def _cursor_key(job: models.Job, order: str, rank: Optional[float] = None) -> dict:
+    if order == "rank":
+        return {"r": rank, "i": job.id}
+    key = {"c": job.created_at.isoformat(), "i": job.id}
+    if order == "posted":
+        key["p"] = job.posted_at.isoformat() if job.posted_at else None
+    return key
+
+def _after_cursor(key: dict, order: str, rank=None):
+    """
+    WHERE clause for rows strictly after key in the listing order.
+
+    "posted" is (posted_at DESC NULLS LAST, created_at DESC, id DESC),
+    "created" is (created_at DESC, id DESC) and "rank" is (search rank DESC,
+    id DESC). Written out with OR/AND instead of row values so SQLite and
+    Postgres both use the index.
+    """
+    Job = models.Job
+    try:
+        i = int(key["i"])
+        if order == "rank":
+            r = float(key["r"])
+            return or_(rank < r, and_(rank == r, Job.id < i))
+        c = datetime.fromisoformat(key["c"])
+        p = key["p"] if order == "posted" else None
+        p = datetime.fromisoformat(p) if p is not None else None
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    tail = or_(Job.created_at < c, and_(Job.created_at == c, Job.id < i))
+    if order == "created":
+        return tail
+    if p is None:
+        return and_(Job.posted_at.is_(None), tail)
+    return or_(Job.posted_at < p, and_(Job.posted_at == p, tail), Job.posted_at.is_(None))
+
+# filter param -> Job column; several values of one param are ORed
+_FACET_COLUMNS = {
+    "city": models.Job.location_city,
+    "country": models.Job.location_country,
+    "work_mode": models.Job.work_mode,
+    "employment_type": models.Job.employment_type,
+    "education_level": models.Job.education_level,
+}
+FACET_SKILLS_LIMIT = 30
+
+def job_filters(
+    city: Optional[List[str]] = Query(None),
+    country: Optional[List[str]] = Query(None),
+    work_mode: Optional[List[str]] = Query(None),
+    employment_type: Optional[List[str]] = Query(None),
+    education_level: Optional[List[str]] = Query(None),
+    salary_min: Optional[int] = Query(None, ge=0, description="jobs paying at least this much"),
+    salary_max: Optional[int] = Query(None, ge=0, description="jobs starting at most this much"),
+    skills: Optional[List[str]] = Query(None, description="jobs listing every one of these skills (any spelling, e.g. reactjs)"),
+) -> dict:
+    """Filter query params shared by the job listing and its facets."""
+    given = dict(
+        city=city, country=country, work_mode=work_mode, employment_type=employment_type,
+        education_level=education_level, salary_min=salary_min, salary_max=salary_max,
+        skills=canonical_skills(skills),
+    )
+    return {k: v for k, v in given.items() if v not in (None, [])}
+
+def _skill_values(dialect: str):
+    """Table-valued function yielding one row per skill of the current job."""
+    col = models.Job.skills_canon
+    # a scalar or object written outside the API yields no rows instead of an error
+    if dialect == "sqlite":
+        is_array = and_(func.json_valid(col), func.json_type(col) == "array")
+        return func.json_each(case((is_array, col), else_=literal_column("'[]'"))).table_valued("value")
+    is_array = func.jsonb_typeof(col) == "array"
+    return func.jsonb_array_elements_text(case((is_array, col), else_=literal_column("'[]'::jsonb"))).table_valued("value")
+
+def _filter_clauses(filters: dict, dialect: str, exclude: Optional[str] = None) -> list:
+    Job = models.Job
+    clauses = []
+    for name, col in _FACET_COLUMNS.items():
+        if name in filters and name != exclude:
+            clauses.append(col.in_(filters[name]))
+    if "salary_min" in filters or "salary_max" in filters:
+        # confidential salaries are hidden from candidates, so they can't match a range
+        clauses.append(not_(Job.salary_is_confidential))
+        if "salary_min" in filters:
+            clauses.append(func.coalesce(Job.salary_max, Job.salary_min) >= filters["salary_min"])
+        if "salary_max" in filters:
+            clauses.append(func.coalesce(Job.salary_min, Job.salary_max) <= filters["salary_max"])
+    if "skills" in filters:
+        if dialect == "sqlite":
+            # no GIN there: one EXISTS over json_each per skill
+            for skill in filters["skills"]:
+                values = _skill_values(dialect)
+                clauses.append(exists().select_from(values).where(values.c.value == skill))
+        else:
+            # skills_canon @> '["a", "b"]' is answered by the GIN index ix_jobs_skills_canon
+            clauses.append(Job.skills_canon.contains(filters["skills"]))
+    return clauses
+
+def _applied_job_ids(db: Session, user: Optional[models.User], job_ids: List[int]) -> set:
+    if not user or not job_ids:
+        return set()
+    rows = (
+        db.query(models.Application.job_id)
+        .filter(models.Application.user_id == user.id, models.Application.job_id.in_(job_ids))
+        .all()
+    )
+    return {row[0] for row in rows}
+
+def _personalized(request: Request, db: Session, user: Optional[models.User], cached: CachedResponse) -> Response:
+    """
+    Send a cached job body with has_applied set for the current user.
+
+    Cached bodies are built for anonymous visitors (has_applied false), so
+    only the applied ids are looked up per request; the body is re-rendered
+    just when one of its jobs was applied to.
+    """
+    content = cached.content
+    jobs = content if isinstance(content, list) else [content]
+    applied = _applied_job_ids(db, user, [j["id"] for j in jobs])
+    if applied:
+        jobs = [dict(j, has_applied=True) if j["id"] in applied else j for j in jobs]
+        cached = CachedResponse.build(jobs if isinstance(content, list) else jobs[0], cached.headers)
+    return cached_json_response(request.headers, cached)
+
+def _query_jobs(
+    request: Request,
+    db: Session,
+    user: Optional[models.User],
+    status: Optional[str],
+    owner: Optional[str],
+    q: Optional[str],
+    limit: Optional[int],
+    cursor: Optional[str],
+    filters: dict,
+    fields: Optional[Tuple[str, ...]],
+) -> CachedResponse:
+    query = db.query(models.Job)
+    if status:
+        query = query.filter(models.Job.status == status)
+    else:
+        query = query.filter(models.Job.status == "published")
+
+    if owner == "me" and user:
+        query = query.filter(models.Job.owner_user_id == user.id)
+
+    dialect = db.get_bind().dialect.name
+    query = query.filter(*_filter_clauses(filters, dialect))
+
+    # sort rules; id makes the order total so no row is skipped between pages
+    rank = None
+    terms = search_terms(q)
+    if terms:
+        order = "rank"
+        query, rank = apply_search(query, terms, dialect)
+        query = query.add_columns(rank).order_by(rank.desc(), models.Job.id.desc())
+    elif (status or "published") == "published":
+        order = "posted"
+        query = query.order_by(
+            models.Job.posted_at.desc().nullslast(),
+            models.Job.created_at.desc(),
+            models.Job.id.desc(),
+        )
+    else:
+        order = "created"
+        query = query.order_by(models.Job.created_at.desc(), models.Job.id.desc())
+
+    paged = not (settings.JOBS_LIST_UNPAGED and limit is None and cursor is None)
+    if paged:
+        limit = min(limit or settings.JOBS_PAGE_SIZE, settings.JOBS_PAGE_MAX)
+        if cursor:
+            query = query.filter(_after_cursor(_decode_cursor(cursor), order, rank))
+        query = query.limit(limit + 1)
+
+    rows = _load_projection(query, fields).all()
+    jobs = [row[0] for row in rows] if rank is not None else rows
+
+    headers = {}
+    if paged and len(jobs) > limit:
+        jobs = jobs[:limit]
+        last_rank = rows[limit - 1][1] if rank is not None else None
+        next_cursor = _encode_cursor(_cursor_key(jobs[-1], order, last_rank))
+        next_url = request.url.include_query_params(cursor=next_cursor, limit=limit)
+        headers["X-Next-Cursor"] = next_cursor
+        headers["Link"] = f'<{next_url}>; rel="next"'
+
+    return CachedResponse.build(_jobs_content(jobs, fields), headers)
+
 @router.get("", response_model=List[schemas.JobOut])
 def list_jobs(
+    request: Request,
     status: Optional[str] = Query("published"),
     owner: Optional[str] = Query(None, description='use "me" to restrict to current user'),
+    q: Optional[str] = Query(None, max_length=200, description="full-text search; results are ranked by relevance"),
+    limit: Optional[int] = Query(None, ge=1, description="page size (default JOBS_PAGE_SIZE)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    filters: dict = Depends(job_filters),
+    fields: Optional[Tuple[str, ...]] = Depends(job_projection),
     db: Session = Depends(get_db),
     user: Optional[models.User] = Depends(get_current_user_optional),
 ):
-    q = db.query(models.Job)
-    if status:
-        q = q.filter(models.Job.status == status)
-    else:
-        q = q.filter(models.Job.status == "published")
-
-    if owner == "me" and user:
-        q = q.filter(models.Job.owner_user_id == user.id)
-
-    # sort rules
-    if (status or "published") == "published":
-        q = q.order_by(models.Job.posted_at.desc(), models.Job.created_at.desc())
-    else:
-        q = q.order_by(models.Job.created_at.desc())
-
-    jobs = (
-        q.options(selectinload(models.Job.owner))  # avoid N+1
+    """
+    Jobs newest first (or best match first with q), one page at a time.
+
+    When there are more results, the X-Next-Cursor response header (and a
+    Link rel="next" header) holds the cursor for the following page.
+    Pages are keyset-based, so every page costs the same however deep it is.
+
+    Published listings are the same for everyone, so they are cached per
+    query string (see core/response_cache.py) and carry an ETag.
+    view=summary or fields=... return only those fields and load only the
+    matching columns.
+    """
+    cacheable = (status or "published") == "published" and not (owner == "me" and user)
+    key = "jobs:list?" + urlencode(sorted(request.query_params.multi_items()))
+    cached = job_cache.get(key) if cacheable else None
+    if cached is None:
+        generation = job_cache.generation()
+        cached = _query_jobs(request, db, user, status, owner, q, limit, cursor, filters, fields)
+        if cacheable:
+            job_cache.set(key, cached, [JOBS_LIST_TAG], generation)
+    return _personalized(request, db, user, cached)
+
+@router.get("/facets", response_model=schemas.JobFacetsOut)
+def job_facets(
+    q: Optional[str] = Query(None, max_length=200),
+    filters: dict = Depends(job_filters),
+    db: Session = Depends(get_db),
+):
+    """
+    Published-job counts per facet value under the current filters.
+
+    Each facet is counted with every filter except its own, so the counts
+    say how many jobs a click on that value would add (skills are ANDed, so
+    they keep the skill filter). All facets come back from one UNION ALL query.
+    """
+    Job = models.Job
+    dialect = db.get_bind().dialect.name
+    terms = search_terms(q)
+
+    def branch(facet: str, value, exclude: Optional[str] = None, *, extra_from=None):
+        stmt = select(literal(facet).label("facet"), value.label("value"), func.count().label("n")).select_from(Job)
+        if extra_from is not None:
+            stmt = stmt.join(extra_from, true())
+        if terms:
+            stmt, _ = apply_search(stmt, terms, dialect)
+        return stmt.where(Job.status == "published", *_filter_clauses(filters, dialect, exclude))
+
+    parts = [branch("total", literal(None, String))]
+    for name, col in _FACET_COLUMNS.items():
+        parts.append(branch(name, col, exclude=name).where(col.isnot(None), col != "").group_by(col))
+    skill = _skill_values(dialect)
+    top_skills = (
+        branch("skills", skill.c.value, extra_from=skill)
+        .group_by(skill.c.value)
+        .order_by(func.count().desc())
+        .limit(FACET_SKILLS_LIMIT)
+        .subquery()
+    )
+    parts.append(select(top_skills))
+
+    total = 0
+    facets: Dict[str, List[dict]] = {name: [] for name in (*_FACET_COLUMNS, "skills")}
+    for facet, value, n in db.execute(union_all(*parts)):
+        if facet == "total":
+            total = n
+        elif value:
+            facets[facet].append({"value": value, "count": n})
+    for values in facets.values():
+        values.sort(key=lambda v: (-v["count"], v["value"]))
+    return {"total": total, "facets": facets}
+
+@router.get("/search", response_model=List[schemas.JobSearchHit])
+def search_jobs(
+    q: str = Query(..., min_length=1, max_length=200, description='free text, e.g. "remote react developer Tunis"'),
+    status: Literal["published", "archived"] = Query("published"),
+    limit: Optional[int] = Query(None, ge=1, description="number of hits (default JOBS_PAGE_SIZE)"),
+    filters: dict = Depends(job_filters),
+    fields: Optional[Tuple[str, ...]] = Depends(job_projection),
+    db: Session = Depends(get_db),
+    user: Optional[models.User] = Depends(get_current_user_optional),
+):
+    """
+    Jobs ranked by meaning as well as keywords (see core/semantic_search.py).
+
+    Takes the same filters as GET /jobs (city and country for location);
+    they narrow the candidates in SQL before anything is scored. Returns the
+    best `limit` hits, no paging.
+    """
+    Job = models.Job
+    limit = min(limit or settings.JOBS_PAGE_SIZE, settings.JOBS_PAGE_MAX)
+    dialect = db.get_bind().dialect.name
+    candidates = dict(
+        db.query(Job.id, Job.updated_at)
+        .filter(Job.status == status, *_filter_clauses(filters, dialect))
         .all()
     )
-
-    # defensive coercion (you already added these helpers)
-    import json
-    for j in jobs:
-        if isinstance(j.missions, str):
-            try: j.missions = json.loads(j.missions)
-            except: j.missions = []
-        if isinstance(j.skills, str):
-            try: j.skills = json.loads(j.skills)
-            except: j.skills = []
-
-    # Compute has_applied for each job if user is authenticated
-    job_ids = [j.id for j in jobs]
-    applied_job_ids = set()
-    if user:
-        applied_job_ids = set(
-            db.query(models.Application.job_id)
-            .filter(models.Application.user_id == user.id, models.Application.job_id.in_(job_ids))
-            .all()
-        )
-        applied_job_ids = {row[0] for row in applied_job_ids}
-
-    return [_job_to_out(j, has_applied=j.id in applied_job_ids) for j in jobs]
+    try:
+        hits = hybrid_search(q, candidates, limit)
+    except SemanticSearchUnavailable:
+        raise HTTPException(503, "Semantic search is unavailable")
+
+    ids = [h.job_id for h in hits]
+    by_id = {j.id: j for j in _load_projection(db.query(Job), fields).filter(Job.id.in_(ids))} if ids else {}
+    hits = [h for h in hits if h.job_id in by_id]  # deleted meanwhile
+    jobs = _jobs_content([by_id[h.job_id] for h in hits], fields)
+    applied = _applied_job_ids(db, user, ids)
+    return ORJSONResponse([
+        {"job": dict(job, has_applied=h.job_id in applied), "score": h.score, "semantic": h.semantic, "lexical": h.lexical}
+        for h, job in zip(hits, jobs)
+    ])
 
 @router.get("/{job_id}", response_model=schemas.JobOut)
-def get_job(job_id: int, db: Session = Depends(get_db), user: Optional[models.User] = Depends(get_current_user_optional)):
-    job = (
-        db.query(models.Job)
-        .options(selectinload(models.Job.owner))
-        .filter(models.Job.id == job_id)
-        .first()
-    )
-    if not job:
-        raise HTTPException(404, "Job not found")
-
-    # Check if user has applied to this job
-    has_applied = False
-    if user:
-        has_applied = db.query(models.Application).filter(
-            models.Application.user_id == user.id,
-            models.Application.job_id == job_id
-        ).first() is not None
+def get_job(
+    job_id: int,
+    request: Request,
+    fields: Optional[Tuple[str, ...]] = Depends(job_projection),
+    db: Session = Depends(get_db),
+    user: Optional[models.User] = Depends(get_current_user_optional),
+):
+    tag = f"job:{job_id}"
+    key = tag if fields is None else f"{tag}?fields={','.join(fields)}"
+    cached = job_cache.get(key)
+    if cached is None:
+        generation = job_cache.generation()
+        job = (
+            _load_projection(db.query(models.Job), fields)
+            .filter(models.Job.id == job_id)
+            .first()
+        )
+        if not job:
+            raise HTTPException(404, "Job not found")
+        cached = CachedResponse.build(_jobs_content([job], fields)[0])
+        job_cache.set(key, cached, [tag, f"owner:{job.owner_user_id}"], generation)
 
-    return _job_to_out(job, has_applied=has_applied)
+    return _personalized(request, db, user, cached)
 
 @router.post("", response_model=schemas.JobOut)
 def create_job(payload: schemas.JobCreate, db: Session = Depends(get_db), user=Depends(get_current_user)):
@@ -137,6 +502,7 @@ def create_job(payload: schemas.JobCreate, db: Session = Depends(get_db), user=D
         missions=list(payload.missions or []),   # 👈 ensure arrays are persisted
         profile_requirements=payload.profile_requirements,
         skills=list(payload.skills or []),       # 👈 ensure arrays are persisted
+        skills_canon=canonical_skills(payload.skills),
 
         # description is optional/legacy; if you decided to remove it in FE, it will be None here
         description=payload.description,
@@ -150,22 +516,12 @@ def create_job(payload: schemas.JobCreate, db: Session = Depends(get_db), user=D
     if job.status == "published":
         job.posted_at = datetime.now(timezone.utc)
 
+    # the job keeps its own reference on an uploaded logo
+    blob_store.retarget(db, None, job.company_logo_url)
     db.add(job)
     db.commit()
     db.refresh(job)
-
-    # Coerce JSON-strings -> Python lists (defensive in case DB driver returns text)
-    import json
-    if isinstance(job.missions, str):
-        try:
-            job.missions = json.loads(job.missions)
-        except Exception:
-            job.missions = []
-    if isinstance(job.skills, str):
-        try:
-            job.skills = json.loads(job.skills)
-        except Exception:
-            job.skills = []
+    _invalidate_job(job.id, listed=job.status == "published")
 
     # Ensure timestamps exist (some DBs don't materialize server_default until reloads)
     now = datetime.now(timezone.utc)
@@ -209,6 +565,8 @@ def update_status(job_id: int, body: schemas.JobStatusUpdate, db: Session = Depe
     db.add(job)
     db.commit()
     db.refresh(job)
+    # published <-> anything else always changes the public listing
+    _invalidate_job(job.id, listed=True)
     return _job_to_out(job)
 
 @router.patch("/{job_id}", response_model=schemas.JobOut)
@@ -220,10 +578,16 @@ def update_job(job_id: int, payload: schemas.JobUpdate, db: Session = Depends(ge
     if not (user.is_admin or job.owner_user_id == user.id):
         raise HTTPException(403, "Not allowed")
     data = payload.model_dump(exclude_unset=True)
+    if "company_logo_url" in data:
+        blob_store.retarget(db, job.company_logo_url, data["company_logo_url"])
+    was_published = job.status == "published"
     for k, v in data.items():
         setattr(job, k, v)
+    if "skills" in data:
+        job.skills_canon = canonical_skills(data["skills"])
     db.commit()
     db.refresh(job)
+    _invalidate_job(job.id, listed=was_published or job.status == "published")
     # Return serialized dict to handle JSONB
     job_dict = {
         'id': job.id,
@@ -262,5 +626,9 @@ def delete_job(job_id: int, db: Session = Depends(get_db), user=Depends(get_curr
         raise HTTPException(404, "Job not found")
     if not (user.is_admin or job.owner_user_id == user.id):
         raise HTTPException(403, "Not allowed")
+    blob_store.retarget(db, job.company_logo_url, None)
+    listed = job.status == "published"
     db.delete(job)
     db.commit()
+    _invalidate_job(job_id, listed=listed)
+    job_index.forget(job_id)
@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import RedirectResponse
+from sqlalchemy.orm import Session
+import re
+
+from .. import models
+from ..deps import get_db
+from ..core.blob_store import BLOB_MOUNT, IMAGE_EXTENSIONS, PUBLIC, SERVED_EXTENSIONS, blob_store
+from ..core.static import IMMUTABLE, cached_file_response
+from ..utils.images import DERIVATIVE_SIZES, MEDIA_TYPES, fallback_format
+
+router = APIRouter(prefix="/media", tags=["media"])
+# Only mounted when storage is remote; local blobs are served by CachedStaticFiles
+blobs_router = APIRouter(prefix="/static/blobs", tags=["media"])
+
+_SHA_RE = re.compile(r"^[0-9a-f]{64}$")
+_BLOB_PATH_RE = re.compile(r"^[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})(\.[A-Za-z0-9]+)$")
+
+def _is_public_media(blob: models.Blob) -> bool:
+    # avatars and logos; the type was sniffed from the bytes at upload (no SVG)
+    return blob.mime_type in IMAGE_EXTENSIONS and blob.ext in SERVED_EXTENSIONS
+
+def _presigned_redirect(key: str, content_type: str = None) -> RedirectResponse:
+    url = blob_store.storage.presigned_url(key, content_type=content_type)
+    # the browser may reuse the redirect while the signature is still valid
+    max_age = max(0, blob_store.storage.expires_sec // 2)
+    return RedirectResponse(url, status_code=307, headers={"Cache-Control": f"private, max-age={max_age}"})
+
+@router.get("/{sha256}/{size}.{fmt}")  # final path: GET /media/{sha256}/{size}.{fmt}
+def get_image_variant(sha256: str, size: int, fmt: str, request: Request, db: Session = Depends(get_db)):
+    """
+    Resized copy of an uploaded image (see utils/images.py).
+
+    Until the background stage has written the derivative (or when Pillow is
+    not installed) this redirects to the original upload, so the URLs handed
+    out at upload time work immediately.
+    """
+    if not _SHA_RE.match(sha256) or size not in DERIVATIVE_SIZES or fmt not in MEDIA_TYPES:
+        raise HTTPException(status_code=404, detail="Not found")
+    key = blob_store.derivative_key(sha256, size, fmt)
+    storage = blob_store.storage
+    if storage.serves_locally:
+        path = storage.local_path(key)
+        if path.is_file():
+            return cached_file_response(
+                path, request.headers,
+                cache_control=IMMUTABLE, etag=f"{sha256}-{size}.{fmt}", media_type=MEDIA_TYPES[fmt],
+            )
+    elif storage.exists(key):
+        return _presigned_redirect(key)
+
+    blob = db.get(models.Blob, sha256)
+    if blob is None or not _is_public_media(blob) or fmt not in ("webp", fallback_format(blob.ext)):
+        raise HTTPException(status_code=404, detail="Not found")
+    # not cached: the derivative replaces this redirect once it is written
+    return RedirectResponse(
+        f"/static/blobs/{blob_store.relpath(blob.sha256, blob.ext)}",
+        status_code=307, headers={"Cache-Control": "no-cache"},
+    )
+
+@blobs_router.get("/{path:path}", name=BLOB_MOUNT)  # final path: GET /static/blobs/{path}
+def get_blob(path: str, db: Session = Depends(get_db)):
+    """
+    Remote storage: send the client to a presigned URL for a public image.
+
+    Anything else (CVs in particular) is only handed out by routes that
+    check access, so it is a 404 here.
+    """
+    m = _BLOB_PATH_RE.match(path)
+    blob = db.get(models.Blob, m.group(1)) if m else None
+    if blob is None or blob.ext != m.group(2) or not _is_public_media(blob):
+        raise HTTPException(status_code=404, detail="Not found")
+    return _presigned_redirect(blob_store.key(blob.sha256, blob.ext, PUBLIC))
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from ..database import get_db
 from ..deps import get_current_user
 from .. import schemas, models
 from ..utils.security import verify_password, hash_password
-import os, uuid, shutil
+from ..config import settings
+from ..core.blob_store import BLOB_MOUNT, IMAGE_EXTENSIONS, BlobRejected, blob_store
+from ..utils.uploads import UploadTooLarge
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -52,26 +55,42 @@ def update_me(
     db.add(user); db.commit(); db.refresh(user)
     return user
 
-AVATAR_DIR = "uploads/avatars"
-os.makedirs(AVATAR_DIR, exist_ok=True)
+# Legacy avatars (uploads/avatars) stay served; new uploads go to the blob store
+_AVATAR_TYPES = {"image/jpeg", "image/png", "image/jpg", "image/webp"}
+# what the bytes must turn out to be, and the extension they are stored with
+_AVATAR_EXTENSIONS = {mime: ext for mime, ext in IMAGE_EXTENSIONS.items() if mime in _AVATAR_TYPES}
+
+def _save_avatar(db: Session, user: models.User, avatar_url: str) -> None:
+    # put_upload referenced the new blob; drop the one being replaced
+    blob_store.release(db, blob_store.sha_from_url(user.profile_picture_url))
+    user.profile_picture_url = avatar_url
+    db.add(user); db.commit(); db.refresh(user)
 
 @router.post("/me/avatar", response_model=dict)
-def upload_avatar(
+async def upload_avatar(
     request: Request,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     user: models.User = Depends(get_current_user),
 ):
-    allowed_types = {"image/jpeg", "image/png", "image/jpg", "image/webp", "image/svg+xml"}
-    if file.content_type not in allowed_types:
+    if file.content_type not in _AVATAR_TYPES:
         raise HTTPException(400, "Only image files are allowed")
-    ext = os.path.splitext(file.filename or "")[1].lower()
-    fname = f"{uuid.uuid4()}{ext}"
-    dest = os.path.join(AVATAR_DIR, fname)
-    with open(dest, "wb") as buf:
-        shutil.copyfileobj(file.file, buf)
+    try:
+        blob = await blob_store.put_upload(
+            db, file, types=_AVATAR_EXTENSIONS,
+            max_bytes=settings.IMAGE_MAX_UPLOAD_MB * 1024 * 1024,
+        )
+    except UploadTooLarge as e:
+        raise HTTPException(413, str(e))
+    except BlobRejected as e:
+        raise HTTPException(400, str(e))
+    finally:
+        await file.close()
 
-    avatar_url = str(request.url_for("avatars", path=fname))  # requires mount in main.py
-    user.profile_picture_url = avatar_url
-    db.add(user); db.commit(); db.refresh(user)
-    return {"profile_picture_url": avatar_url}
+    rel = blob_store.relpath(blob.sha256, blob.ext)
+    avatar_url = str(request.url_for(BLOB_MOUNT, path=rel))  # requires mount in main.py
+    # resized copies are written after the response; their URLs work right away
+    background_tasks.add_task(blob_store.make_derivatives, blob.sha256, blob.ext)
+    await run_in_threadpool(_save_avatar, db, user, avatar_url)
+    return {"profile_picture_url": avatar_url, "profile_picture_variants": blob_store.variant_urls(avatar_url)}
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, validator, constr, ConfigDict, field_validator, EmailStr
 from datetime import date, datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 from typing import Literal
 import json
 from .utils.html import sanitize_html
@@ -162,6 +162,25 @@ class JobUpdate(BaseModel):
 class JobStatusUpdate(BaseModel):
     status: Literal["draft","published","archived"]
 
+def as_str_list(v) -> List[str]:
+    """Coerce a JSON array column (list, JSON text or None) to a list of strings."""
+    if v is None:
+        return []
+    if isinstance(v, list):
+        # trim strings & drop empties
+        return [str(x).strip() for x in v if str(x).strip()]
+    if isinstance(v, str):
+        # DB returned JSON as text → parse
+        try:
+            parsed = json.loads(v)
+        except Exception:
+            return []
+        if isinstance(parsed, list):
+            return [str(x).strip() for x in parsed if str(x).strip()]
+        return []
+    # any other type → safest fallback
+    return []
+
 class JobOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)  # 👈 important for .from_orm
 
@@ -169,6 +188,7 @@ class JobOut(BaseModel):
     title: str
     company_name: Optional[str] = None
     company_logo_url: Optional[str] = None
+    company_logo_variants: Optional[Dict[str, Dict[str, str]]] = None
     location_city: Optional[str] = None
     location_country: Optional[str] = None
 
@@ -207,22 +227,24 @@ class JobOut(BaseModel):
     @field_validator("missions", "skills", mode="before")
     @classmethod
     def _ensure_list(cls, v):
-        if v is None:
-            return []
-        if isinstance(v, list):
-            # trim strings & drop empties
-            return [str(x).strip() for x in v if str(x).strip()]
-        if isinstance(v, str):
-            # DB returned JSON as text → parse
-            try:
-                parsed = json.loads(v)
-            except Exception:
-                return []
-            if isinstance(parsed, list):
-                return [str(x).strip() for x in parsed if str(x).strip()]
-            return []
-        # any other type → safest fallback
-        return []
+        return as_str_list(v)
+
+class JobSearchHit(BaseModel):
+    job: JobOut
+    # blended relevance and its two parts, each in [0, 1]
+    score: float
+    semantic: float
+    lexical: float
+
+class FacetValue(BaseModel):
+    value: str
+    count: int
+
+class JobFacetsOut(BaseModel):
+    # published jobs matching every filter
+    total: int
+    # facet name -> values, most frequent first
+    facets: Dict[str, List[FacetValue]]
 
 from typing import Literal
 
@@ -291,10 +313,20 @@ class CompanyUpdateIn(BaseModel):
 
 class LogoUploadOut(BaseModel):
     company_logo_url: str
+    # size -> {format: url}; resized copies are generated in the background
+    company_logo_variants: Optional[Dict[str, Dict[str, str]]] = None
 
 # CV
 class CVRead(BaseModel):
     id: int
-    file_path: str
+    # name of the stored file only; its location stays server-side
+    filename: str = Field(validation_alias="file_path")
     uploaded_at: datetime
+    mime_type: Optional[str] = None
+    size_bytes: Optional[int] = None
     class Config: from_attributes = True
+
+    @field_validator("filename", mode="before")
+    @classmethod
+    def _basename(cls, v):
+        return str(v).replace("\\", "/").rsplit("/", 1)[-1]
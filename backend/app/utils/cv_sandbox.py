@@ -0,0 +1,280 @@
+"""
+Sandboxed CV text extraction.
+
+pypdf and python-docx parse untrusted uploads. Here they run in spawned worker
+processes with address-space and CPU-time rlimits, so a decompression bomb or
+a pathological PDF kills one worker instead of the API process. A PDF's
+worker is also killed shortly after CV_PDF_TIMEOUT_SEC, so the budget holds
+even while pypdf is stuck opening the file or inside one page. Workers are
+recycled after a fixed number of documents and failures surface as
+ExtractionError with a machine-readable code.
+"""
+from __future__ import annotations
+
+import os
+import queue
+import signal
+import logging
+import threading
+import multiprocessing
+from typing import Optional
+
+from ..config import settings
+
+try:
+    import resource  # POSIX only; limits are skipped where it is missing
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+CV_SANDBOX_ENABLED = os.getenv("CV_SANDBOX_ENABLED", "true").lower() in {"1", "true", "yes"}
+CV_SANDBOX_WORKERS = int(os.getenv("CV_SANDBOX_WORKERS", "2"))
+CV_SANDBOX_MAX_MEMORY_MB = int(os.getenv("CV_SANDBOX_MAX_MEMORY_MB", "768"))
+CV_SANDBOX_CPU_SEC = int(os.getenv("CV_SANDBOX_CPU_SEC", "30"))
+CV_SANDBOX_TIMEOUT_SEC = float(os.getenv("CV_SANDBOX_TIMEOUT_SEC", "45"))
+# Recycle a worker after this many documents to cap leaks and fragmentation
+CV_SANDBOX_MAX_DOCS = int(os.getenv("CV_SANDBOX_MAX_DOCS", "50"))
+# The PDF page loop stops itself at CV_PDF_TIMEOUT_SEC; this much later the
+# worker is killed instead
+_PDF_KILL_GRACE_SEC = 5.0
+
+# Functions a worker may run, by name (requests cross a pipe, so no callables)
+_OPS = {"extract_text_with_meta", "extract_text_budgeted_with_meta"}
+
+class ExtractionError(Exception):
+    """
+    Extraction failure reported by the sandbox.
+
+    code is one of: "not_found", "empty", "unsupported", "invalid",
+    "memory", "cpu_limit", "timeout", "crashed".
+    """
+    def __init__(self, code: str, message: str, *, file_path: Optional[str] = None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.file_path = file_path
+
+    def to_dict(self) -> dict:
+        return {"code": self.code, "detail": self.message, "file": os.path.basename(self.file_path or "")}
+
+def _classify(exc: BaseException) -> str:
+    if isinstance(exc, MemoryError):
+        return "memory"
+    if isinstance(exc, FileNotFoundError):
+        return "not_found"
+    if isinstance(exc, ValueError):
+        msg = str(exc)
+        if msg.startswith("Unsupported file type"):
+            return "unsupported"
+        if msg.startswith("Cannot read an empty file"):
+            return "empty"
+    return "invalid"
+
+# ---------- worker process ----------
+def _set_cpu_budget(cpu_sec: int) -> None:
+    """Allow cpu_sec more CPU seconds from now (RLIMIT_CPU is cumulative)."""
+    if resource is None or cpu_sec <= 0:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + cpu_sec
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+def _worker_main(conn, max_memory_mb: int, cpu_sec: int) -> None:
+    from . import cv_text  # import before the memory cap so it is not charged to documents
+
+    if resource is not None and max_memory_mb > 0:
+        limit = max_memory_mb * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError):
+            pass
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        if request is None:
+            return
+        op, args, kwargs = request
+        _set_cpu_budget(cpu_sec)
+        try:
+            result = getattr(cv_text, op)(*args, **kwargs)
+            conn.send(("ok", result))
+        except MemoryError:
+            conn.send(("error", "memory", "document exceeded the extraction memory limit"))
+            return  # heap is in an unknown state: let the parent replace us
+        except Exception as e:
+            conn.send(("error", _classify(e), str(e) or e.__class__.__name__))
+
+# ---------- parent side ----------
+class _WorkerGone(Exception):
+    """The request could not be sent: the worker had already exited."""
+
+class _Worker:
+    def __init__(self, max_memory_mb: int, cpu_sec: int):
+        ctx = multiprocessing.get_context("spawn")
+        self.conn, child_conn = ctx.Pipe()
+        self.proc = ctx.Process(
+            target=_worker_main, args=(child_conn, max_memory_mb, cpu_sec), daemon=True,
+        )
+        self.proc.start()
+        child_conn.close()
+        self.docs = 0
+        self.healthy = True
+
+    def run(self, op: str, args: tuple, kwargs: dict, timeout: float, file_path: str):
+        try:
+            self.conn.send((op, args, kwargs))
+        except (OSError, EOFError) as e:
+            self.kill()
+            raise _WorkerGone(str(e) or e.__class__.__name__)
+        self.docs += 1
+        try:
+            ready = self.conn.poll(timeout if timeout > 0 else None)
+        except (OSError, EOFError) as e:
+            self.kill()
+            raise ExtractionError("crashed", f"extraction worker unavailable: {e}", file_path=file_path)
+        if not ready:
+            self.kill()
+            raise ExtractionError("timeout", f"extraction exceeded {timeout:.0f}s", file_path=file_path)
+        try:
+            msg = self.conn.recv()
+        except (EOFError, OSError):
+            self.proc.join(1)
+            code = self.proc.exitcode
+            self.kill()
+            if code == -getattr(signal, "SIGXCPU", -999):
+                raise ExtractionError("cpu_limit", "document exceeded the extraction CPU limit", file_path=file_path)
+            raise ExtractionError("crashed", f"extraction worker died (exit code {code})", file_path=file_path)
+        if msg[0] == "ok":
+            return msg[1]
+        _, code, message = msg
+        if code == "memory":
+            self.kill()
+        raise ExtractionError(code, message, file_path=file_path)
+
+    def close(self) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, EOFError):
+            pass
+        self.proc.join(1)
+        self.kill()
+
+    def kill(self) -> None:
+        self.healthy = False
+        if self.proc.is_alive():
+            self.proc.kill()
+            self.proc.join(1)
+        self.conn.close()
+
+class ExtractionSandbox:
+    """Bounded pool of rlimited extraction workers."""
+
+    def __init__(
+        self,
+        workers: int = CV_SANDBOX_WORKERS,
+        *,
+        max_memory_mb: int = CV_SANDBOX_MAX_MEMORY_MB,
+        cpu_sec: int = CV_SANDBOX_CPU_SEC,
+        timeout: float = CV_SANDBOX_TIMEOUT_SEC,
+        max_docs: int = CV_SANDBOX_MAX_DOCS,
+    ):
+        self.max_memory_mb = max_memory_mb
+        self.cpu_sec = cpu_sec
+        self.timeout = timeout
+        self.max_docs = max_docs
+        self._slots = threading.BoundedSemaphore(max(1, workers))
+        self._idle: "queue.LifoQueue[_Worker]" = queue.LifoQueue()
+        self._closed = False
+
+    def run(self, op: str, file_path: str, *args, **kwargs):
+        if op not in _OPS:
+            raise ValueError(f"Unknown sandbox operation: {op}")
+        if self._closed:
+            raise ExtractionError("crashed", "extraction sandbox is shut down", file_path=file_path)
+        timeout = self._timeout_for(file_path)
+        with self._slots:
+            worker = self._idle_worker()
+            try:
+                try:
+                    return worker.run(op, (file_path, *args), kwargs, timeout, file_path)
+                except _WorkerGone:
+                    # exited while idle, so the document never reached it: one fresh try
+                    worker = _Worker(self.max_memory_mb, self.cpu_sec)
+                    return worker.run(op, (file_path, *args), kwargs, timeout, file_path)
+            except _WorkerGone as e:
+                raise ExtractionError("crashed", f"extraction worker unavailable: {e}", file_path=file_path)
+            finally:
+                if worker.healthy and worker.docs < self.max_docs and not self._closed:
+                    self._idle.put(worker)
+                elif worker.healthy:
+                    worker.close()
+
+    def _idle_worker(self) -> _Worker:
+        """A parked worker that is still running, or a new one."""
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return _Worker(self.max_memory_mb, self.cpu_sec)
+            if worker.proc.is_alive():
+                return worker
+            worker.kill()
+
+    def _timeout_for(self, file_path: str) -> float:
+        pdf_timeout = settings.CV_PDF_TIMEOUT_SEC
+        if pdf_timeout <= 0 or not file_path.lower().endswith(".pdf"):
+            return self.timeout
+        hard = pdf_timeout + _PDF_KILL_GRACE_SEC
+        return min(self.timeout, hard) if self.timeout > 0 else hard
+
+    def shutdown(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+_sandbox: ExtractionSandbox | None = None
+_sandbox_lock = threading.Lock()
+
+def get_sandbox() -> ExtractionSandbox:
+    """Get or create the process-wide sandbox."""
+    global _sandbox
+    with _sandbox_lock:
+        if _sandbox is None:
+            _sandbox = ExtractionSandbox()
+        return _sandbox
+
+def shutdown_sandbox() -> None:
+    global _sandbox
+    with _sandbox_lock:
+        sandbox, _sandbox = _sandbox, None
+    if sandbox is not None:
+        sandbox.shutdown()
+
+def _run(op: str, file_path: str, *args, **kwargs):
+    if CV_SANDBOX_ENABLED:
+        return get_sandbox().run(op, file_path, *args, **kwargs)
+    # sandbox disabled: same API and error shape, in-process
+    from . import cv_text
+    try:
+        return getattr(cv_text, op)(file_path, *args, **kwargs)
+    except Exception as e:
+        raise ExtractionError(_classify(e), str(e) or e.__class__.__name__, file_path=file_path) from e
+
+def extract_text_with_meta_sandboxed(file_path: str) -> dict:
+    """Sandboxed cv_text.extract_text_with_meta; raises ExtractionError."""
+    return _run("extract_text_with_meta", file_path)
+
+def extract_text_budgeted_with_meta_sandboxed(file_path: str, max_tokens: Optional[int] = None) -> dict:
+    """Sandboxed cv_text.extract_text_budgeted_with_meta; raises ExtractionError."""
+    return _run("extract_text_budgeted_with_meta", file_path, max_tokens=max_tokens)
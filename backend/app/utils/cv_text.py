@@ -2,97 +2,446 @@
 Text extraction utilities for CV/resume processing
 """
 import os
+import time
+import logging
+import zipfile
+import xml.etree.ElementTree as ET
 from pathlib import Path
+from importlib import metadata
+from importlib.util import find_spec
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
 from pypdf import PdfReader
 from docx import Document
 import re
 
+from ..config import settings
+from .uploads import text_encoding
+
+logger = logging.getLogger(__name__)
+
 def extract_text_from_file(file_path: str) -> str:
     """
     Extract text from various file formats (PDF, DOCX, TXT)
     """
+    return extract_text_with_meta(file_path)["text"]
+
+def extract_text_with_meta(file_path: str) -> dict:
+    """
+    Extract text and report how complete the extraction was.
+
+    Returns a dict with "text", "pages" (total pages, PDF only), "pages_read",
+    "truncated" (page cap hit), "timed_out" (wall-clock budget exceeded) and
+    "backend" (extractor name and version).
+    The PDF time budget is checked between pages; only the sandbox
+    (cv_sandbox.py) can stop a document stuck inside one page.
+    """
+    fmt = _format_of(file_path)
+    if fmt == "pdf":
+        return _extract_pdf_text(file_path)
+    if fmt == "txt":
+        return _full_result(_extract_txt_text(file_path), get_backend("txt"))
+    backend = get_backend(fmt)
+    return _full_result("\n".join(backend.iter_blocks(file_path)), backend)
+
+def iter_extracted_text(
+    file_path: str, *, max_tokens: Optional[int] = None, meta: Optional[dict] = None,
+) -> Iterator[str]:
+    """
+    Yield cleaned text block by block: PDF pages, DOCX paragraphs/cells, TXT paragraphs.
+
+    With max_tokens set, stops once that many whitespace-separated tokens have
+    been yielded (the last block is trimmed), so consumers that truncate anyway
+    never pay for the rest of the document.
+    A meta dict, if given, is kept up to date with the extract_text_with_meta
+    keys (pages, pages_read, truncated, timed_out, backend) plus
+    "budget_reached".
+    """
+    backend = get_backend(_format_of(file_path))
+    if meta is not None:
+        meta.update(_full_result("", backend), budget_reached=False)
+    if backend.open_document is not None:
+        raw_blocks = _iter_pdf_pages(file_path, open_document=backend.open_document, meta=meta)
+    else:
+        raw_blocks = backend.iter_blocks(file_path)
+
+    budget = max_tokens if max_tokens and max_tokens > 0 else None
+    for raw in raw_blocks:
+        block = clean_extracted_text(raw)
+        if not block:
+            continue
+        if budget is not None:
+            words = block.split()
+            if len(words) >= budget:
+                if meta is not None:
+                    meta["budget_reached"] = True
+                yield " ".join(words[:budget])
+                return
+            budget -= len(words)
+        yield block
+
+def extract_text_budgeted(file_path: str, max_tokens: Optional[int] = None) -> str:
+    """
+    Cleaned text limited to roughly max_tokens tokens (see iter_extracted_text)
+    """
+    return " ".join(iter_extracted_text(file_path, max_tokens=max_tokens))
+
+def extract_text_budgeted_with_meta(file_path: str, max_tokens: Optional[int] = None) -> dict:
+    """
+    extract_text_budgeted with the extract_text_with_meta report.
+
+    "text" is already cleaned; "budget_reached" says the token budget, not the
+    end of the document, stopped the extraction.
+    """
+    meta: dict = {}
+    text = " ".join(iter_extracted_text(file_path, max_tokens=max_tokens, meta=meta))
+    return dict(meta, text=text)
+
+def _check_readable(file_path: str) -> str:
     p = Path(file_path)
     if not p.exists() or p.stat().st_size == 0:
         raise ValueError("Cannot read an empty file")
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
+    return file_path.lower()
 
-    file_lower = file_path.lower()
+def _unsupported(file_path: str) -> ValueError:
+    return ValueError(
+        f"Unsupported file type: {os.path.basename(file_path)}. Supported types: PDF, DOCX, TXT"
+    )
+
+def _format_of(file_path: str) -> str:
+    file_lower = _check_readable(file_path)
 
     if file_lower.endswith('.pdf'):
-        return _extract_pdf_text(file_path)
+        return "pdf"
     if file_lower.endswith('.docx'):
-        return _extract_docx_text(file_path)
+        return "docx"
     if file_lower.endswith('.txt'):
-        return _extract_txt_text(file_path)
-    raise ValueError(
-        f"Unsupported file type: {os.path.basename(file_path)}. Supported types: PDF, DOCX, TXT"
-    )
+        return "txt"
+    raise _unsupported(file_path)
+
+def _full_result(text: str, backend: "ExtractorBackend") -> dict:
+    return {
+        "text": text, "pages": None, "pages_read": None, "truncated": False, "timed_out": False,
+        "backend": backend.label,
+    }
+
+def _extract_pdf_text(
+    file_path: str,
+    max_pages: Optional[int] = None,
+    timeout: Optional[float] = None,
+    backend: Optional[str] = None,
+) -> dict:
+    max_pages = settings.CV_PDF_MAX_PAGES if max_pages is None else max_pages
+    timeout = settings.CV_PDF_TIMEOUT_SEC if timeout is None else timeout
+    deadline = time.monotonic() + timeout if timeout and timeout > 0 else None
+
+    pdf = get_backend("pdf", backend)
+    doc = pdf.open_document(file_path)
+    total = len(doc)
+    n = min(total, max_pages) if max_pages and max_pages > 0 else total
+
+    texts: List[Optional[str]] = [None] * n
+    timed_out = _extract_pdf_pages_sequential(doc, texts, deadline)
+
+    parts = [t for t in texts if t and t.strip()]
+    result = {
+        "text": "\n".join(parts),
+        "pages": total,
+        "pages_read": sum(1 for t in texts if t is not None),
+        "truncated": n < total,
+        "timed_out": timed_out,
+        "backend": pdf.label,
+    }
+    if result["truncated"] or timed_out:
+        logger.warning(
+            "pdf extraction incomplete: %s pages_read=%d/%d truncated=%s timed_out=%s",
+            os.path.basename(file_path), result["pages_read"], total, result["truncated"], timed_out,
+        )
+    return result
+
+def _extract_pdf_pages_sequential(doc: "_PdfDocument", texts: List[Optional[str]], deadline: Optional[float]) -> bool:
+    """Fill texts in place; returns True if the deadline was hit."""
+    for i in range(len(texts)):
+        if deadline is not None and time.monotonic() >= deadline:
+            return True
+        texts[i] = doc.page_text(i)
+    return False
+
+def _iter_pdf_pages(
+    file_path: str,
+    max_pages: Optional[int] = None,
+    timeout: Optional[float] = None,
+    open_document: Optional[Callable[[str], "_PdfDocument"]] = None,
+    meta: Optional[dict] = None,
+) -> Iterator[str]:
+    """
+    Lazily yield non-empty page texts, honouring the page cap and time budget.
 
-def _extract_pdf_text(file_path: str) -> str:
-    reader = PdfReader(file_path)
-    parts = []
-    for page in reader.pages:
-        t = page.extract_text() or ""
+    meta, if given, gets pages, pages_read, truncated and timed_out as the
+    pages are read.
+    """
+    max_pages = settings.CV_PDF_MAX_PAGES if max_pages is None else max_pages
+    timeout = settings.CV_PDF_TIMEOUT_SEC if timeout is None else timeout
+    deadline = time.monotonic() + timeout if timeout and timeout > 0 else None
+
+    doc = (open_document or get_backend("pdf").open_document)(file_path)
+    total = len(doc)
+    n = min(total, max_pages) if max_pages and max_pages > 0 else total
+    if meta is not None:
+        meta.update(pages=total, pages_read=0)
+    for i in range(n):
+        if deadline is not None and time.monotonic() >= deadline:
+            logger.warning("pdf extraction timed out: %s pages_read=%d/%d", os.path.basename(file_path), i, total)
+            if meta is not None:
+                meta["timed_out"] = True
+            return
+        t = doc.page_text(i)
+        if meta is not None:
+            meta["pages_read"] = i + 1
         if t.strip():
-            parts.append(t)
-    return "\n".join(parts)
+            yield t
+    if meta is not None:
+        meta["truncated"] = n < total
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_DOCUMENT, _W_BODY, _W_P, _W_TC = _W + "document", _W + "body", _W + "p", _W + "tc"
+_W_T = _W + "t"
+# Run children rendered the way python-docx's Paragraph.text renders them
+_W_RUN_CHARS = {_W + "tab": "\t", _W + "ptab": "\t", _W + "br": "\n", _W + "cr": "\n", _W + "noBreakHyphen": "-"}
+
+class _UnusualDocx(Exception):
+    """Package layout the streaming reader does not handle; use python-docx instead."""
+
+def _iter_docx_blocks(file_path: str) -> Iterator[str]:
+    """
+    Paragraph and table-cell texts in document order.
+
+    Streams word/document.xml with iterparse instead of building the
+    python-docx object model; falls back to python-docx for packages it does
+    not recognise (non-standard main part, Strict OOXML namespace, ...).
+    """
+    try:
+        stream = _iter_docx_blocks_streaming(file_path)
+        first = next(stream, None)
+    except _UnusualDocx as e:
+        logger.info("docx streaming skipped (%s), using python-docx: %s", e, os.path.basename(file_path))
+        yield from _iter_docx_blocks_python_docx(file_path)
+        return
+    if first is not None:
+        yield first
+        yield from stream
+
+def _iter_docx_blocks_streaming(file_path: str) -> Iterator[str]:
+    try:
+        zf = zipfile.ZipFile(file_path)
+    except zipfile.BadZipFile as e:
+        raise _UnusualDocx(f"bad zip: {e}")
+    with zf:
+        try:
+            info = zf.getinfo("word/document.xml")
+        except KeyError:
+            raise _UnusualDocx("no word/document.xml")
+        # decompression-bomb guard
+        if info.file_size > settings.CV_DOCX_MAX_XML_MB * 1024 * 1024:
+            raise ValueError(f"DOCX document is too large to extract ({info.file_size // (1024 * 1024)} MB of XML)")
+        with zf.open(info) as fh:
+            events = ET.iterparse(fh, events=("start", "end"))
+            try:
+                _, root = next(events)
+            except ET.ParseError as e:
+                raise _UnusualDocx(f"unreadable document.xml: {e}")
+            if root.tag != _W_DOCUMENT:
+                raise _UnusualDocx(f"unexpected root {root.tag}")
+
+            body = None
+            paras: List[List[str]] = []  # open <w:p> (text boxes nest paragraphs)
+            cells: List[List[str]] = []  # open <w:tc> (tables can nest)
+            for event, el in events:
+                tag = el.tag
+                if event == "start":
+                    if tag == _W_P:
+                        paras.append([])
+                    elif tag == _W_TC:
+                        cells.append([])
+                    elif tag == _W_BODY:
+                        body = el
+                    continue
 
-def _extract_docx_text(file_path: str) -> str:
+                if tag == _W_T:
+                    if paras:
+                        paras[-1].append(el.text or "")
+                elif tag in _W_RUN_CHARS:
+                    if paras:
+                        paras[-1].append(_W_RUN_CHARS[tag])
+                elif tag == _W_P:
+                    text = "".join(paras.pop())
+                    if cells:
+                        cells[-1].append(text)
+                    elif text.strip():
+                        yield text
+                elif tag == _W_TC:
+                    text = "\n".join(cells.pop())
+                    if text.strip():
+                        yield text
+
+                # Drop finished top-level blocks so memory stays flat
+                if body is not None and not paras and not cells and tag in (_W_P, _W + "tbl", _W + "sdt"):
+                    body.clear()
+
+def _iter_docx_blocks_python_docx(file_path: str) -> Iterator[str]:
     doc = Document(file_path)
-    parts = []
     for paragraph in doc.paragraphs:
         if paragraph.text.strip():
-            parts.append(paragraph.text)
+            yield paragraph.text
     for table in doc.tables:
         for row in table.rows:
             for cell in row.cells:
                 if cell.text.strip():
-                    parts.append(cell.text)
-    return "\n".join(parts)
+                    yield cell.text
+
+def _txt_encoding(file_path: str) -> str:
+    """Codec of a .txt CV (UTF-8, UTF-16 with a BOM, or cp1252/Latin-1)."""
+    with open(file_path, 'rb') as f:
+        return text_encoding(f.read(64 * 1024)) or 'utf-8'
 
 def _extract_txt_text(file_path: str) -> str:
-    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+    with open(file_path, 'r', encoding=_txt_encoding(file_path), errors='ignore') as f:
         return f.read()
 
+def _iter_txt_blocks(file_path: str) -> Iterator[str]:
+    """Yield blank-line separated paragraphs without reading the whole file."""
+    with open(file_path, 'r', encoding=_txt_encoding(file_path), errors='ignore') as f:
+        para: List[str] = []
+        for line in f:
+            if line.strip():
+                para.append(line)
+            elif para:
+                yield "".join(para)
+                para = []
+        if para:
+            yield "".join(para)
+
+# ---------- extractor backends ----------
+class _PdfDocument:
+    """Minimal paged-document interface the PDF code relies on."""
+    def __len__(self) -> int: ...
+    def page_text(self, index: int) -> str: ...
+
+class _PypdfDocument(_PdfDocument):
+    def __init__(self, file_path: str):
+        self._reader = PdfReader(file_path)
+
+    def __len__(self) -> int:
+        return len(self._reader.pages)
+
+    def page_text(self, index: int) -> str:
+        return self._reader.pages[index].extract_text() or ""
+
+class _PymupdfDocument(_PdfDocument):
+    def __init__(self, file_path: str):
+        import pymupdf  # optional dependency
+        self._doc = pymupdf.open(file_path)
+
+    def __len__(self) -> int:
+        return self._doc.page_count
+
+    def page_text(self, index: int) -> str:
+        return self._doc[index].get_text() or ""
+
+class ExtractorBackend(NamedTuple):
+    fmt: str                    # "pdf" | "docx" | "txt"
+    name: str
+    version: str
+    iter_blocks: Callable[[str], Iterator[str]]
+    open_document: Optional[Callable[[str], _PdfDocument]] = None  # paged formats only
+
+    @property
+    def label(self) -> str:
+        return f"{self.name} {self.version}"
+
+_BACKENDS: Dict[str, Dict[str, ExtractorBackend]] = {"pdf": {}, "docx": {}, "txt": {}}
+# Default extractor backend per format (see available_backends / scripts/bench_extractors.py)
+_DEFAULT_BACKENDS = {"pdf": settings.CV_EXTRACTOR_PDF, "docx": settings.CV_EXTRACTOR_DOCX, "txt": "plain"}
+
+def register_backend(backend: ExtractorBackend) -> None:
+    _BACKENDS.setdefault(backend.fmt, {})[backend.name] = backend
+
+def available_backends(fmt: Optional[str] = None) -> List[ExtractorBackend]:
+    """Installed backends, for one format or all of them."""
+    fmts = [fmt] if fmt else list(_BACKENDS)
+    return [b for f in fmts for b in _BACKENDS.get(f, {}).values()]
+
+def get_backend(fmt: str, name: Optional[str] = None) -> ExtractorBackend:
+    """
+    Backend by name, or the configured default for the format.
+
+    An unavailable configured default falls back to the first registered
+    backend so a missing optional engine never breaks extraction.
+    """
+    backends = _BACKENDS.get(fmt) or {}
+    if name:
+        if name not in backends:
+            raise ValueError(f"Unknown {fmt} extractor backend: {name}")
+        return backends[name]
+    default = _DEFAULT_BACKENDS.get(fmt)
+    if default in backends:
+        return backends[default]
+    if not backends:
+        raise ValueError(f"No extractor backend for {fmt}")
+    fallback = next(iter(backends.values()))
+    logger.warning("extractor backend %r for %s is not installed, using %s", default, fmt, fallback.name)
+    _DEFAULT_BACKENDS[fmt] = fallback.name
+    return fallback
+
+def _dist_version(dist: str) -> str:
+    try:
+        return metadata.version(dist)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+def _pdf_backend(name: str, version: str, opener: Callable[[str], _PdfDocument]) -> ExtractorBackend:
+    return ExtractorBackend(
+        "pdf", name, version,
+        iter_blocks=lambda file_path: _iter_pdf_pages(file_path, open_document=opener),
+        open_document=opener,
+    )
+
+register_backend(_pdf_backend("pypdf", _dist_version("pypdf"), _PypdfDocument))
+if find_spec("pymupdf") is not None:
+    register_backend(_pdf_backend("pymupdf", _dist_version("pymupdf"), _PymupdfDocument))
+register_backend(ExtractorBackend("docx", "docx-stream", "1", _iter_docx_blocks))
+register_backend(ExtractorBackend("docx", "python-docx", _dist_version("python-docx"), _iter_docx_blocks_python_docx))
+register_backend(ExtractorBackend("txt", "plain", "1", _iter_txt_blocks))
+
 # Heuristic: collapse sequences of single letters like "R e a c t" -> "React"
 # Keeps numbers/emails/URLs intact.
-_SPACED_LETTERS_RE = re.compile(r"(?:\b[a-zA-Z]\s){4,}[a-zA-Z]\b")  # ≥5 letters with spaces
-def _fix_spaced_letters(text: str) -> str:
-    def _join_run(run: str) -> str:
-        # run like "R e a c t" -> "React"
-        letters = run.split()
-        return "".join(letters)
-
-    out = []
-    i = 0
-    while i < len(text):
-        m = _SPACED_LETTERS_RE.search(text, i)
-        if not m:
-            out.append(text[i:])
-            break
-        # append chunk before match
-        out.append(text[i:m.start()])
-        # replace the matched run
-        out.append(_join_run(m.group(0)))
-        i = m.end()
-    return "".join(out)
+# Only runs on normalized text, where every separator is a single space.
+_SPACED_LETTERS_RE = re.compile(r"\b[a-zA-Z] (?:[a-zA-Z] ){3,}[a-zA-Z]\b")  # ≥5 letters with spaces
+# Every such run contains " x x x x" (letters 2-5). This literal-led pattern
+# scans ~10x faster, so artifact-free text skips the full regex.
+_SPACED_HINT_RE = re.compile(r" [a-zA-Z] [a-zA-Z] [a-zA-Z] [a-zA-Z]")
+
+# Runs of characters kept by the cleaner. Anything else (whitespace, symbols,
+# control chars) separates runs and ends up as a single space.
+_KEEP_RUN_RE = re.compile(r"[\w.,!?-]+")
 
 def clean_extracted_text(text: str) -> str:
     """
     Clean and normalize extracted text
+
+    Same output as collapsing whitespace, blanking every character other than
+    word characters and .,!?- , collapsing again and de-spacing letter runs,
+    but done in two compiled scans instead of four passes over the text.
     """
     if not text:
         return ""
-    # collapse whitespace
-    text = " ".join(text.split())
-    # remove non-printable (keep basic punctuation)
-    text = re.sub(r'[^\w\s.,!?-]', ' ', text)
-    # normalize spaces again
-    text = " ".join(text.split())
-    # NEW: de-space letter-by-letter artifacts
-    text = _fix_spaced_letters(text)
-    return text.strip()
+    # whitespace collapse + character filter in one scan
+    text = " ".join(_KEEP_RUN_RE.findall(text))
+    # de-space letter-by-letter artifacts ("R e a c t" -> "React")
+    if _SPACED_HINT_RE.search(text) is None:
+        return text
+    return _SPACED_LETTERS_RE.sub(lambda m: m.group(0).replace(" ", ""), text)
 
 def get_file_info(file_path: str) -> dict:
     if not os.path.exists(file_path):
@@ -0,0 +1,75 @@
+"""
+Resized derivatives of uploaded avatars and company logos.
+
+Each raster upload gets small copies (DERIVATIVE_SIZES, longest side in px)
+as WebP plus a fallback in the source's own family: PNG when the source may
+carry transparency, JPEG for photos. Where the files are kept is up to the
+caller (core/blob_store.py). Pillow is optional; without it no derivatives
+are produced and the media route serves the original instead.
+"""
+from __future__ import annotations
+
+import os
+import logging
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # optional dependency
+    Image = None
+    ImageOps = None
+
+logger = logging.getLogger("smartrecruit")
+
+DERIVATIVE_SIZES = (64, 128, 256)
+# Refuse to decode images larger than this (decompression bombs)
+IMAGE_MAX_PIXELS = int(os.getenv("IMAGE_MAX_PIXELS", str(40_000_000)))
+
+MEDIA_TYPES = {"webp": "image/webp", "png": "image/png", "jpeg": "image/jpeg"}
+
+# source extension -> fallback format; anything else (e.g. SVG) is served as-is
+_FALLBACK = {".png": "png", ".gif": "png", ".webp": "png", ".jpg": "jpeg", ".jpeg": "jpeg"}
+_SAVE_OPTS = {
+    "webp": {"quality": 80, "method": 4},
+    "jpeg": {"quality": 85, "optimize": True, "progressive": True},
+    "png": {"optimize": True},
+}
+
+def fallback_format(ext: str) -> Optional[str]:
+    """Fallback format for a source extension, or None if it is not resized."""
+    return _FALLBACK.get((ext or "").lower())
+
+def generate_derivatives(src: Path, ext: str, out_dir: Path) -> List[Tuple[int, str, Path]]:
+    """
+    Write every size/format derivative of src into out_dir.
+
+    Returns (size, format, path) for each file written. Never raises: an
+    undecodable image just gets no derivatives.
+    """
+    fallback = fallback_format(ext)
+    if Image is None or fallback is None:
+        return []
+    written: List[Tuple[int, str, Path]] = []
+    try:
+        Image.MAX_IMAGE_PIXELS = IMAGE_MAX_PIXELS
+        with Image.open(src) as im:
+            # JPEG can decode at a reduced scale directly, far cheaper for phone photos
+            im.draft("RGB", (max(DERIVATIVE_SIZES), max(DERIVATIVE_SIZES)))
+            im = ImageOps.exif_transpose(im)
+            keep_alpha = fallback == "png" and (im.mode in ("RGBA", "LA", "P") or "transparency" in im.info)
+            im = im.convert("RGBA" if keep_alpha else "RGB")
+
+            # largest first, each smaller size resampled from the previous one
+            current = im
+            for size in sorted(DERIVATIVE_SIZES, reverse=True):
+                current = current.copy()
+                current.thumbnail((size, size), Image.LANCZOS)
+                for fmt in ("webp", fallback):
+                    dest = out_dir / f"{size}.{fmt}"
+                    current.save(dest, format=fmt.upper(), **_SAVE_OPTS[fmt])
+                    written.append((size, fmt, dest))
+    except Exception:
+        logger.warning("image_derivatives_failed", extra={"src": str(src)}, exc_info=True)
+        return []
+    return written
@@ -0,0 +1,46 @@
+"""
+Skill vocabulary shared by CV scoring (services/ai_service.py) and job storage.
+
+Jobs keep their skills as entered, plus a canonical copy (jobs.skills_canon)
+where spelling variants are one JSONB value: "React.js", "reactjs" and
+"React" are all "react" there, so the GET /jobs skills filter is a plain
+containment test on the GIN index ix_jobs_skills_canon.
+"""
+from typing import Iterable, List, Optional
+
+CANON_MAP = {
+    # JavaScript ecosystem
+    "react.js": "react",
+    "reactjs": "react",
+    "next.js": "nextjs",
+    "nextjs": "nextjs",
+    "node.js": "node",
+    "nodejs": "node",
+    "js": "javascript",
+    "javascript": "javascript",
+    "ts": "typescript",
+    "typescript": "typescript",
+    # Frontend variants
+    "front-end": "frontend",
+    "front": "frontend",
+    "front end": "frontend",
+    "frontend": "frontend",
+    # Web technologies
+    "html5": "html",
+    "css3": "css",
+    # ML/Data science
+    "scikit-learn": "sklearn",
+    "scikitlearn": "sklearn",
+}
+
+def canon_token(token: str) -> str:
+    """Standardize common technology term variants."""
+    return CANON_MAP.get(token, token)
+
+def canonical_skill(value) -> str:
+    """Lowercase, single-spaced, canon_token'd form of one skill ("" if blank)."""
+    return canon_token(" ".join(str(value or "").split()).lower())
+
+def canonical_skills(values: Optional[Iterable]) -> List[str]:
+    """Canonical skills of a list, first occurrence kept, blanks dropped."""
+    return list(dict.fromkeys(s for s in map(canonical_skill, values or ()) if s))
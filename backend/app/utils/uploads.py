@@ -0,0 +1,127 @@
+"""
+Streaming upload helpers.
+
+Copies an UploadFile to disk in chunks with all blocking I/O off the event
+loop, hashing the content and sniffing its type as it streams, and aborting
+as soon as a size cap is exceeded.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import BinaryIO, NamedTuple, Optional
+
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+class UploadTooLarge(Exception):
+    def __init__(self, max_bytes: int):
+        super().__init__(f"File exceeds the {max_bytes // (1024 * 1024)} MB limit")
+        self.max_bytes = max_bytes
+
+class StoredUpload(NamedTuple):
+    path: Path
+    size: int
+    sha256: str
+    mime: Optional[str]
+
+def text_encoding(head: bytes) -> Optional[str]:
+    """
+    Codec to read a text file with, from its first bytes; None if they are
+    not text (contain NULs). UTF-16 needs its BOM; 8-bit text that is not
+    UTF-8 is taken as cp1252, which also reads Latin-1.
+    """
+    if head.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return "utf-16"
+    if b"\x00" in head:
+        return None
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # a multi-byte character cut at the end of the sniff window is fine
+        if e.start < len(head) - 3:
+            return "cp1252"
+    return "utf-8-sig"
+
+def sniff_mime(head: bytes) -> Optional[str]:
+    """Best-effort content type from the first bytes of a file."""
+    if head.startswith(b"%PDF-"):
+        return "application/pdf"
+    if head.startswith(b"PK\x03\x04"):
+        # OOXML is a zip; the extension check decides whether we accept it as DOCX
+        return "application/zip"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    stripped = head.lstrip()
+    if stripped.startswith(b"<svg") or (stripped.startswith(b"<?xml") and b"<svg" in head):
+        return "image/svg+xml"
+    if text_encoding(head):
+        return "text/plain"
+    return None
+
+def _write_chunk(out: BinaryIO, hasher, chunk: bytes) -> None:
+    hasher.update(chunk)
+    out.write(chunk)
+
+def _discard(out: BinaryIO, dest: Path) -> None:
+    out.close()
+    try:
+        dest.unlink()
+    except FileNotFoundError:
+        pass
+
+async def save_upload(file: UploadFile, dest: Path, *, max_bytes: int) -> StoredUpload:
+    """
+    Stream file into dest; returns size, sha256 and sniffed MIME type.
+
+    Raises UploadTooLarge (dest removed) as soon as more than max_bytes were
+    read. Disk writes and hashing run in the threadpool so slow or large
+    uploads never block other requests on the event loop.
+    """
+    hasher = hashlib.sha256()
+    size = 0
+    mime: Optional[str] = None
+    await file.seek(0)
+    out = await run_in_threadpool(open, dest, "wb")
+    try:
+        while True:
+            chunk = await file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            if size == 0:
+                mime = sniff_mime(chunk[:512])
+            size += len(chunk)
+            if max_bytes and size > max_bytes:
+                raise UploadTooLarge(max_bytes)
+            await run_in_threadpool(_write_chunk, out, hasher, chunk)
+    except BaseException:
+        await run_in_threadpool(_discard, out, dest)
+        raise
+    await run_in_threadpool(out.close)
+    return StoredUpload(dest, size, hasher.hexdigest(), mime)
+
+def declared_size_exceeds(content_length: Optional[str], max_bytes: int, overhead: int = 64 * 1024) -> bool:
+    """True when a request's Content-Length already rules the upload out."""
+    if not max_bytes or not content_length:
+        return False
+    try:
+        return int(content_length) > max_bytes + overhead
+    except ValueError:
+        return False
+
+def remove_quietly(path: Path) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
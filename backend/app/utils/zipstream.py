@@ -0,0 +1,58 @@
+"""
+ZIP archives generated on the fly.
+
+zipfile can write to a non-seekable stream (sizes and CRCs go into data
+descriptors after each member), so the archive is produced chunk by chunk:
+memory stays at one read buffer whatever the total size, and nothing is
+written to disk.
+"""
+from __future__ import annotations
+
+import time
+import zipfile
+from typing import Iterable, Iterator, Tuple
+
+class _ChunkSink:
+    """Write-only file object that hands buffered bytes back on drain()."""
+
+    def __init__(self):
+        self._buf = bytearray()
+
+    def write(self, data) -> int:
+        self._buf += data
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        out = bytes(self._buf)
+        self._buf.clear()
+        return out
+
+# (name in archive, chunks, compress?)
+ZipMember = Tuple[str, Iterable[bytes], bool]
+
+def iter_zip(members: Iterable[ZipMember]) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive of members as it is built.
+
+    Members are consumed lazily, one at a time. Already-compressed content
+    (PDF, DOCX) should be stored with compress=False to save CPU.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", allowZip64=True) as zf:
+        for name, chunks, compress in members:
+            info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+            # sizes are unknown up front: always reserve zip64 fields
+            with zf.open(info, "w", force_zip64=True) as dst:
+                for chunk in chunks:
+                    dst.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            data = sink.drain()
+            if data:
+                yield data
+    yield sink.drain()  # central directory
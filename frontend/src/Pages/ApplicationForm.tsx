@@ -35,7 +35,7 @@ type ApplicationData = {
   cv_id?: number | null;
 };
 
-type CurrentCV = { id: number; file_path: string; uploaded_at: string } | null;
+type CurrentCV = { id: number; filename: string; uploaded_at: string } | null;
 
 async function uploadCv(file: File) {
   const fd = new FormData();
@@ -44,7 +44,7 @@ async function uploadCv(file: File) {
   try {
     // do NOT set Content-Type explicitly; axios will add the multipart boundary
     const { data } = await api.post("/cvs", fd);
-    return data; // expect { id, file_path, uploaded_at } per CVRead
+    return data; // expect { id, filename, uploaded_at } per CVRead
   } catch (err: any) {
     // bubble up server message if present, so you can see it in the UI
     const detail =
@@ -317,7 +317,7 @@ export default function ApplicationForm() {
                 <h4 style={{ margin: '0 0 12px 0', color: 'rgba(255,255,255,0.9)' }}>CV Upload</h4>
                 {currentCv ? (
                   <div style={{ color: '#1db954', fontWeight: '500', display: 'flex', alignItems: 'center', gap: '8px' }}>
-                    <Check size={16} /> CV uploaded: {currentCv.file_path.split("/").pop()}
+                    <Check size={16} /> CV uploaded: {currentCv.filename}
                   </div>
                 ) : (
                   <div style={{ color: '#ff6b6b', fontWeight: '500', display: 'flex', alignItems: 'center', gap: '8px' }}>
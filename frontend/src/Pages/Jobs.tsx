@@ -1,4 +1,4 @@
-import { useEffect, useMemo, useState } from "react";
+import { useEffect, useMemo, useRef, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import "./jobs.theme.css";
 import "../components/jobs/JobCardsGrid.css";
@@ -9,7 +9,7 @@ import type { Filters } from "../components/jobs/FilterBar";
 import "../components/jobs/FilterBar.css";
 import JobCardsGrid from "../components/jobs/JobCardsGrid";
 import { type JobCardProps } from "../components/jobs/JobCard";
-import { getJobs } from "../Services/jobsListApi";
+import { getJobFacets, getJobs, type JobFacets, type JobQuery } from "../Services/jobsListApi";
 import type { JobDetail } from "../Services/jobsApi";
 
 type User = {
@@ -19,13 +19,20 @@ type User = {
   company_name?: string | null;
 };
 
+// wait for a pause in typing before searching
+const SEARCH_DEBOUNCE_MS = 300;
+
 export default function Jobs(){
   const navigate = useNavigate();
   const [user, setUser] = useState<User | null>(null);
   const [query, setQuery] = useState("");
+  const [debouncedQuery, setDebouncedQuery] = useState("");
   const [filters, setFilters] = useState<Filters>({ type: [], gov: [], mode: [], specialty: [] });
   const [jobs, setJobs] = useState<JobDetail[]>([]);
   const [loading, setLoading] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [facets, setFacets] = useState<JobFacets | null>(null);
 
   useEffect(() => {
     try {
@@ -56,6 +63,7 @@ export default function Jobs(){
     title: j.title,
     company_name: j.company_name || null,
     company_logo_url: j.company_logo_url || null,
+    company_logo_variants: j.company_logo_variants || null,
     experience_min: j.experience_min || null,
     employment_type: j.employment_type || null,
     work_mode: j.work_mode || null,
@@ -70,35 +78,55 @@ export default function Jobs(){
   });
 
   useEffect(() => {
+    const timer = setTimeout(() => setDebouncedQuery(query.trim()), SEARCH_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [query]);
+
+  // filter bar groups -> server-side filters (specialty has no job field yet)
+  const jobQuery = useMemo<JobQuery>(() => ({
+    q: debouncedQuery || undefined,
+    employment_type: filters.type,
+    city: filters.gov,
+    work_mode: filters.mode,
+  }), [debouncedQuery, filters.type, filters.gov, filters.mode]);
+  // the query the list on screen belongs to, for responses that arrive late
+  const currentQuery = useRef(jobQuery);
+  currentQuery.current = jobQuery;
+
+  useEffect(() => {
+    let stale = false;
     (async () => {
       setLoading(true);
       try {
-        // server filtering later; for now grab page and filter client-side
-        const data = await getJobs();
-        setJobs(data);
-      } finally { setLoading(false); }
+        const [page, counts] = await Promise.all([getJobs(null, jobQuery), getJobFacets(jobQuery)]);
+        if (stale) return;
+        setJobs(page.items);
+        setNextCursor(page.nextCursor);
+        setFacets(counts);
+      } finally { if (!stale) setLoading(false); }
     })();
-  }, []);
+    return () => { stale = true; };
+  }, [jobQuery]);
+
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    const requested = jobQuery;
+    setLoadingMore(true);
+    try {
+      const page = await getJobs(nextCursor, requested);
+      // the search changed meanwhile: this page belongs to the old list
+      if (currentQuery.current !== requested) return;
+      setJobs(prev => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } finally { setLoadingMore(false); }
+  };
 
   const filtered = useMemo(() => {
-    const q = query.trim().toLowerCase();
     return jobs.filter(j => {
-      // search fields: title, company, skills, descriptions
-      const txt = [
-        j.title, j.company_name, (j.skills || []).join(" "),
-        j.offer_description, j.company_overview
-      ].filter(Boolean).join(" ").toLowerCase();
-      const qOk = !q || txt.includes(q);
-
-      // filters (AND within each category group)
-      const typeOk = !filters.type?.length || (j.employment_type && filters.type.includes(j.employment_type));
-      const modeOk = !filters.mode?.length || (j.work_mode && filters.mode.includes(j.work_mode));
-      const govOk  = !filters.gov?.length  || (j.location_city && filters.gov.includes(j.location_city) || (j as any).governorate && filters.gov!.includes((j as any).governorate));
       const specOk = !filters.specialty?.length || ((j as any).specialty && filters.specialty.includes((j as any).specialty));
-
-      return qOk && typeOk && modeOk && govOk && specOk;
+      return specOk;
     });
-  }, [jobs, query, filters]);
+  }, [jobs, filters.specialty]);
 
   const cards: JobCardProps[] = useMemo(
     () => filtered.map(toCard),
@@ -115,7 +143,12 @@ export default function Jobs(){
       <FilterBar
         value={filters}
         onChange={setFilters}
-        count={filtered.length}
+        count={facets && !filters.specialty.length ? facets.total : filtered.length}
+        counts={facets ? {
+          type: facets.facets.employment_type,
+          gov: facets.facets.city,
+          mode: facets.facets.work_mode,
+        } : undefined}
       />
 
       <div className="jobsPageContainer">
@@ -134,6 +167,13 @@ export default function Jobs(){
               <div style={{color:"var(--ink-500)"}}>Essayez d'effacer des filtres ou utilisez d'autres mots-clés.</div>
             </div>
           )}
+          {!loading && nextCursor && (
+            <div style={{padding:"16px", textAlign:"center"}}>
+              <button type="button" className="btn-primary" onClick={loadMore} disabled={loadingMore}>
+                {loadingMore ? "Chargement…" : "Voir plus d'offres"}
+              </button>
+            </div>
+          )}
         </div>
       </div>
     </div>
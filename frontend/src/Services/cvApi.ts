@@ -9,6 +9,6 @@ export async function uploadCV(file: File) {
   const fd = new FormData();
   fd.append("file", file);
   const { data } = await api.post("/cvs", fd);
-  return data as { id: number; file_path: string; uploaded_at: string };
+  return data as { id: number; filename: string; uploaded_at: string };
 }
 
@@ -1,10 +1,14 @@
 ﻿import api from "./apiClient";
 
+// size ("64" | "128" | "256") -> { webp, png | jpeg }
+export type ImageVariants = Record<string, Record<string, string>>;
+
 export type JobDetail = {
   id: number;
   title: string;
   company_name: string | null;
   company_logo_url: string | null;
+  company_logo_variants?: ImageVariants | null; // resized logo URLs by size
   banner_url?: string | null;
   location_city: string | null;
   location_country: string | null;
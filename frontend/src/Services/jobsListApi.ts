@@ -1,18 +1,65 @@
 ﻿import api from "./apiClient";
 import type { JobDetail } from "./jobsApi";
 
-export async function getJobs(): Promise<JobDetail[]> {
-  const res = await api.get<JobDetail[]>("/jobs"); // swap to paged route if needed
-  return res.data;
+export type JobsPage<T = JobDetail> = { items: T[]; nextCursor: string | null };
+
+type Params = Record<string, string | number | string[] | undefined>;
+// repeat list params (?city=a&city=b), which is what FastAPI expects
+const listParams = { paramsSerializer: { indexes: null } };
+
+// GET /jobs is keyset-paginated: the next page's cursor comes back in X-Next-Cursor
+export async function getJobsPage<T = JobDetail>(
+  params: Params = {},
+  cursor?: string | null,
+): Promise<JobsPage<T>> {
+  const res = await api.get<T[]>("/jobs", { params: cursor ? { ...params, cursor } : params, ...listParams });
+  return { items: res.data, nextCursor: res.headers["x-next-cursor"] || null };
+}
+
+// Server-side search and filters; several values of one filter are ORed, skills are ANDed
+export type JobQuery = {
+  q?: string;
+  city?: string[];
+  country?: string[];
+  work_mode?: string[];
+  employment_type?: string[];
+  education_level?: string[];
+  salary_min?: number;
+  salary_max?: number;
+  skills?: string[];
+};
+
+export type FacetValue = { value: string; count: number };
+export type JobFacets = {
+  total: number;
+  facets: Record<"city" | "country" | "work_mode" | "employment_type" | "education_level" | "skills", FacetValue[]>;
+};
+
+// view=summary: only the fields a job card shows, far smaller than the full job
+export async function getJobs(cursor?: string | null, query: JobQuery = {}): Promise<JobsPage> {
+  return getJobsPage({ ...query, view: "summary" }, cursor);
+}
+
+// Counts per filter value under the current query, in one request
+export async function getJobFacets(query: JobQuery = {}): Promise<JobFacets> {
+  const { data } = await api.get<JobFacets>("/jobs/facets", { params: query, ...listParams });
+  return data;
 }
 
 export type JobStatus = "published" | "draft" | "archived";
 
 export async function getCompanyJobs(status: JobStatus, owner: "me" | undefined = "me") {
-  const params: Record<string, string> = { status };
+  const params: Params = { status, limit: 100 };
   if (owner) params.owner = owner;
-  const { data } = await api.get("/jobs", { params });
-  return data as any[]; // Use your Job type if you have it
+  // the dashboard shows a company's whole catalogue: follow every page
+  const all: any[] = [];
+  let cursor: string | null = null;
+  do {
+    const page: JobsPage<any> = await getJobsPage<any>(params, cursor);
+    all.push(...page.items);
+    cursor = page.nextCursor;
+  } while (cursor);
+  return all; // Use your Job type if you have it
 }
 
 export async function patchJobStatus(jobId: number, status: JobStatus) {
@@ -1,6 +1,7 @@
 ﻿import { useState } from "react";
 import FilterModal from "./FilterModal";
 import JobCount from "./JobCount";
+import type { FacetValue } from "../../Services/jobsListApi";
 
 export type Filters = { type: string[]; gov: string[]; mode: string[]; specialty: string[] };
 const empty: Filters = { type:[], gov:[], mode:[], specialty:[] };
@@ -13,10 +14,23 @@ const PRESETS = {
 };
 
 export default function FilterBar({
-  value = empty, onChange, count
-}:{ value?: Filters; onChange:(f:Filters)=>void; count?: number }){
+  value = empty, onChange, count, counts
+}:{
+  value?: Filters;
+  onChange:(f:Filters)=>void;
+  count?: number;
+  // server facet counts per group; values not in the presets are offered too
+  counts?: Partial<Record<keyof Filters, FacetValue[]>>;
+}){
   const [open, setOpen] = useState<null | keyof Filters>(null);
 
+  const optionsFor = (k: keyof Filters) => {
+    const extra = (counts?.[k] || []).map(f => f.value).filter(v => !PRESETS[k].includes(v));
+    return [...PRESETS[k], ...extra];
+  };
+  const countsFor = (k: keyof Filters) =>
+    counts?.[k] && Object.fromEntries(counts[k]!.map(f => [f.value, f.count]));
+
   const btn = (k: keyof Filters, label: string) => {
     const count = value[k]?.length ?? 0;
     const active = count > 0;
@@ -45,7 +59,8 @@ export default function FilterBar({
             open==="gov" ? "Gouvernorat" :
             open==="mode" ? "Télétravail" : "Spécialités"
           }
-          options={PRESETS[open]}
+          options={optionsFor(open)}
+          counts={countsFor(open)}
           selected={value[open]}
           onClose={()=>setOpen(null)}
           onClear={()=>{ onChange({ ...value, [open]: [] }); setOpen(null); }}
@@ -2,10 +2,11 @@
 import "./FilterModal.css";
 
 export default function FilterModal({
-  title, options, selected, onApply, onClear, onClose
+  title, options, counts, selected, onApply, onClear, onClose
 }:{
   title: string;
   options: string[];
+  counts?: Record<string, number>;
   selected: string[];
   onApply:(sel:string[])=>void;
   onClear:()=>void;
@@ -41,6 +42,7 @@ export default function FilterModal({
             <label key={o} className="fm-row">
               <input type="checkbox" checked={sel.includes(o)} onChange={()=>toggle(o)} />
               <span>{o}</span>
+              {counts && <span className="fm-count">{counts[o] ?? 0}</span>}
             </label>
           ))}
         </div>
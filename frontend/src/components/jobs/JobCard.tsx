@@ -1,6 +1,7 @@
 ﻿import React, { useMemo, useState, useEffect } from "react";
 import { Link } from "react-router-dom";
 import { toAbsoluteMedia } from "../../Services/media";
+import type { ImageVariants } from "../../Services/jobsApi";
 import { Eye, Rocket } from "lucide-react";
 import "./JobCard.css";
 
@@ -16,6 +17,7 @@ export type JobCardProps = {
   title: string;
   company_name?: string | null;
   company_logo_url?: string | null;
+  company_logo_variants?: ImageVariants | null;
   experience_min?: string | null;
   employment_type?: string | null;
   work_mode?: string | null;
@@ -54,13 +56,17 @@ export default function JobCard(props: JobCardProps){
 
   const isCompany = !!(user?.account_type === "company" || user?.company_name);
   const {
-    id, title, company_name, company_logo_url,
+    id, title, company_name, company_logo_url, company_logo_variants,
     experience_min, employment_type, work_mode,
     salary_min, salary_max, salary_currency, salary_is_confidential,
     skills = [], posted_at, updated_at, has_applied, onApply, onView
   } = props;
 
   const logo = toAbsoluteMedia(company_logo_url || null);
+  // the card shows the logo at 60px: 64px copy for 1x screens, 128px for 2x
+  const small = company_logo_variants?.["64"];
+  const large = company_logo_variants?.["128"];
+  const fallbackFmt = small && Object.keys(small).find((f) => f !== "webp");
 
   const salary = useMemo(() => {
     if (salary_is_confidential) return "Confidentiel";
@@ -87,7 +93,21 @@ export default function JobCard(props: JobCardProps){
         {/* logo on the far left of header */}
         {logo && (
           <div className="jobCard__brand">
-            <img className="jobCard__brandImg" src={logo} alt="" aria-hidden="true" />
+            {small && large && fallbackFmt ? (
+              <picture>
+                <source type="image/webp" srcSet={`${toAbsoluteMedia(small.webp)} 1x, ${toAbsoluteMedia(large.webp)} 2x`} />
+                <img
+                  className="jobCard__brandImg"
+                  src={toAbsoluteMedia(small[fallbackFmt])}
+                  srcSet={`${toAbsoluteMedia(large[fallbackFmt])} 2x`}
+                  alt=""
+                  aria-hidden="true"
+                  loading="lazy"
+                />
+              </picture>
+            ) : (
+              <img className="jobCard__brandImg" src={logo} alt="" aria-hidden="true" />
+            )}
           </div>
         )}
         <div className="jobCard__left">
@@ -0,0 +1,128 @@
+"""
+Equivalence check + benchmark for backend/app/utils/cv_text.clean_extracted_text.
+
+Compares the compiled normalizer with the original four-pass implementation
+(kept below as the reference) on a set of tricky fixtures and on generated
+10 KB / 1 MB / 10 MB CV-like inputs, then times both.
+
+Usage (from the repo root):
+    python scripts/bench_clean_text.py
+"""
+import os, re, sys, time, random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+from app.utils.cv_text import clean_extracted_text  # noqa: E402
+
+# ---- reference: clean_extracted_text before the single-pass rewrite ----
+_SPACED_LETTERS_RE = re.compile(r"(?:\b[a-zA-Z]\s){4,}[a-zA-Z]\b")
+
+def _fix_spaced_letters(text):
+    out = []
+    i = 0
+    while i < len(text):
+        m = _SPACED_LETTERS_RE.search(text, i)
+        if not m:
+            out.append(text[i:])
+            break
+        out.append(text[i:m.start()])
+        out.append("".join(m.group(0).split()))
+        i = m.end()
+    return "".join(out)
+
+def reference_clean(text):
+    if not text:
+        return ""
+    text = " ".join(text.split())
+    text = re.sub(r'[^\w\s.,!?-]', ' ', text)
+    text = " ".join(text.split())
+    text = _fix_spaced_letters(text)
+    return text.strip()
+
+FIXTURES = [
+    "",
+    "   ",
+    "plain text",
+    "  leading and trailing  \n",
+    "R e a c t developer",
+    "S K I L L S : P y t h o n , D j a n g o",
+    "a b c d",                      # 4 letters: below the run threshold
+    "a b c d e f g h i j",
+    "x.a b c d e f",                # run starting after punctuation
+    "email: john.doe@example.com | +216 22 333 444",
+    "https://github.com/user/repo?tab=stars#top",
+    "tabs\tand\nnewlines\r\nand\x0bvertical\x0cfeeds",
+    "non breaking spaces and separators",
+    "Développeur Full-Stack — Tunis, Tunisie • 5 ans",
+    "C++ / C# / .NET / Node.js / React.js",
+    "bullets • ● ▪ and emoji \U0001F680\U0001F525",
+    "under_score and snake_case_words",
+    "combining é accents",
+    "\x00\x01control\x1fchars\x7f",
+    "J a v a S c r i p t and T y p e S c r i p t",
+    "1 2 3 4 5 digits are not letters",
+    "A B C D E1 mixed",
+    "!!! ??? ... --- ,,,",
+    "العربية و Français and English",
+]
+
+_WORDS = (
+    "Python React Django FastAPI PostgreSQL Docker Kubernetes AWS machine learning "
+    "développeur ingénieur stage Tunis Sfax équipe projet gestion C++ C# Node.js "
+    "john.doe@example.com +216-22-333-444 https://linkedin.com/in/someone 2019-2023"
+).split()
+_NOISE = ["  ", "\n", "\t", " | ", " • ", " — ", " ", " (", ") ", ": ", "; ", " / "]
+
+def make_cv_like(size_bytes, seed=0, artifacts=0.03):
+    rnd = random.Random(seed)
+    out, n = [], 0
+    while n < size_bytes:
+        r = rnd.random()
+        if r < artifacts:
+            piece = " ".join(rnd.choice(_WORDS)) + " "          # spaced-letter artifact
+        elif r < artifacts + 0.12:
+            piece = rnd.choice(_NOISE)
+        else:
+            piece = rnd.choice(_WORDS) + " "
+        out.append(piece)
+        n += len(piece)
+    return "".join(out)[:size_bytes]
+
+def _time(fn, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main():
+    failures = 0
+    for i, fx in enumerate(FIXTURES):
+        if clean_extracted_text(fx) != reference_clean(fx):
+            failures += 1
+            print(f"MISMATCH fixture #{i}: {fx!r}")
+            print(f"  new: {clean_extracted_text(fx)!r}")
+            print(f"  ref: {reference_clean(fx)!r}")
+    for seed in range(200):
+        fx = make_cv_like(2000, seed=seed)
+        if clean_extracted_text(fx) != reference_clean(fx):
+            failures += 1
+            print(f"MISMATCH generated seed={seed}")
+    print(f"equivalence: {len(FIXTURES) + 200} inputs, {failures} mismatches")
+
+    # "spaced": 3% letter-by-letter artifacts (worst case), "clean": none (typical CV)
+    for profile, artifacts in (("spaced", 0.03), ("clean", 0.0)):
+        for label, size, repeat in (("10KB", 10 * 1024, 50), ("1MB", 1024 * 1024, 5), ("10MB", 10 * 1024 * 1024, 2)):
+            text = make_cv_like(size, seed=42, artifacts=artifacts)
+            if clean_extracted_text(text) != reference_clean(text):
+                failures += 1
+                print(f"MISMATCH benchmark input {profile}/{label}")
+            t_ref = _time(reference_clean, text, repeat)
+            t_new = _time(clean_extracted_text, text, repeat)
+            print(f"{profile:>6} {label:>5}: reference {t_ref * 1000:9.2f} ms   "
+                  f"compiled {t_new * 1000:9.2f} ms   x{t_ref / t_new:.2f}")
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""
+Latency of GET /company/analytics/summary: _company_summary of
+backend/app/routers/company_analytics.py, one statement over the daily
+rollup (application_daily_stats), against the nine queries over
+applications it replaced (kept below as legacy_summary).
+
+Needs PostgreSQL (DATABASE_URL) migrated with `alembic upgrade head`. One
+company with --apps applications (plus a few other companies, so the owner
+filter has something to skip) is seeded inside a transaction, ANALYZEd,
+rolled up with reconcile(), measured and rolled back. Both implementations
+must return the same summary; a mismatch fails the run.
+
+Usage (from the repo root):
+    python scripts/bench_company_summary.py [--apps 50000] [--runs 20]
+"""
+import os, sys, time, random, argparse, datetime, statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from sqlalchemy import case, func, insert, select, text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from app import models  # noqa: E402
+from app.database import engine  # noqa: E402
+from app.core.application_stats import reconcile  # noqa: E402
+from app.routers.company_analytics import _company_summary  # noqa: E402
+
+A, J, U, C = models.Application, models.Job, models.User, models.CV
+
+def _next_id(conn, table):
+    return (conn.execute(select(func.coalesce(func.max(table.c.id), 0))).scalar() or 0) + 1
+
+def seed(conn, n_apps, rnd):
+    """One measured company with n_apps applications and three smaller ones; return its user id."""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    n_jobs, n_candidates = 120, max(1000, n_apps // 60)
+    uid = _next_id(conn, U.__table__)
+    companies = list(range(uid, uid + 4))
+    candidates = list(range(uid + 4, uid + 4 + n_candidates))
+    conn.execute(insert(U.__table__), [
+        {"id": i, "email": f"bench-summary-{i}@example.invalid", "hashed_password": "x", "account_type": kind}
+        for kind, ids in (("company", companies), ("candidate", candidates))
+        for i in ids
+    ])
+
+    jid = _next_id(conn, J.__table__)
+    owner_of = {jid + n: companies[0] if n < n_jobs else rnd.choice(companies[1:]) for n in range(n_jobs + 60)}
+    conn.execute(insert(J.__table__), [
+        {"id": job, "title": f"Job {job}", "owner_user_id": owner, "skills": [],
+         "status": rnd.choices(["published", "draft", "archived"], [8, 1, 1])[0]}
+        for job, owner in owner_of.items()
+    ])
+
+    cid = _next_id(conn, C.__table__)
+    conn.execute(insert(C.__table__), [
+        {"id": cid + n, "user_id": user, "file_path": f"uploads/cvs/{cid + n}.pdf"}
+        for n, user in enumerate(candidates)
+    ])
+
+    own = [j for j, o in owner_of.items() if o == companies[0]]
+    other = [j for j, o in owner_of.items() if o != companies[0]]
+    weights = [1.0 / (rank + 1) ** 0.5 for rank in range(len(own))]
+    pairs = set()
+    while len(pairs) < n_apps:
+        pairs.add((rnd.choice(candidates), rnd.choices(own, weights)[0]))
+    while len(pairs) < n_apps + n_apps // 5:
+        pairs.add((rnd.choice(candidates), rnd.choice(other)))
+    aid = _next_id(conn, A.__table__)
+    rows = [
+        {"id": aid + n, "user_id": user, "job_id": job, "cv_id": cid + user - candidates[0],
+         "status": rnd.choice(["pending", "accepted", "rejected", "interview"]),
+         "score": None if rnd.random() < 0.1 else round(rnd.uniform(0, 100), 2),
+         "applied_at": now - datetime.timedelta(minutes=rnd.randrange(90 * 24 * 60))}
+        for n, (user, job) in enumerate(pairs)
+    ]
+    for start in range(0, len(rows), 10000):
+        conn.execute(insert(A.__table__), rows[start:start + 10000])
+    for table in ("users", "jobs", "cvs", "applications"):
+        conn.execute(text(f"ANALYZE {table}"))
+    return companies[0]
+
+def legacy_summary(db, owner_id):
+    """The route before the single statement: one round trip per figure."""
+    def own(q):
+        return q.filter(J.owner_user_id == owner_id)
+    jobs_q = own(db.query(func.count(J.id)))
+    open_jobs_q = own(db.query(func.count(J.id)).filter(J.status == "published"))
+    apps_q = own(db.query(func.count(A.id)).select_from(A).join(J, J.id == A.job_id))
+    avg_q = own(db.query(func.avg(A.score)).select_from(A).join(J, J.id == A.job_id))
+    status_q = own(db.query(A.status, func.count(A.id)).select_from(A).join(J, J.id == A.job_id)).group_by(A.status)
+    recent_q = (
+        own(db.query(A.id, A.job_id, J.title.label("job_title"), A.applied_at, A.score, A.status)
+            .join(J, J.id == A.job_id))
+        .order_by(A.applied_at.desc().nullslast())
+        .limit(5)
+    )
+    top_q = (
+        own(db.query(A.job_id, J.title, func.count(A.id).label("apps")).join(J, J.id == A.job_id))
+        .group_by(A.job_id, J.title)
+        .order_by(func.count(A.id).desc())
+        .limit(5)
+    )
+    bin_expr = case((A.score < 20, 0), (A.score < 40, 20), (A.score < 60, 40), (A.score < 80, 60), else_=80).label("bin")
+    hist_q = (
+        own(db.query(bin_expr, func.count(A.id)).select_from(A).join(J, J.id == A.job_id))
+        .filter(A.score.isnot(None)).group_by("bin")
+    )
+
+    avg_score = avg_q.scalar()
+    trend = db.execute(text("""
+        WITH series AS (
+          SELECT (generate_series(current_date - interval '29 days', current_date, interval '1 day'))::date AS d
+        )
+        SELECT s.d::text AS date, COALESCE(COUNT(a.id), 0) AS applications
+        FROM series s
+        LEFT JOIN applications a
+          ON date_trunc('day', a.applied_at) = s.d
+        JOIN jobs j ON j.id = a.job_id AND j.owner_user_id = :owner_id
+        GROUP BY s.d
+        ORDER BY s.d
+    """), {"owner_id": owner_id}).mappings().all()
+    counts = {b: 0 for b in (0, 20, 40, 60, 80)}
+    for b, c in hist_q.all():
+        counts[int(b)] = int(c)
+    return {
+        "jobs": int(jobs_q.scalar() or 0),
+        "open_jobs": int(open_jobs_q.scalar() or 0),
+        "applications": int(apps_q.scalar() or 0),
+        "by_status": {k or "unknown": int(v) for k, v in status_q.all()},
+        "avg_score": float(avg_score) if avg_score is not None else None,
+        "recent_applications": [
+            dict(id=r.id, job_id=r.job_id, job_title=r.job_title, applied_at=r.applied_at, score=r.score, status=r.status)
+            for r in recent_q.all()
+        ],
+        "top_jobs_by_apps": [{"job_id": r.job_id, "title": r.title, "applications": int(r.apps)} for r in top_q.all()],
+        "trend_30d": [{"date": r["date"], "applications": int(r["applications"])} for r in trend],
+        "score_histogram": {"bins": [0, 20, 40, 60, 80, 100], "counts": list(counts.values()) + [0]},
+    }
+
+def _comparable(summary):
+    """Drop what the two versions may legitimately order or round differently."""
+    out = dict(summary)
+    out["avg_score"] = round(out["avg_score"], 6) if out["avg_score"] is not None else None
+    # the legacy top-5 breaks ties arbitrarily: compare the counts only
+    out["top_jobs_by_apps"] = [t["applications"] for t in out["top_jobs_by_apps"]]
+    # its trend inner-joins the series away on empty days; the new one zero-fills them
+    out["trend_30d"] = {t["date"]: t["applications"] for t in out["trend_30d"] if t["applications"]}
+    return out
+
+def _time(fn, runs):
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples), max(samples)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--apps", type=int, default=50000, help="applications of the measured company")
+    ap.add_argument("--runs", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+    if engine.dialect.name != "postgresql":
+        print(f"needs PostgreSQL, DATABASE_URL points to {engine.dialect.name}")
+        return 2
+
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            # the legacy trend uses current_date, the new one UTC days
+            conn.execute(text("SET LOCAL TIME ZONE 'UTC'"))
+            t0 = time.perf_counter()
+            owner = seed(conn, args.apps, random.Random(args.seed))
+            print(f"seeded {args.apps} applications in {time.perf_counter() - t0:.1f}s")
+            db = Session(bind=conn)
+            # the seed bypasses the ORM hooks that maintain the rollup
+            t0 = time.perf_counter()
+            reconcile(db)
+            conn.execute(text("ANALYZE application_daily_stats"))
+            print(f"rollup rebuilt in {time.perf_counter() - t0:.1f}s")
+            old, new = legacy_summary(db, owner), _company_summary(db, owner)
+            if _comparable(old) != _comparable(new):
+                for key in old:
+                    if _comparable(old)[key] != _comparable(new)[key]:
+                        print(f"MISMATCH {key}: {old[key]!r} != {new[key]!r}")
+                return 1
+            for label, fn in (("9 queries", lambda: legacy_summary(db, owner)),
+                              ("daily rollup", lambda: _company_summary(db, owner))):
+                median, worst = _time(fn, args.runs)
+                print(f"{label:>16}  median {median:8.1f} ms   max {worst:8.1f} ms")
+        finally:
+            trans.rollback()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Benchmark streaming DOCX extraction against python-docx on table-heavy resumes.
+
+Generates DOCX files with many tables, then extracts each one with both
+readers in a fresh subprocess and reports wall time and peak RSS growth
+(python-docx allocates through lxml, which tracemalloc cannot see).
+
+Usage (from the repo root):
+    python scripts/bench_docx_extract.py [--tables 50 200 800]
+"""
+import os, sys, json, time, argparse, tempfile, subprocess
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+sys.path.insert(0, BACKEND)
+
+_CHILD = r"""
+import sys, time, json, resource
+sys.path.insert(0, sys.argv[3])
+from app.utils import cv_text
+fn = {"streaming": cv_text._iter_docx_blocks_streaming,
+      "python-docx": cv_text._iter_docx_blocks_python_docx}[sys.argv[1]]
+base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+t0 = time.perf_counter()
+blocks = list(fn(sys.argv[2]))
+dt = time.perf_counter() - t0
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"sec": dt, "rss_kb": peak - base, "blocks": len(blocks), "chars": sum(map(len, blocks))}))
+"""
+
+def make_resume(path, tables, rows=12, cols=4):
+    from docx import Document
+    doc = Document()
+    doc.add_heading("Jane Doe - Senior Software Engineer", 0)
+    for t in range(tables):
+        doc.add_paragraph(f"Experience block {t}: React, Python, FastAPI, PostgreSQL, Docker.")
+        table = doc.add_table(rows=rows, cols=cols)
+        for r in range(rows):
+            for c in range(cols):
+                table.cell(r, c).text = f"Project {t}.{r}.{c} - built services with Kubernetes and AWS"
+    doc.save(path)
+
+def run(method, path):
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, method, path, BACKEND],
+        check=True, capture_output=True, text=True,
+    ).stdout.strip().splitlines()[-1]
+    return json.loads(out)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tables", type=int, nargs="+", default=[50, 200, 800])
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.tables:
+            path = os.path.join(tmp, f"resume_{n}.docx")
+            make_resume(path, n)
+            size_kb = os.path.getsize(path) // 1024
+            res = {m: run(m, path) for m in ("python-docx", "streaming")}
+            a, b = res["python-docx"], res["streaming"]
+            print(
+                f"{n:>4} tables ({size_kb} KB): "
+                f"python-docx {a['sec'] * 1000:8.1f} ms {a['rss_kb'] / 1024:7.1f} MB | "
+                f"streaming {b['sec'] * 1000:8.1f} ms {b['rss_kb'] / 1024:7.1f} MB | "
+                f"x{a['sec'] / b['sec']:.1f} faster, chars {a['chars']} vs {b['chars']}"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark every installed CV extractor backend over a sample corpus.
+
+For each file and each backend of its format this records wall time and a few
+text-quality signals, then prints a per-backend summary and optionally writes
+the raw results as JSON. Use it to pick CV_EXTRACTOR_PDF / CV_EXTRACTOR_DOCX.
+
+Quality metrics (higher is better unless noted):
+  words       whitespace tokens after clean_extracted_text
+  alpha       share of tokens that are alphabetic words of 2+ letters
+  spaced      letter-by-letter artifacts ("R e a c t") in the raw text (lower is better)
+  agreement   token-set Jaccard similarity with the reference backend's output
+
+Usage (from the repo root):
+    python scripts/bench_extractors.py path/to/cv_corpus [--out results.json] [--repeat 3]
+"""
+import os, re, sys, json, time, argparse, statistics
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+from app.utils import cv_text  # noqa: E402
+
+REFERENCE = {"pdf": "pypdf", "docx": "python-docx", "txt": "plain"}
+_RAW_SPACED_RE = re.compile(r"(?:\b[a-zA-Z]\s){4,}[a-zA-Z]\b")
+_ALPHA_RE = re.compile(r"^[^\W\d_]{2,}$")
+
+def _extract(backend, path):
+    # whole document, no page cap or time budget: we are measuring the engine
+    if backend.open_document is not None:
+        return "\n".join(cv_text._iter_pdf_pages(path, max_pages=0, timeout=0, open_document=backend.open_document))
+    return "\n".join(backend.iter_blocks(path))
+
+def _metrics(raw):
+    tokens = cv_text.clean_extracted_text(raw).split()
+    return {
+        "chars": len(raw),
+        "words": len(tokens),
+        "alpha": round(sum(1 for t in tokens if _ALPHA_RE.match(t)) / len(tokens), 4) if tokens else 0.0,
+        "spaced": len(_RAW_SPACED_RE.findall(raw)),
+        "_tokens": {t.lower() for t in tokens},
+    }
+
+def _jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return round(len(a & b) / len(a | b), 4)
+
+def _corpus(root):
+    for dirpath, _, files in os.walk(root):
+        for name in sorted(files):
+            ext = os.path.splitext(name)[1].lower().lstrip(".")
+            if ext in REFERENCE:
+                yield ext, os.path.join(dirpath, name)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("corpus", help="directory of sample CVs (PDF/DOCX/TXT)")
+    ap.add_argument("--out", help="write per-file results to this JSON file")
+    ap.add_argument("--repeat", type=int, default=3, help="timing runs per file/backend (best is kept)")
+    args = ap.parse_args()
+
+    rows = []
+    for fmt, path in _corpus(args.corpus):
+        per_backend = {}
+        for backend in cv_text.available_backends(fmt):
+            best, raw, error = float("inf"), "", None
+            for _ in range(max(1, args.repeat)):
+                t0 = time.perf_counter()
+                try:
+                    raw = _extract(backend, path)
+                except Exception as e:  # a backend failing on a file is a result, not a crash
+                    error = f"{e.__class__.__name__}: {e}"
+                    break
+                best = min(best, time.perf_counter() - t0)
+            per_backend[backend.name] = (backend, best, raw, error)
+
+        ref = per_backend.get(REFERENCE[fmt])
+        ref_tokens = _metrics(ref[2])["_tokens"] if ref and not ref[3] else None
+        for name, (backend, best, raw, error) in per_backend.items():
+            row = {"file": os.path.relpath(path, args.corpus), "format": fmt,
+                   "backend": name, "version": backend.version, "error": error}
+            if not error:
+                m = _metrics(raw)
+                tokens = m.pop("_tokens")
+                row.update(m, ms=round(best * 1000, 2))
+                row["agreement"] = _jaccard(tokens, ref_tokens) if ref_tokens is not None else None
+            rows.append(row)
+
+    if not rows:
+        print("no PDF/DOCX/TXT files found")
+        return 1
+
+    groups = defaultdict(list)
+    for r in rows:
+        groups[(r["format"], r["backend"], r["version"])].append(r)
+    print(f"{'format':<6} {'backend':<12} {'version':<10} {'files':>5} {'errors':>6} "
+          f"{'median ms':>10} {'p95 ms':>8} {'words':>7} {'alpha':>6} {'spaced':>6} {'agree':>6}")
+    for (fmt, name, version), rs in sorted(groups.items()):
+        ok = [r for r in rs if not r["error"]]
+        times = sorted(r["ms"] for r in ok)
+        p95 = times[min(len(times) - 1, int(len(times) * 0.95))] if times else float("nan")
+        agree = [r["agreement"] for r in ok if r["agreement"] is not None]
+        print(
+            f"{fmt:<6} {name:<12} {version:<10} {len(rs):>5} {len(rs) - len(ok):>6} "
+            f"{statistics.median(times) if times else float('nan'):>10.2f} {p95:>8.2f} "
+            f"{statistics.mean(r['words'] for r in ok) if ok else 0:>7.0f} "
+            f"{statistics.mean(r['alpha'] for r in ok) if ok else 0:>6.3f} "
+            f"{sum(r['spaced'] for r in ok):>6} "
+            f"{statistics.mean(agree) if agree else float('nan'):>6.3f}"
+        )
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        print(f"wrote {len(rows)} results to {args.out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
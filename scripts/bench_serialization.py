@@ -0,0 +1,125 @@
+"""
+Per-item cost of rendering list responses: FastAPI's response_model path
+against the single-pass path in backend/app/core/serialization.py.
+
+- response_model: what GET /jobs did before, JobOut.from_orm(job).dict() per
+  row, then FastAPI validates the list against List[JobOut], dumps it again
+  and json.dumps the result.
+- adapter + orjson: one TypeAdapter validation over the ORM objects, one
+  dump to JSON-compatible values (kept for the response cache) and orjson.
+- adapter dump_json: validation plus pydantic-core's own JSON writer, used
+  when no Python copy of the payload is needed (GET /applications/me).
+
+Job and application rows are built in memory, no database is needed. Every
+path must produce the same JSON document; a mismatch fails the run.
+
+Usage (from the repo root):
+    python scripts/bench_serialization.py [--items 20 100 1000]
+"""
+import os, sys, json, time, argparse, datetime, warnings
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+os.environ.setdefault("DATABASE_URL", "sqlite://")  # app.models connects on import
+
+from starlette.responses import JSONResponse  # noqa: E402
+from app import models, schemas  # noqa: E402
+from app.core import serialization  # noqa: E402
+from app.core.serialization import dump_list, dumps, list_adapter  # noqa: E402
+
+_T0 = datetime.datetime(2026, 1, 1, 12, 0, tzinfo=datetime.timezone.utc)
+_TEXT = "Nous recherchons un développeur pour rejoindre une équipe produit. " * 6
+
+def make_jobs(n):
+    owner = models.User(id=1, email="co@example.com", company_logo_url=None)
+    return [
+        models.Job(
+            id=i, title=f"Développeur Python {i}", company_name="Acme", owner=owner, owner_user_id=1,
+            location_city="Tunis", location_country="Tunisie", employment_type="CDI", work_mode="Hybride",
+            salary_min=1800, salary_max=2600, salary_currency="TND", salary_is_confidential=False,
+            education_level="Bac+5", company_overview=_TEXT, offer_description=_TEXT,
+            profile_requirements=_TEXT, missions=["Concevoir des API", "Revue de code", "Mentorat"],
+            skills=["python", "fastapi", "postgresql", "docker", "react"], status="published",
+            deadline=datetime.date(2026, 6, 30), posted_at=_T0 + datetime.timedelta(minutes=i),
+            created_at=_T0, updated_at=_T0,
+        )
+        for i in range(n)
+    ]
+
+def make_applications(n):
+    return [
+        SimpleNamespace(id=i, job_id=i % 50, job_title=f"Développeur Python {i % 50}", status="pending",
+                        score=50 + i % 40 + 0.25, applied_at=_T0 + datetime.timedelta(minutes=i))
+        for i in range(n)
+    ]
+
+_JOB_LIST = list_adapter(schemas.JobOut)
+_APP_LIST = list_adapter(schemas.MyApplicationRead)
+
+def _response_model(adapter, items):
+    """FastAPI serialize_response (its field adapter is built once too), then JSONResponse."""
+    validated = adapter.validate_python(items)
+    return JSONResponse(content=None).render(adapter.dump_python(validated, mode="json"))
+
+def jobs_response_model(jobs):
+    return _response_model(_JOB_LIST, [schemas.JobOut.from_orm(j).dict() for j in jobs])
+
+def jobs_adapter_orjson(jobs):
+    return dumps(dump_list(_JOB_LIST, jobs))
+
+def jobs_dump_json(jobs):
+    return _JOB_LIST.dump_json(_JOB_LIST.validate_python(jobs, from_attributes=True))
+
+def apps_response_model(rows):
+    dicts = [{k: getattr(r, k) for k in schemas.MyApplicationRead.model_fields} for r in rows]
+    return _response_model(_APP_LIST, dicts)
+
+def apps_adapter_orjson(rows):
+    return dumps(dump_list(_APP_LIST, rows))
+
+def apps_dump_json(rows):
+    return _APP_LIST.dump_json(_APP_LIST.validate_python(rows, from_attributes=True))
+
+def _time(fn, items, budget=0.5):
+    best, spent = float("inf"), 0.0
+    while spent < budget or best == float("inf"):
+        t0 = time.perf_counter()
+        fn(items)
+        dt = time.perf_counter() - t0
+        best, spent = min(best, dt), spent + dt
+    return best
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, nargs="+", default=[20, 100, 1000])
+    args = ap.parse_args()
+    warnings.simplefilter("ignore", DeprecationWarning)  # from_orm/.dict() as the old route called them
+    print(f"orjson: {'yes' if serialization.orjson is not None else 'not installed, stdlib json'}")
+
+    failures = 0
+    suites = (
+        ("jobs", make_jobs, (("response_model", jobs_response_model), ("adapter + orjson", jobs_adapter_orjson),
+                             ("adapter dump_json", jobs_dump_json))),
+        ("applications", make_applications, (("response_model", apps_response_model),
+                                             ("adapter + orjson", apps_adapter_orjson),
+                                             ("adapter dump_json", apps_dump_json))),
+    )
+    for name, make, paths in suites:
+        for n in args.items:
+            items = make(n)
+            expected = json.loads(paths[0][1](items))
+            line = []
+            base = None
+            for label, fn in paths:
+                if json.loads(fn(items)) != expected:
+                    failures += 1
+                    print(f"MISMATCH {name} n={n}: {label}")
+                per_item = _time(fn, items) / n * 1e6
+                base = base or per_item
+                line.append(f"{label} {per_item:7.2f} us (x{base / per_item:.1f})")
+            print(f"{name:>12} n={n:<5} " + "   ".join(line))
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
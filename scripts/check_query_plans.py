@@ -0,0 +1,200 @@
+"""
+EXPLAIN the hot queries of the routers on a seeded dataset and fail when one
+of them falls back to a sequential scan of the table its index should serve.
+
+Needs PostgreSQL (DATABASE_URL) migrated with `alembic upgrade head`. Rows
+are seeded inside a transaction, ANALYZEd, explained and rolled back, so the
+database is left as it was; still, point it at a scratch or staging database
+since the seed holds locks until the rollback. The queries mirror the ones
+built in routers/applications.py, routers/company_analytics.py,
+routers/jobs.py and routers/cvs.py, and the range rebuilt by
+core/application_stats.reconcile().
+
+Usage (from the repo root):
+    python scripts/check_query_plans.py [--scale 1.0] [--verbose]
+"""
+import os, sys, json, random, argparse, datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from sqlalchemy import func, insert, select, text  # noqa: E402
+from sqlalchemy.ext.compiler import compiles  # noqa: E402
+from sqlalchemy.sql.expression import ClauseElement, Executable  # noqa: E402
+from app import models  # noqa: E402
+from app.database import engine  # noqa: E402
+
+A, J, U, C = models.Application, models.Job, models.User, models.CV
+_NOW = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+_SKILLS = [f"skill-{n}" for n in range(200)]
+
+def _next_id(conn, table):
+    return (conn.execute(select(func.coalesce(func.max(table.c.id), 0))).scalar() or 0) + 1
+
+def seed(conn, scale, rnd):
+    """Insert companies, candidates, jobs, CVs and applications; return the hot ids."""
+    n_companies, n_candidates = int(40 * scale) or 1, int(4000 * scale) or 1
+    n_jobs, n_apps = int(2000 * scale) or 1, int(30000 * scale) or 1
+
+    uid = _next_id(conn, U.__table__)
+    companies = list(range(uid, uid + n_companies))
+    candidates = list(range(uid + n_companies, uid + n_companies + n_candidates))
+    conn.execute(insert(U.__table__), [
+        {"id": i, "email": f"plan-check-{i}@example.invalid", "hashed_password": "x", "account_type": kind}
+        for kind, ids in (("company", companies), ("candidate", candidates))
+        for i in ids
+    ])
+
+    jid = _next_id(conn, J.__table__)
+    jobs = list(range(jid, jid + n_jobs))
+    conn.execute(insert(J.__table__), [
+        {"id": i, "title": f"Job {i}", "owner_user_id": rnd.choice(companies), "skills": skills, "skills_canon": skills,
+         "status": rnd.choices(["published", "draft", "archived"], [8, 1, 1])[0],
+         "posted_at": None if rnd.random() < 0.05 else _NOW - datetime.timedelta(hours=rnd.randrange(20000)),
+         "created_at": _NOW - datetime.timedelta(hours=rnd.randrange(20000))}
+        for i, skills in zip(jobs, (rnd.sample(_SKILLS, 5) for _ in jobs))
+    ])
+
+    cid = _next_id(conn, C.__table__)
+    cv_of = {}
+    cv_rows = []
+    for user in candidates:
+        for _ in range(rnd.randint(1, 3)):
+            cv_rows.append({"id": cid, "user_id": user, "file_path": f"uploads/cvs/{cid}.pdf",
+                            "uploaded_at": _NOW - datetime.timedelta(hours=rnd.randrange(20000))})
+            cv_of[user] = cid
+            cid += 1
+    conn.execute(insert(C.__table__), cv_rows)
+
+    # a few popular jobs get most applications, as in production
+    weights = [1.0 / (rank + 1) for rank in range(n_jobs)]
+    pairs = set()
+    while len(pairs) < min(n_apps, n_jobs * n_candidates // 2):
+        pairs.add((rnd.choice(candidates), rnd.choices(jobs, weights)[0]))
+    aid = _next_id(conn, A.__table__)
+    conn.execute(insert(A.__table__), [
+        {"id": aid + n, "user_id": user, "job_id": job, "cv_id": cv_of[user],
+         "status": rnd.choice(["pending", "accepted", "rejected"]),
+         "score": None if rnd.random() < 0.1 else round(rnd.uniform(0, 100), 2),
+         "applied_at": _NOW - datetime.timedelta(minutes=rnd.randrange(500000))}
+        for n, (user, job) in enumerate(pairs)
+    ])
+    for table in ("users", "jobs", "cvs", "applications"):
+        conn.execute(text(f"ANALYZE {table}"))
+    # autovacuum would have merged fresh GIN entries by now; the planner charges for pending ones
+    gin = conn.execute(text(
+        "SELECT indexname FROM pg_indexes WHERE tablename = 'jobs' AND indexdef LIKE '%USING gin%'"
+    )).scalars().all()
+    for index in gin:
+        conn.execute(text("SELECT gin_clean_pending_list(CAST(:index AS regclass))"), {"index": index})
+
+    def busiest(counts):
+        return max(counts, key=counts.get)
+    per_job, per_user, per_owner = {}, {}, {}
+    for user, job in pairs:
+        per_job[job] = per_job.get(job, 0) + 1
+        per_user[user] = per_user.get(user, 0) + 1
+    owners = dict(conn.execute(select(J.id, J.owner_user_id).where(J.id.in_(jobs))).all())
+    for owner in owners.values():
+        per_owner[owner] = per_owner.get(owner, 0) + 1
+    return {
+        "job": busiest(per_job),
+        "candidate": busiest(per_user),
+        "owner": busiest(per_owner),
+        "page": rnd.sample(jobs, min(20, len(jobs))),
+    }
+
+def hot_queries(p):
+    """(name, table that must not be seq-scanned, statement)."""
+    applicants = (
+        select(A.id, A.job_id, A.status, A.score, A.applied_at, A.cv_id,
+               J.title.label("job_title"), U.email.label("candidate_email"))
+        .join(J, J.id == A.job_id)
+        .join(U, U.id == A.user_id)
+        .where(A.job_id == p["job"])
+    )
+    return [
+        ("applicants by score", "applications", applicants.order_by(A.score.desc(), A.applied_at.desc())),
+        ("applicants newest first", "applications", applicants.order_by(A.applied_at.desc())),
+        ("applicants oldest first", "applications", applicants.order_by(A.applied_at.asc())),
+        ("my applications", "applications",
+         select(A.id, A.job_id, A.status, A.score, A.applied_at, J.title.label("job_title"))
+         .join(J, J.id == A.job_id)
+         .where(A.user_id == p["candidate"])
+         .order_by(A.applied_at.desc())),
+        ("has_applied of a job page", "applications",
+         select(A.job_id).where(A.user_id == p["candidate"], A.job_id.in_(p["page"]))),
+        ("published jobs page", "jobs",
+         select(J.id, J.title, J.posted_at)
+         .where(J.status == "published")
+         .order_by(J.posted_at.desc().nulls_last(), J.created_at.desc(), J.id.desc())
+         .limit(21)),
+        ("published jobs with a skill", "jobs",
+         select(J.id).where(J.status == "published", J.skills_canon.contains([_SKILLS[0]]))),
+        ("company jobs", "jobs",
+         select(J.id, J.title, J.status, J.deadline, func.count(A.id).label("apps"))
+         .outerjoin(A, A.job_id == J.id)
+         .where(J.owner_user_id == p["owner"])
+         .group_by(J.id, J.title, J.status, J.deadline)
+         .order_by(J.posted_at.desc())),
+        ("applications of recent days", "applications",
+         select(A.job_id, A.status, A.score)
+         .where(A.applied_at >= _NOW - datetime.timedelta(days=3), A.applied_at < _NOW)),
+        ("latest CV", "cvs",
+         select(C.id).where(C.user_id == p["candidate"]).order_by(C.uploaded_at.desc()).limit(1)),
+    ]
+
+def _nodes(plan):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _nodes(child)
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN of a statement, executed with its bound parameters (JSONB ones included)."""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+def explain(conn, stmt):
+    (doc,) = conn.execute(Explain(stmt)).scalar()
+    return doc["Plan"]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--scale", type=float, default=1.0, help="multiplier on the seeded row counts")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--verbose", action="store_true", help="print every plan")
+    args = ap.parse_args()
+    if engine.dialect.name != "postgresql":
+        print(f"needs PostgreSQL, DATABASE_URL points to {engine.dialect.name}")
+        return 2
+
+    failures = 0
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            params = seed(conn, args.scale, random.Random(args.seed))
+            # Bitmap Index Scan nodes name the index but not its table
+            index_table = dict(conn.execute(text("SELECT indexname, tablename FROM pg_indexes")).all())
+            for name, table, stmt in hot_queries(params):
+                plan = explain(conn, stmt)
+                nodes = list(_nodes(plan))
+                seq = [n for n in nodes if n["Node Type"] == "Seq Scan" and n.get("Relation Name") == table]
+                used = sorted({n["Index Name"] for n in nodes if index_table.get(n.get("Index Name")) == table})
+                status = "SEQ SCAN" if seq else "ok"
+                failures += bool(seq)
+                print(f"{status:>8}  {name:<28} {table:<13} {', '.join(used) or '-'}")
+                if args.verbose or seq:
+                    print(json.dumps(plan, indent=2))
+        finally:
+            trans.rollback()
+
+    print(f"{failures} regression(s)")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""
+Exercise the S3 storage backend end to end against moto's in-process S3
+server (ThreadedMotoServer): uploads and their deduplication, the public
+and private namespaces, presigned downloads, resized image copies and the
+removal of unreferenced blobs, including a release racing a new upload.
+
+Runs on a scratch SQLite database and bucket in a temp directory; nothing
+outside it is touched. Needs boto3 and moto[server]; the derivative checks
+are skipped without Pillow.
+
+Usage (from the repo root):
+    python scripts/check_storage_s3.py
+"""
+import os, sys, io, shutil, asyncio, logging, tempfile
+from urllib.request import urlopen
+
+WORKDIR = tempfile.mkdtemp(prefix="check-storage-s3-")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{WORKDIR}/check.db",
+    STORAGE_BACKEND="s3", S3_BUCKET="check-storage", S3_KEY_PREFIX="app", S3_REGION="us-east-1",
+    S3_ACCESS_KEY_ID="check", S3_SECRET_ACCESS_KEY="check",
+)
+for name, value in (("SECRET_KEY", "check"), ("ALGORITHM", "HS256"), ("ACCESS_TOKEN_EXPIRE_MINUTES", "30")):
+    os.environ.setdefault(name, value)
+
+from moto.server import ThreadedMotoServer  # noqa: E402
+
+logging.getLogger("werkzeug").setLevel(logging.ERROR)  # the server's request log
+SERVER = ThreadedMotoServer(port=0, verbose=False)
+SERVER.start()
+os.environ["S3_ENDPOINT_URL"] = "http://%s:%d" % SERVER.get_host_and_port()
+os.chdir(WORKDIR)  # uploads/.blob_tmp staging files land here
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from sqlalchemy import MetaData, text  # noqa: E402
+from starlette.datastructures import UploadFile  # noqa: E402
+from app import models  # noqa: E402
+from app.core.blob_store import IMAGE_EXTENSIONS, PRIVATE, PUBLIC, BlobRejected, blob_store  # noqa: E402
+from app.core.static import IMMUTABLE, PRIVATE_NO_CACHE  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app.utils.images import DERIVATIVE_SIZES  # noqa: E402
+
+try:
+    from PIL import Image
+except ImportError:  # optional dependency
+    Image = None
+
+storage = blob_store.storage
+failures = 0
+
+def check(label, ok, detail=""):
+    global failures
+    failures += not ok
+    print(f"{'ok' if ok else 'FAIL':>6}  {label}{'' if ok or not detail else f': {detail}'}")
+
+def create_schema():
+    # only the blobs table; its now() default has no SQLite equivalent
+    table = models.Blob.__table__.to_metadata(MetaData())
+    table.c.created_at.server_default.arg = text("CURRENT_TIMESTAMP")
+    table.create(engine)
+    storage.client.create_bucket(Bucket=storage.bucket)
+
+def upload(db, data, filename, namespace=PUBLIC):
+    file = UploadFile(io.BytesIO(data), filename=filename)
+    types = IMAGE_EXTENSIONS if namespace == PUBLIC else {"application/pdf": ".pdf"}
+    blob = asyncio.run(blob_store.put_upload(
+        db, file, types=types, max_bytes=10 * 1024 * 1024, namespace=namespace,
+    ))
+    db.commit()
+    return blob
+
+def head(key):
+    return storage.client.head_object(Bucket=storage.bucket, Key=storage._k(key))
+
+def keys(prefix=""):
+    pages = storage.client.get_paginator("list_objects_v2").paginate(Bucket=storage.bucket, Prefix=storage._k(prefix))
+    return sorted(o["Key"][len(storage.prefix):] for page in pages for o in page.get("Contents", []))
+
+def png_bytes():
+    if Image is None:
+        return b"\x89PNG\r\n\x1a\n" + b"\0" * 64
+    buf = io.BytesIO()
+    Image.new("RGB", (600, 400), (30, 120, 200)).save(buf, "PNG")
+    return buf.getvalue()
+
+def run():
+    db = SessionLocal()
+    try:
+        image, pdf = png_bytes(), b"%PDF-1.4\n" + os.urandom(4096)
+
+        # uploads and deduplication
+        logo = upload(db, image, "logo.png")
+        again = upload(db, image, "avatar.html")
+        logo_sha, logo_key = logo.sha256, blob_store.key(logo.sha256, logo.ext, PUBLIC)
+        check("same bytes share one blob", again.sha256 == logo.sha256 and again.ref_count == 2, again.ref_count)
+        check("extension comes from the bytes", logo.ext == ".png", logo.ext)
+        try:
+            upload(db, b"<html><script>alert(1)</script></html>", "photo.png")
+            check("non-image content rejected", False)
+        except BlobRejected:
+            db.rollback()
+            check("non-image content rejected", True)
+        check("one object per content", keys(PUBLIC) == [logo_key], keys(PUBLIC))
+        meta = head(logo_key)
+        check("public object is immutable", meta.get("CacheControl") == IMMUTABLE, meta.get("CacheControl"))
+        check("content type from the bytes", meta.get("ContentType") == "image/png", meta.get("ContentType"))
+
+        cv = upload(db, pdf, "resume.pdf", namespace=PRIVATE)
+        cv_sha, cv_key = cv.sha256, blob_store.key(cv.sha256, cv.ext, PRIVATE)
+        check("CV stored in the private namespace", keys(PRIVATE) == [cv_key], keys(PRIVATE))
+        check("CV is not under the public prefix", cv_key not in keys(PUBLIC))
+        meta = head(cv_key)
+        check("private object is not public-cacheable", meta.get("CacheControl") == PRIVATE_NO_CACHE, meta.get("CacheControl"))
+
+        # presigned downloads
+        url = storage.presigned_url(cv_key, filename="resume.pdf", content_type="application/pdf")
+        with urlopen(url) as r:
+            body, disposition = r.read(), r.headers.get("Content-Disposition", "")
+        check("presigned URL returns the bytes", body == pdf)
+        check("presigned URL names the file", "resume.pdf" in disposition, disposition)
+        with storage.open_local(storage.stored_name(cv_key)) as path:
+            check("open_local downloads a copy", path.read_bytes() == pdf)
+        check("iter_bytes streams the object", b"".join(storage.iter_bytes(storage.stored_name(cv_key))) == pdf)
+
+        # resized copies
+        if Image is None:
+            print("  skip  derivatives: Pillow is not installed")
+        else:
+            blob_store.make_derivatives(logo_sha, ".png")
+            want = sorted(blob_store.derivative_key(logo_sha, size, fmt)
+                          for size in DERIVATIVE_SIZES for fmt in ("webp", "png"))
+            check("derivatives written", keys("derived/") == want, keys("derived/"))
+            meta = head(want[0])
+            check("derivatives are immutable", meta.get("CacheControl") == IMMUTABLE, meta.get("CacheControl"))
+
+        # garbage collection
+        blob_store.release(db, logo_sha)
+        db.commit()
+        check("still referenced: kept", logo_key in keys(PUBLIC) and db.get(models.Blob, logo_sha) is not None)
+        # a reference taken between the release and the collection wins
+        db.execute(text("UPDATE blobs SET ref_count = 0 WHERE sha256 = :s"), {"s": logo_sha})
+        db.commit()
+        blob_store.acquire(db, logo_sha)
+        db.commit()
+        blob_store._collect(logo_sha)
+        check("re-referenced blob survives collection", logo_key in keys(PUBLIC))
+        blob_store.release(db, logo_sha)
+        db.commit()
+        check("last release removes the object", logo_key not in keys(PUBLIC), keys(PUBLIC))
+        check("last release removes its derivatives", not keys("derived/"), keys("derived/"))
+        check("last release removes the row", db.get(models.Blob, logo_sha, populate_existing=True) is None)
+
+        blob_store.release(db, cv_sha)
+        db.commit()
+        check("private blob collected too", not keys(PRIVATE), keys(PRIVATE))
+        check("bucket left empty", not keys(), keys())
+    finally:
+        db.close()
+
+def main():
+    try:
+        create_schema()
+        run()
+    finally:
+        SERVER.stop()
+        engine.dispose()
+        shutil.rmtree(WORKDIR, ignore_errors=True)
+    print(f"{failures} failure(s)")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
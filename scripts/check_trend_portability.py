@@ -0,0 +1,154 @@
+"""
+Check that GET /company/analytics/trend returns the same points on SQLite
+and PostgreSQL, and that both match a plain Python count.
+
+Applications are seeded around the awkward edges (UTC midnight, Sunday to
+Monday, month and year ends, 29 February), rolled up with
+application_stats.reconcile() and read back with application_stats.trend()
+for each granularity over ranges starting and ending mid-period. SQLite
+runs in memory; PostgreSQL runs when DATABASE_URL points to one migrated
+with `alembic upgrade head`, inside a transaction that is rolled back and
+with a session time zone far from UTC.
+
+Usage (from the repo root):
+    python scripts/check_trend_portability.py [--sqlite-only]
+"""
+import os, sys, random, argparse, datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, func, insert, select, text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from app import models  # noqa: E402
+from app.core.application_stats import mean_score, periods, reconcile, trend, utc_day  # noqa: E402
+
+UTC = datetime.timezone.utc
+A, S = models.Application, models.ApplicationDailyStat
+EDGES = [
+    datetime.datetime(2023, 12, 31, 23, 59, 59, 999999, UTC), datetime.datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
+    datetime.datetime(2024, 2, 28, 23, 30, tzinfo=UTC), datetime.datetime(2024, 2, 29, 12, 0, tzinfo=UTC),
+    datetime.datetime(2024, 3, 1, 0, 0, 1, tzinfo=UTC), datetime.datetime(2024, 3, 10, 23, 59, tzinfo=UTC),  # Sunday
+    datetime.datetime(2024, 3, 11, 0, 0, tzinfo=UTC), datetime.datetime(2024, 3, 31, 22, 30, tzinfo=UTC),
+]
+RANGES = [
+    (datetime.date(2023, 12, 1), datetime.date(2024, 4, 1)),
+    (datetime.date(2023, 12, 28), datetime.date(2024, 3, 13)),  # Thursday to Wednesday
+    (datetime.date(2024, 2, 29), datetime.date(2024, 3, 1)),
+]
+
+def applications(rnd, own_jobs, other_jobs, n):
+    """(job_id, status, score, applied_at) rows, the edge cases on the first own job."""
+    start = datetime.datetime(2023, 11, 15, tzinfo=UTC)
+    rows = [(own_jobs[0], "pending", 55.5, at) for at in EDGES]
+    for _ in range(n):
+        at = start + datetime.timedelta(seconds=rnd.randrange(150 * 86400))
+        score = None if rnd.random() < 0.2 else round(rnd.uniform(0, 100), 2)
+        rows.append((rnd.choice(own_jobs + other_jobs), rnd.choice(["pending", "accepted", "rejected"]), score, at))
+    return rows
+
+def expected(rows, jobs, start, end, granularity):
+    buckets = periods(start, end, granularity)
+    totals = [[0, 0, 0.0] for _ in buckets]
+    for job_id, _, score, at in rows:
+        day = utc_day(at)
+        if job_id not in jobs or not start <= day < end:
+            continue
+        i = max(n for n, (lo, _) in enumerate(buckets) if lo <= day)
+        totals[i][0] += 1
+        if score is not None:
+            totals[i][1] += 1
+            totals[i][2] += score
+    return [
+        {"start": lo.isoformat(), "end": hi.isoformat(), "applications": n,
+         "avg_score": mean_score(s, c)}
+        for (lo, hi), (n, c, s) in zip(buckets, totals)
+    ]
+
+def seed(conn, rnd, full_schema):
+    """Two companies (three and two jobs) and their applications; return (owner, owner's jobs, rows)."""
+    def next_id(table):
+        return (conn.execute(select(func.coalesce(func.max(table.c.id), 0))).scalar() or 0) + 1
+    jobs_table = models.Job.__table__ if full_schema else Table("jobs", MetaData(), autoload_with=conn)
+    uid = next_id(models.User.__table__) if full_schema else 1
+    owner, other = uid, uid + 1
+    jid = next_id(jobs_table)
+    job_rows = [{"id": jid + n, "owner_user_id": owner if n < 3 else other} for n in range(5)]
+    own = [r["id"] for r in job_rows[:3]]
+    rows = applications(rnd, own, [r["id"] for r in job_rows[3:]], 3000)
+    # one candidate per application keeps (user_id, job_id) unique
+    candidate = uid + 2
+    cv = 1
+    if full_schema:
+        conn.execute(insert(models.User.__table__), [
+            {"id": i, "email": f"trend-check-{i}@example.invalid", "hashed_password": "x"}
+            for i in range(uid, candidate + len(rows))
+        ])
+        cv = next_id(models.CV.__table__)
+        conn.execute(insert(models.CV.__table__), {"id": cv, "user_id": candidate, "file_path": "x"})
+        for row in job_rows:
+            row.update(title=f"Trend check {row['id']}", skills=[])
+    conn.execute(insert(jobs_table), job_rows)
+    aid = next_id(A.__table__)
+    conn.execute(insert(A.__table__), [
+        {"id": aid + n, "user_id": candidate + n, "job_id": job_id, "cv_id": cv,
+         "status": status, "score": score, "applied_at": at}
+        for n, (job_id, status, score, at) in enumerate(rows)
+    ])
+    return owner, set(own), rows
+
+def run(conn, label, full_schema):
+    rnd = random.Random(7)
+    owner, own, rows = seed(conn, rnd, full_schema)
+    db = Session(bind=conn)
+    reconcile(db)
+    failures = 0
+    results = {}
+    for start, end in RANGES:
+        for granularity in ("day", "week", "month"):
+            got = trend(db, start, end, granularity, owner_id=owner)
+            want = expected(rows, own, start, end, granularity)
+            results[(start, end, granularity)] = got
+            if got != want:
+                failures += 1
+                bad = next(i for i, (g, w) in enumerate(zip(got, want)) if g != w) if len(got) == len(want) else None
+                print(f"MISMATCH {label} {granularity} [{start}, {end}): "
+                      f"{got[bad] if bad is not None else len(got)} != {want[bad] if bad is not None else len(want)}")
+    print(f"{label:>10}: {len(results)} trends, {failures} mismatch(es)")
+    return failures, results
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sqlite-only", action="store_true")
+    args = ap.parse_args()
+
+    failures = 0
+    sqlite = create_engine("sqlite://")
+    with sqlite.begin() as conn:
+        # only what reconcile() and trend() touch; the full schema needs Postgres types
+        Table("jobs", MetaData(), Column("id", Integer, primary_key=True), Column("owner_user_id", Integer)).create(conn)
+        models.Base.metadata.create_all(conn, tables=[A.__table__, S.__table__])
+        bad, lite = run(conn, "sqlite", full_schema=False)
+        failures += bad
+
+    if not args.sqlite_only:
+        from app.database import engine
+        if engine.dialect.name != "postgresql":
+            print(f"postgresql: skipped, DATABASE_URL points to {engine.dialect.name}")
+        else:
+            with engine.connect() as conn:
+                trans = conn.begin()
+                try:
+                    # days must be UTC days whatever the session says
+                    conn.execute(text("SET LOCAL TIME ZONE 'Pacific/Kiritimati'"))
+                    bad, pg = run(conn, "postgresql", full_schema=True)
+                    failures += bad
+                    same = sum(pg[k] == lite[k] for k in pg)
+                    print(f"sqlite vs postgresql: {same}/{len(pg)} identical")
+                    failures += len(pg) - same
+                finally:
+                    trans.rollback()
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
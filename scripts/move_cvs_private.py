@@ -0,0 +1,83 @@
+"""
+Move CV files uploaded into the public blob namespace (blobs/..., served at
+/static/blobs) to the private one (cvs/..., never mounted), and point
+cvs.file_path at the new copy.
+
+Each file is copied first and its rows committed; the public copy is deleted
+afterwards, unless something other than CVs (an avatar or logo with the very
+same bytes) still references the blob. Safe to re-run. Works with either
+STORAGE_BACKEND.
+
+Usage (from the repo root):
+    python scripts/move_cvs_private.py [--dry-run]
+"""
+import os, sys, shutil, argparse
+from collections import defaultdict
+from uuid import uuid4
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from sqlalchemy import func  # noqa: E402
+from app import models  # noqa: E402
+from app.core.blob_store import PRIVATE, PUBLIC, STAGING_DIR, blob_store  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+
+CV, Blob = models.CV, models.Blob
+
+def public_cvs(db, storage):
+    """CV rows whose file sits in the public namespace, grouped by blob."""
+    by_sha = defaultdict(list)
+    for cv in db.query(CV).filter(CV.content_sha256.isnot(None)):
+        key = storage.key_for(cv.file_path or "")
+        if key is not None and key.startswith(PUBLIC + "/"):
+            by_sha[cv.content_sha256].append(cv)
+    return by_sha
+
+def copy(storage, old_key, new_key, content_type):
+    STAGING_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = STAGING_DIR / uuid4().hex
+    with storage.open_local(storage.stored_name(old_key)) as src:
+        shutil.copyfile(src, tmp)
+    storage.put_file(new_key, tmp, content_type=content_type)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dry-run", action="store_true", help="list the files without moving them")
+    args = ap.parse_args()
+
+    storage = blob_store.storage
+    db = SessionLocal()
+    moved = kept = missing = 0
+    try:
+        for sha, cvs in public_cvs(db, storage).items():
+            old_key = storage.key_for(cvs[0].file_path)
+            ext = os.path.splitext(old_key)[1]
+            new_key = blob_store.key(sha, ext, PRIVATE)
+            print(f"{old_key} -> {new_key} ({len(cvs)} CV row(s))")
+            if args.dry_run:
+                continue
+            if not storage.exists(new_key):
+                if not storage.exists(old_key):
+                    missing += 1
+                    print(f"  missing, left as is: {old_key}")
+                    continue
+                copy(storage, old_key, new_key, cvs[0].mime_type)
+            for cv in cvs:
+                cv.file_path = storage.stored_name(new_key)
+            db.commit()
+
+            blob = db.get(Blob, sha)
+            cv_refs = db.query(func.count(CV.id)).filter(CV.content_sha256 == sha).scalar()
+            if blob is None or blob.ref_count <= cv_refs:
+                storage.delete(old_key)
+                moved += 1
+            else:
+                kept += 1
+                print(f"  public copy kept: {blob.ref_count - cv_refs} other reference(s)")
+    finally:
+        db.close()
+    print(f"{moved} moved, {kept} copied (public copy still referenced), {missing} missing")
+    return 1 if missing else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Rebuild the daily application rollup (application_daily_stats) from the
+applications table.
+
+The rollup is kept current by the ORM flush hooks of
+backend/app/core/application_stats.py; writes that bypass them (raw SQL,
+cascades from deleted users, manual fixes) leave it off until this runs.
+Schedule it daily over a few recent days, and with --all after a bulk
+import or restore. --check reports the rows that differ without writing.
+
+Usage (from the repo root):
+    python scripts/reconcile_application_stats.py [--days 3 | --all] [--check]
+"""
+import os, sys, argparse, datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from sqlalchemy import select  # noqa: E402
+from app import models  # noqa: E402
+from app.core.application_stats import COUNTERS, reconcile  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+
+S = models.ApplicationDailyStat
+
+def snapshot(db, since):
+    q = select(S)
+    if since is not None:
+        q = q.where(S.day >= since)
+    return {
+        (s.day, s.job_id, s.status): (s.owner_user_id,) + tuple(round(getattr(s, c), 6) for c in COUNTERS)
+        for s in db.scalars(q)
+        if s.applications
+    }
+
+def main():
+    ap = argparse.ArgumentParser()
+    scope = ap.add_mutually_exclusive_group()
+    scope.add_argument("--days", type=int, default=3, help="rebuild today and the days before it (UTC)")
+    scope.add_argument("--all", action="store_true", help="rebuild every day")
+    ap.add_argument("--check", action="store_true", help="report differences and roll back")
+    args = ap.parse_args()
+    since = None if args.all else datetime.datetime.now(datetime.timezone.utc).date() - datetime.timedelta(days=args.days - 1)
+
+    db = SessionLocal()
+    try:
+        before = snapshot(db, since)
+        written = reconcile(db, since)
+        db.expire_all()
+        after = snapshot(db, since)
+        drift = sorted(k for k in before.keys() | after.keys() if before.get(k) != after.get(k))
+        for day, job_id, status in drift[:50]:
+            key = (day, job_id, status)
+            print(f"{day} job={job_id} {status}: {before.get(key)} -> {after.get(key)}")
+        if len(drift) > 50:
+            print(f"... {len(drift) - 50} more")
+        print(f"{written} row(s) rebuilt since {since or 'the first day'}, {len(drift)} differed")
+        if args.check:
+            db.rollback()
+            return 1 if drift else 0
+        db.commit()
+    finally:
+        db.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())